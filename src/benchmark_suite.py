@@ -0,0 +1,290 @@
+import json
+import math
+import platform
+import random
+import sys
+import time
+from books import SoftCover
+from library import Library
+from memory_usage import make_books
+from simulation import run_simulation
+
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+MUTATIONS = 1000         # Изменений библиотеки за один замер (не больше половины книг)
+MIN_TIME = 0.05          # Наименьшее время замера поиска, с
+REPEAT = 3               # Повторы замера, берется лучший
+THRESHOLD = 0.25         # Допустимое замедление относительно базовой линии (25%)
+# Допустимое превышение ожидаемой степени роста: на больших размерах корзины индексов
+# перестают помещаться в кеш процессора и линейный поиск растет как n^1.4-1.6,
+# а случайный линейный шаг в операции O(1) (или O(n) вместо O(1) на книгу) дает +1
+EXPONENT_TOLERANCE = 0.75
+FIT_SIZES = 2  # Степень роста оценивается по наибольшим размерам (асимптотика, а не накладные расходы)
+
+# Замеры: название -> (функция(library, books, rng) -> нс на операцию, ожидаемая степень роста)
+# Степень роста - показатель k во времени одной операции ~ n^k: 0 - не зависит
+# от размера библиотеки, 1 - линейно (например, поиск, возвращающий долю всех книг)
+BENCHMARKS = {}
+
+
+def benchmark(name: str, exponent: float):
+    """Регистрация замера в BENCHMARKS с ожидаемой степенью роста времени операции"""
+    def register(function):
+        BENCHMARKS[name] = (function, exponent)
+        return function
+    return register
+
+
+def _per_call(call, arguments: list) -> float:
+    """
+    Время одного вызова call(argument) в наносекундах
+    Аргументы перебираются по кругу, пока замер не займет MIN_TIME (как timeit.autorange);
+    из REPEAT замеров берется лучший
+    """
+    best = None
+    for _ in range(REPEAT):
+        number = 0
+        started = time.perf_counter_ns()
+        while True:
+            for argument in arguments:
+                call(argument)
+            number += len(arguments)
+            elapsed = time.perf_counter_ns() - started
+            if elapsed >= MIN_TIME * 1e9:
+                break
+        best = elapsed / number if best is None else min(best, elapsed / number)
+    return best
+
+
+def _per_mutation(prepare, call, restore) -> float:
+    """
+    Время одного изменения библиотеки в наносекундах
+    prepare() -> аргументы, call(argument) - измеряемое изменение, restore(arguments) -
+    возврат библиотеки в исходное состояние (не измеряется); из REPEAT замеров берется лучший
+    """
+    best = None
+    for _ in range(REPEAT):
+        arguments = prepare()
+        started = time.perf_counter_ns()
+        for argument in arguments:
+            call(argument)
+        elapsed = time.perf_counter_ns() - started
+        restore(arguments)
+        best = elapsed / len(arguments) if best is None else min(best, elapsed / len(arguments))
+    return best
+
+
+def _sample(books: list, rng: random.Random, count: int = 64) -> list:
+    return rng.sample(books, min(count, len(books)))
+
+
+@benchmark('search_by_isbn', 0)
+def _search_by_isbn(library, books, rng):
+    return _per_call(library.search_by_isbn, [book.isbn for book in _sample(books, rng)])
+
+
+@benchmark('search_by_title', 1)
+def _search_by_title(library, books, rng):
+    return _per_call(library.search_by_title, [book.title for book in _sample(books, rng)])
+
+
+@benchmark('search_by_author', 1)
+def _search_by_author(library, books, rng):
+    return _per_call(library.search_by_author, [book.author for book in _sample(books, rng)])
+
+
+@benchmark('search_by_year', 1)
+def _search_by_year(library, books, rng):
+    return _per_call(library.search_by_year, [book.year for book in _sample(books, rng)])
+
+
+@benchmark('search_by_year_range', 1)
+def _search_by_year_range(library, books, rng):
+    return _per_call(lambda year: library.search_by_year_range(year, year + 4),
+                     [book.year for book in _sample(books, rng)])
+
+
+@benchmark('search_by_genre', 1)
+def _search_by_genre(library, books, rng):
+    return _per_call(library.search_by_genre, [book.genre for book in _sample(books, rng, 16)])
+
+
+@benchmark('search_by_cover_type', 1)
+def _search_by_cover_type(library, books, rng):
+    return _per_call(library.search_by_cover_type, [book.cover_type for book in _sample(books, rng, 3)])
+
+
+@benchmark('search_title_contains', 1)
+def _search_title_contains(library, books, rng):
+    return _per_call(library.search_title_contains, [book.title[2:7] for book in _sample(books, rng, 16)])
+
+
+@benchmark('search_title_prefix', 1)
+def _search_title_prefix(library, books, rng):
+    return _per_call(library.search_title_prefix, [book.title[:4] for book in _sample(books, rng, 16)])
+
+
+@benchmark('add_book', 0)
+def _add_book(library, books, rng):
+    def prepare():
+        return [SoftCover.from_trusted('Замер', 'Автор замера', 2000, 'Роман', f'BENCH-{number}')
+                for number in range(min(MUTATIONS, len(books) // 2))]
+
+    def restore(added):
+        for book in added:
+            library.remove_book_by_isbn(book.isbn)
+    return _per_mutation(prepare, library.add_book, restore)
+
+
+@benchmark('borrow_book_by_isbn', 0)
+def _borrow_book_by_isbn(library, books, rng):
+    def prepare():
+        return [book.isbn for book in rng.sample(books, min(MUTATIONS, len(books) // 2))
+                if not book.is_borrowed()]
+
+    def restore(isbns):
+        for isbn in isbns:
+            library.return_book_by_isbn(isbn)
+    return _per_mutation(prepare, library.borrow_book_by_isbn, restore)
+
+
+@benchmark('remove_book_by_title', 0)
+def _remove_book_by_title(library, books, rng):
+    removed = []
+
+    def prepare():
+        # Названия повторяются: удаляется первый экземпляр из корзины индекса
+        return [book.title for book in rng.sample(books, min(MUTATIONS, len(books) // 2))]
+
+    def remove(title):
+        removed.append(next(iter(library.index.bucket('title', title).values())))
+        library.remove_book_by_title(title)
+
+    def restore(titles):
+        library.add_books(removed)
+        removed.clear()
+    # Запоминание удаленной книги входит в замер, но стоит O(1)
+    return _per_mutation(prepare, remove, restore)
+
+
+@benchmark('run_simulation', 0)
+def _run_simulation(library, books, rng):
+    # Симуляция меняет библиотеку, поэтому выполняется последней
+    steps = 2000
+    best = None
+    for repeat in range(REPEAT):
+        metrics = run_simulation(steps, rng.randrange(1 << 30), library, quiet=True)
+        best = metrics['seconds'] if best is None else min(best, metrics['seconds'])
+    return best * 1e9 / steps
+
+
+def fit_exponent(sizes: list, times: list) -> float:
+    """Степень роста k по методу наименьших квадратов: log(time) = k * log(size) + c"""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(value) for value in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if not spread:
+        raise ValueError("для оценки степени роста нужны хотя бы два разных размера")
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+
+
+def run_suite(sizes=DEFAULT_SIZES, names=None, seed: int = 1) -> dict:
+    """
+    Выполнение замеров для библиотек размеров sizes
+    Для каждого размера библиотека строится один раз (make_books, add_books),
+    замеры выполняются по порядку BENCHMARKS и возвращают библиотеку в исходное состояние
+    (кроме последнего run_simulation)
+    Возвращает:
+    dict - 'meta' (окружение), 'results' (название -> {размер: нс на операцию}),
+           'complexity' (название -> оцененная и ожидаемая степень роста)
+    """
+    names = list(BENCHMARKS) if names is None else names
+    results = {name: {} for name in names}
+    for size in sizes:
+        books = make_books(size, seed)
+        library = Library('Замер', verbose=False)
+        library.add_books(books)
+        rng = random.Random(seed)
+        for name in names:
+            function, _ = BENCHMARKS[name]
+            results[name][str(size)] = function(library, books, rng)
+    complexity = {}
+    if len(sizes) > 1:
+        fitted = sorted(sizes)[-FIT_SIZES:]
+        for name in names:
+            exponent = fit_exponent(fitted, [results[name][str(size)] for size in fitted])
+            complexity[name] = {'exponent': exponent, 'expected': BENCHMARKS[name][1]}
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': list(sizes),
+            'seed': seed,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+        'complexity': complexity,
+    }
+
+
+def check_complexity(report: dict, tolerance: float = EXPONENT_TOLERANCE) -> list:
+    """Замеры, время которых растет быстрее ожидаемого: (название, степень, ожидаемая)"""
+    return [(name, fit['exponent'], fit['expected']) for name, fit in report['complexity'].items()
+            if fit['exponent'] > fit['expected'] + tolerance]
+
+
+def compare(report: dict, baseline: dict, threshold: float = THRESHOLD) -> list:
+    """
+    Сравнение с базовой линией (отчет run_suite, сохраненный ранее)
+    Возвращает:
+    list - замедления больше threshold: (название, размер, было нс, стало нс)
+    """
+    regressions = []
+    for name, by_size in report['results'].items():
+        for size, value in by_size.items():
+            before = baseline['results'].get(name, {}).get(size)
+            if before is not None and value > before * (1 + threshold):
+                regressions.append((name, size, before, value))
+    return regressions
+
+
+def main(arguments=None) -> int:
+    """Запуск из командной строки; возвращает код выхода (1 - регрессия или рост сложности)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Замеры производительности библиотеки")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="выполнить только эти замеры")
+    parser.add_argument('--output', help="файл JSON для результатов")
+    parser.add_argument('--baseline', help="файл JSON базовой линии для сравнения")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    parser.add_argument('--tolerance', type=float, default=EXPONENT_TOLERANCE)
+    arguments = parser.parse_args(arguments)
+
+    report = run_suite(arguments.sizes, arguments.only)
+    for name, by_size in report['results'].items():
+        timings = '  '.join(f"{size}: {value / 1000:>9.2f} мкс" for size, value in by_size.items())
+        fit = report['complexity'].get(name)
+        growth = f"  n^{fit['exponent']:.2f} (ожидается n^{fit['expected']})" if fit else ''
+        print(f"{name:>22}  {timings}{growth}")
+    if arguments.output:
+        with open(arguments.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+    failed = False
+    for name, exponent, expected in check_complexity(report, arguments.tolerance):
+        print(f"[Замеры] {name}: время операции растет как n^{exponent:.2f}, ожидается n^{expected}")
+        failed = True
+    if arguments.baseline:
+        with open(arguments.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        for name, size, before, after in compare(report, baseline, arguments.threshold):
+            print(f"[Замеры] {name} ({size} книг): {before / 1000:.2f} -> {after / 1000:.2f} мкс")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,203 @@
+class Bitset:
+    """
+    Изменяемое множество целых чисел (плотных идентификаторов книг) в виде битовой карты
+    Биты хранятся в bytearray, поэтому установка и сброс бита стоят O(1).
+    Для операций над картами битовая карта переводится в int
+    (результат кэшируется до следующего изменения)
+    """
+
+    def __init__(self):
+        self._bytes = bytearray()
+        self._value = 0  # Кэш значения в виде int (None - устарел)
+
+    def add(self, bit: int) -> None:
+        """Установка бита"""
+        position = bit >> 3
+        if position >= len(self._bytes):
+            # Буфер растет с запасом, чтобы добавление оставалось амортизированно O(1)
+            self._bytes.extend(bytes(max(position + 1 - len(self._bytes), len(self._bytes))))
+        self._bytes[position] |= 1 << (bit & 7)
+        self._value = None
+
+    def add_many(self, bits: list) -> None:
+        """Установка набора битов (буфер расширяется один раз)"""
+        if not bits:
+            return
+        size = (max(bits) >> 3) + 1
+        if size > len(self._bytes):
+            self._bytes.extend(bytes(size - len(self._bytes)))
+        data = self._bytes
+        for bit in bits:
+            data[bit >> 3] |= 1 << (bit & 7)
+        self._value = None
+
+    def discard(self, bit: int) -> None:
+        """Сброс бита"""
+        position = bit >> 3
+        if position < len(self._bytes) and self._bytes[position] & (1 << (bit & 7)):
+            self._bytes[position] &= ~(1 << (bit & 7)) & 0xFF
+            self._value = None
+
+    def __contains__(self, bit: int) -> bool:
+        """Проверка бита"""
+        position = bit >> 3
+        return position < len(self._bytes) and bool(self._bytes[position] & (1 << (bit & 7)))
+
+    @property
+    def value(self) -> int:
+        """Битовая карта в виде int"""
+        if self._value is None:
+            self._value = int.from_bytes(self._bytes, 'little')
+        return self._value
+
+
+def iter_bits(value: int):
+    """Итератор по номерам установленных битов int в порядке возрастания"""
+    data = value.to_bytes((value.bit_length() + 7) // 8, 'little')
+    for position, byte in enumerate(data):
+        # Нулевые байты пропускаются целиком
+        while byte:
+            low = byte & -byte
+            yield (position << 3) + low.bit_length() - 1
+            byte ^= low
+
+
+class Bits:
+    """
+    Результат операций над битовыми индексами
+    Поддерживает & (И), | (ИЛИ), ~ (НЕ относительно всех книг), - (разность).
+    Операции выполняются над int целиком, без создания списков книг
+    """
+
+    def __init__(self, index: 'BitmapIndex', value: int):
+        self._index = index
+        self.value = value
+
+    def __and__(self, other: 'Bits') -> 'Bits':
+        return Bits(self._index, self.value & other.value)
+
+    def __or__(self, other: 'Bits') -> 'Bits':
+        return Bits(self._index, self.value | other.value)
+
+    def __sub__(self, other: 'Bits') -> 'Bits':
+        return Bits(self._index, self.value & ~other.value)
+
+    def __invert__(self) -> 'Bits':
+        return Bits(self._index, self._index.live.value & ~self.value)
+
+    def __bool__(self) -> bool:
+        return self.value != 0
+
+    def count(self) -> int:
+        """Количество книг (число установленных битов)"""
+        return self.value.bit_count()
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def ids(self):
+        """Итератор по плотным идентификаторам книг"""
+        return iter_bits(self.value)
+
+    def __iter__(self):
+        """Итератор по книгам"""
+        books = self._index.books_by_id
+        for book_id in iter_bits(self.value):
+            yield books[book_id]
+
+    def books(self) -> list:
+        """Список книг результата"""
+        return list(self)
+
+
+class BitmapIndex:
+    """
+    Битовые индексы для атрибутов с небольшим числом значений
+    (тип обложки, наличие иллюстраций, жанр, описание состояния)
+    Каждому значению атрибута соответствует Bitset по плотным идентификаторам книг
+    """
+
+    def __init__(self, attributes: dict):
+        """
+        Параметры:
+        attributes - атрибуты индекса (имя -> функция получения значения из книги)
+        """
+        self._attributes = attributes
+        self._bitmaps = {name: {} for name in attributes}  # Карты (атрибут -> значение -> Bitset)
+        self.live = Bitset()    # Все книги индекса
+        self.books_by_id = []   # Книги по плотному идентификатору (None - свободный идентификатор)
+
+    def _set(self, name: str, value, book_id: int) -> None:
+        """Установка бита книги в карте значения атрибута"""
+        bitmap = self._bitmaps[name].get(value)
+        if bitmap is None:
+            bitmap = self._bitmaps[name][value] = Bitset()
+        bitmap.add(book_id)
+
+    def _clear(self, name: str, book_id: int) -> None:
+        """Сброс бита книги во всех картах атрибута (значений немного)"""
+        for bitmap in self._bitmaps[name].values():
+            bitmap.discard(book_id)
+
+    def add(self, book_id: int, book) -> None:
+        """Добавление книги с плотным идентификатором book_id"""
+        if book_id >= len(self.books_by_id):
+            self.books_by_id.extend([None] * (book_id + 1 - len(self.books_by_id)))
+        self.books_by_id[book_id] = book
+        self.live.add(book_id)
+        for name, getter in self._attributes.items():
+            self._set(name, getter(book), book_id)
+
+    def add_many(self, items: list) -> None:
+        """
+        Пакетное добавление пар (book_id, book)
+        Идентификаторы группируются по значениям атрибутов, каждая карта обновляется один раз
+        """
+        if not items:
+            return
+        top = max(book_id for book_id, _ in items)
+        if top >= len(self.books_by_id):
+            self.books_by_id.extend([None] * (top + 1 - len(self.books_by_id)))
+        for book_id, book in items:
+            self.books_by_id[book_id] = book
+        self.live.add_many([book_id for book_id, _ in items])
+        for name, getter in self._attributes.items():
+            groups = {}
+            for book_id, book in items:
+                value = getter(book)
+                group = groups.get(value)
+                if group is None:
+                    group = groups[value] = []
+                group.append(book_id)
+            for value, ids in groups.items():
+                bitmap = self._bitmaps[name].get(value)
+                if bitmap is None:
+                    bitmap = self._bitmaps[name][value] = Bitset()
+                bitmap.add_many(ids)
+
+    def remove(self, book_id: int) -> None:
+        """Удаление книги с плотным идентификатором book_id"""
+        self.books_by_id[book_id] = None
+        self.live.discard(book_id)
+        for name in self._attributes:
+            self._clear(name, book_id)
+
+    def update(self, book_id: int, book, name: str) -> None:
+        """Переиндексация одного атрибута книги после его изменения"""
+        self._clear(name, book_id)
+        self._set(name, self._attributes[name](book), book_id)
+
+    def values(self, name: str) -> list:
+        """Значения атрибута, для которых есть карты"""
+        return list(self._bitmaps[name])
+
+    def bits(self, name: str, value) -> Bits:
+        """Битовая карта книг со значением value атрибута name"""
+        if name not in self._bitmaps:
+            raise ValueError(f"нет битового индекса для поля: {name}")
+        bitmap = self._bitmaps[name].get(value)
+        return Bits(self, bitmap.value if bitmap is not None else 0)
+
+    def all(self) -> Bits:
+        """Битовая карта всех книг"""
+        return Bits(self, self.live.value)
@@ -0,0 +1,182 @@
+from array import array
+from datetime import datetime
+from constans import CoverType
+
+# NumPy - необязательная зависимость: без нее агрегаты считаются циклами Python
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Коды типов обложки в колонке cover_type
+COVER_TYPES = [CoverType.HARD, CoverType.SOFT, CoverType.GLOSSY]
+COVER_CODES = {cover_type: code for code, cover_type in enumerate(COVER_TYPES)}
+
+
+def percentile(values: list, q: float) -> float:
+    """Перцентиль q (0-100) отсортированного списка с линейной интерполяцией (как в NumPy)"""
+    if not values:
+        raise ValueError("перцентиль пустой выборки не определен")
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class BookRow:
+    """Легкое представление строки колоночного хранилища (только чтение)"""
+
+    __slots__ = ('_store', 'book_id')
+
+    def __init__(self, store: 'ColumnarBookStore', book_id: int):
+        self._store = store
+        self.book_id = book_id
+
+    @property
+    def year(self) -> int:
+        return self._store.year[self.book_id]
+
+    @property
+    def condition(self) -> int:
+        return self._store.condition[self.book_id]
+
+    @property
+    def borrow_count(self) -> int:
+        return self._store.borrow_count[self.book_id]
+
+    @property
+    def cover_type(self) -> str:
+        return COVER_TYPES[self._store.cover_type[self.book_id]]
+
+    @property
+    def has_images(self) -> bool:
+        return bool(self._store.has_images[self.book_id])
+
+    def get_age(self, current_year: int = datetime.now().year) -> int:
+        """Возраст книги в годах"""
+        return current_year - self.year
+
+    def __repr__(self) -> str:
+        return f"BookRow({self.book_id}, year={self.year}, condition={self.condition}, cover_type='{self.cover_type}')"
+
+
+class ColumnarBookStore:
+    """
+    Колоночное хранилище числовых и категориальных полей книг
+    Колонки - массивы array по плотным идентификаторам книг (тем же, что у битовых индексов).
+    Книги Book остаются основным источником данных, хранилище повторяет их поля
+    для быстрых агрегатов; с NumPy агрегаты векторизуются без копирования колонок
+    """
+
+    def __init__(self):
+        self.year = array('h')          # Год издания
+        self.condition = array('b')     # Состояние 0-100
+        self.borrow_count = array('q')  # Количество взятий
+        self.cover_type = array('b')    # Код типа обложки (индекс в COVER_TYPES)
+        self.has_images = array('b')    # Наличие иллюстраций
+        self.live = array('b')          # 1 - строка занята книгой, 0 - свободна
+
+    def __len__(self) -> int:
+        """Количество книг в хранилище"""
+        return self.live.count(1)
+
+    def _columns(self) -> tuple:
+        return (self.year, self.condition, self.borrow_count, self.cover_type, self.has_images, self.live)
+
+    def set_row(self, book_id: int, book) -> None:
+        """Запись полей книги в строку book_id"""
+        if book_id >= len(self.live):
+            missing = book_id + 1 - len(self.live)
+            for column in self._columns():
+                column.extend(bytes(missing))
+        self.year[book_id] = book.year
+        self.condition[book_id] = book.condition
+        self.borrow_count[book_id] = book.borrow_count()
+        self.cover_type[book_id] = COVER_CODES[book.cover_type]
+        self.has_images[book_id] = 1 if book.has_images else 0
+        self.live[book_id] = 1
+
+    def update_state(self, book_id: int, book) -> None:
+        """Обновление изменяемых полей (состояние и количество взятий)"""
+        self.condition[book_id] = book.condition
+        self.borrow_count[book_id] = book.borrow_count()
+
+    def clear_row(self, book_id: int) -> None:
+        """Освобождение строки book_id"""
+        self.live[book_id] = 0
+
+    def row(self, book_id: int) -> BookRow:
+        """Представление строки book_id"""
+        if book_id >= len(self.live) or not self.live[book_id]:
+            raise KeyError(f"нет книги с идентификатором {book_id}")
+        return BookRow(self, book_id)
+
+    def rows(self):
+        """Итератор по представлениям всех занятых строк"""
+        for book_id, live in enumerate(self.live):
+            if live:
+                yield BookRow(self, book_id)
+
+    def _live_ids(self) -> list:
+        return [book_id for book_id, live in enumerate(self.live) if live]
+
+    def mean_condition_by_cover_type(self) -> dict:
+        """Среднее состояние книг по типам обложки (тип -> среднее)"""
+        if np is not None:
+            mask = np.frombuffer(self.live, dtype=np.int8).astype(bool)
+            codes = np.frombuffer(self.cover_type, dtype=np.int8)[mask]
+            conditions = np.frombuffer(self.condition, dtype=np.int8)[mask]
+            counts = np.bincount(codes, minlength=len(COVER_TYPES))
+            sums = np.bincount(codes, weights=conditions, minlength=len(COVER_TYPES))
+            return {COVER_TYPES[code]: float(sums[code] / counts[code])
+                    for code in range(len(COVER_TYPES)) if counts[code]}
+
+        sums = [0] * len(COVER_TYPES)
+        counts = [0] * len(COVER_TYPES)
+        for book_id in self._live_ids():
+            code = self.cover_type[book_id]
+            sums[code] += self.condition[book_id]
+            counts[code] += 1
+        return {COVER_TYPES[code]: sums[code] / counts[code]
+                for code in range(len(COVER_TYPES)) if counts[code]}
+
+    def age_histogram(self, bin_width: int = 10, current_year: int = datetime.now().year) -> list:
+        """
+        Гистограмма возраста книг (как в Book.get_age)
+        Возвращает список (возраст от, возраст до, количество) для непустого диапазона
+        """
+        if bin_width <= 0:
+            raise ValueError("ширина интервала должна быть положительной")
+        if np is not None:
+            mask = np.frombuffer(self.live, dtype=np.int8).astype(bool)
+            ages = current_year - np.frombuffer(self.year, dtype=np.int16)[mask].astype(np.int64)
+            if ages.size == 0:
+                return []
+            low = int(ages.min()) // bin_width
+            counts = np.bincount(ages // bin_width - low)
+            bins = [(int(low + i) * bin_width, int(low + i + 1) * bin_width - 1, int(count))
+                    for i, count in enumerate(counts)]
+        else:
+            ages = [current_year - self.year[book_id] for book_id in self._live_ids()]
+            if not ages:
+                return []
+            low = min(ages) // bin_width
+            counts = [0] * (max(ages) // bin_width - low + 1)
+            for age in ages:
+                counts[age // bin_width - low] += 1
+            bins = [((low + i) * bin_width, (low + i + 1) * bin_width - 1, count)
+                    for i, count in enumerate(counts)]
+        return bins
+
+    def borrow_count_percentiles(self, percentiles=(50, 90, 99)) -> dict:
+        """Перцентили количества взятий (перцентиль -> значение)"""
+        if np is not None:
+            mask = np.frombuffer(self.live, dtype=np.int8).astype(bool)
+            values = np.frombuffer(self.borrow_count, dtype=np.int64)[mask]
+            if values.size == 0:
+                raise ValueError("перцентиль пустой выборки не определен")
+            return {q: float(value) for q, value in zip(percentiles, np.percentile(values, percentiles))}
+
+        values = sorted(self.borrow_count[book_id] for book_id in self._live_ids())
+        return {q: float(percentile(values, q)) for q in percentiles}
@@ -1,11 +1,85 @@
+import sys
 from datetime import datetime
-from constans import CoverType  
+import inspect
+from operator import itemgetter
+from constans import CONDITION_BANDS, CoverType
+from validation import validate_book_fields
+
+
+def _find_condition_band(condition: int) -> str:
+    """Поиск описания состояния по порогам CONDITION_BANDS"""
+    for band, threshold in CONDITION_BANDS:
+        if condition > threshold:
+            return band
+    return CONDITION_BANDS[-1][0]
+
+
+# Описания для всех допустимых значений состояния вычисляются заранее
+_CONDITION_BAND_TABLE = [_find_condition_band(condition) for condition in range(101)]
+
+
+def condition_band(condition: int) -> str:
+    """Текстовое описание состояния (из CONDITION_BANDS) для значения 0-100"""
+    if type(condition) is int and 0 <= condition <= 100:
+        return _CONDITION_BAND_TABLE[condition]
+    return _find_condition_band(condition)
+
+
+def condition_band_bounds(band: str) -> tuple:
+    """
+    Диапазон состояний [lo, hi] для текстового описания состояния
+    Параметры:
+    band - описание из CONDITION_BANDS (например, "Аварийное состояние")
+    """
+    upper = 100
+    for name, threshold in CONDITION_BANDS:
+        if name == band:
+            return threshold + 1, upper
+        upper = threshold
+    raise ValueError(f"неизвестное состояние книги: {band}")
+
+
+# Поля книги в порядке аргументов validate_book_fields
+VALIDATED_FIELDS = ('title', 'author', 'year', 'genre', 'cover_type', 'isbn', 'condition')
+
+
+def _constructor_args(row, names: tuple, defaults: dict) -> tuple:
+    """
+    Позиционные аргументы конструктора из строки пакета (кортеж или словарь)
+    с подстановкой значений по умолчанию; при неверном наборе полей - TypeError
+    """
+    if isinstance(row, dict):
+        unknown = row.keys() - set(names)
+        if unknown:
+            raise TypeError(f"неизвестные поля книги: {', '.join(sorted(unknown))}")
+        missing = [name for name in names if name not in row and name not in defaults]
+        if missing:
+            raise TypeError(f"не заданы поля книги: {', '.join(missing)}")
+        return tuple(row[name] if name in row else defaults[name] for name in names)
+    row = tuple(row)
+    if len(row) == len(names):
+        return row
+    # Значения по умолчанию - у последних параметров, в порядке параметров
+    required = len(names) - len(defaults)
+    if not required <= len(row) < len(names):
+        raise TypeError(f"ожидается от {required} до {len(names)} полей книги, получено {len(row)}")
+    return row + tuple(defaults.values())[len(row) - required:]
 
 
 class Book:
-    """ Базовый класс для представления книги"""
+    """
+    Базовый класс для представления книги
+    Атрибуты хранятся в __slots__ (без __dict__ у каждого экземпляра),
+    а часто повторяющиеся строки (автор, жанр, тип обложки) интернируются,
+    так что все книги одного автора ссылаются на один объект строки
+    """
+
+    __slots__ = ('title', 'author', 'year', 'genre', 'cover_type', 'isbn', 'has_images',
+                 '_borrow_count', '_is_borrowed', 'condition', '_observers')
+
+    _COVER_TYPE = None  # Тип обложки, задаваемый классом (у Book передается в конструктор)
     
-    def __init__(self, title: str, author: str, year: int, genre: str, cover_type: CoverType, isbn: str, condition: int = 100, has_images: bool = False) -> None:
+    def __init__(self, title: str, author: str, year: int, genre: str, cover_type: CoverType, isbn: str, condition: int = 100, has_images: bool = False, *, trusted: bool = False) -> None:
         """
         Конструктор класса Book с валидацией всех параметров
         Параметры:
@@ -17,63 +91,25 @@ class Book:
         isbn - ISBN книги
         condition - состояние книги (0-100, по умолчанию 100)
         has_images - наличие иллюстраций (по умолчанию False)
+        trusted - данные уже проверены источником, валидация пропускается (см. from_trusted)
         """
         
-        # Валидация названия книги
-        if title == "" or title is None:
-            raise ValueError("название не может быть пустым")
-        for symbol in ['@', '#', '$', '%', '^', '&', '*', '=', '+', '<', '>', '/', '\\', '|', '~', '`']:
-            if symbol in title:
-                raise ValueError(f"в названии не могут содержаться спец. символы {title}")
-
-        # Валидация автора
-        if author == "" or author is None:
-            raise ValueError("автор должен быть назван")
-        for symbol in ['@', '#', '$', '%', '^', '&', '*', '=', '+', '<', '>', '/', '\\', '|', '~', '`']:
-            if symbol in author:
-                raise ValueError(f"автор не может содержать спец. символы. Значение {author} не допустимо")
-
-        # Валидация года 
-        if type(year) != int:
-            raise TypeError('Год должен быть числом')
-        if year < 1800 or year > 2027:
-            raise ValueError(f"год должен быть от 1800 до 2027. Получено: {year}")
-
-        # Валидация жанра
-        if genre == "" or genre is None:
-            raise ValueError("жанр не может быть пустым")
-        for char in genre:
-            if char.isdigit():
-                raise ValueError(f"жанр не может быть числом. Значение {genre} не допустимо")
-        for symbol in ['@', '#', '$', '%', '^', '&', '*', '=', '+', '<', '>', '/', '\\', '|', '~', '`']:
-            if symbol in genre:
-                raise ValueError(f"жанр не может содержать спец. символы. Значение {genre} не допустимо")
-        
-        # Валидация состояния 
-        if type(condition) != int:
-            raise TypeError(f"состояние должно быть числом. Получено: {condition}")
-        if condition < 0 or condition > 100:
-            raise ValueError(f"состояние должно быть от 0 до 100. Получено: {condition}")
-
-        # Валидация типа обложки
-        if cover_type not in [CoverType.HARD, CoverType.SOFT, CoverType.GLOSSY]:
-            raise ValueError(f"неверный тип обложки: {cover_type}")
-
-        # Валидация ISBN
-        if isbn == "" or isbn is None:
-            raise ValueError("ISBN не может быть пустым")
+        # Валидация всех полей общим валидатором (validation.py)
+        if not trusted:
+            validate_book_fields(title, author, year, genre, cover_type, isbn, condition)
 
         # Инициализация атрибутов объекта
         self.title = title
-        self.author = author
+        self.author = sys.intern(author)  # Повторяющиеся строки хранятся в одном экземпляре
         self.year = year
-        self.genre = genre
-        self.cover_type = cover_type 
+        self.genre = sys.intern(genre)
+        self.cover_type = sys.intern(cover_type)
         self.isbn = isbn
         self.has_images = has_images
         self._borrow_count = 0  # Счетчик взятий книги
         self._is_borrowed = False  # Флаг взятия книги
         self.condition = condition  # Состояние книги (0-100)
+        self._observers = ()  # Подписчики на изменения книги (например, индексы библиотеки)
 
     def __repr__(self) -> str:
         """Официальное строковое представление"""
@@ -83,38 +119,96 @@ class Book:
         """Неформальное строковое представление"""
         return f"'{self.title}' - {self.author} ({self.year})"
 
+    @classmethod
+    def from_trusted(cls, *args, **kwargs) -> 'Book':
+        """
+        Создание книги без валидации - для данных, уже проверенных источником
+        (например, validate_many или сохраненный каталог). Аргументы - как у конструктора класса
+        """
+        return cls(*args, trusted=True, **kwargs)
+
+    @classmethod
+    def validate_many(cls, rows) -> tuple:
+        """
+        Пакетная проверка и создание книг за один проход
+        Параметры:
+        rows - строки аргументов конструктора класса (кортежи или словари)
+        Возвращает:
+        (books, errors) - созданные книги и список ошибок (номер строки, исключение).
+        Повторяющиеся автор и жанр проверяются один раз на пакет
+        """
+        # Позиционные параметры конструктора и их значения по умолчанию вычисляются один раз
+        parameters = [parameter for parameter in list(inspect.signature(cls.__init__).parameters.values())[1:]
+                      if parameter.kind == parameter.POSITIONAL_OR_KEYWORD]
+        names = tuple(parameter.name for parameter in parameters)
+        defaults = {parameter.name: parameter.default for parameter in parameters
+                    if parameter.default is not parameter.empty}
+        # Поля для валидатора по позициям аргументов; тип обложки подкласса
+        # (не входит в аргументы конструктора) добавляется в конец аргументов
+        select = itemgetter(*[names.index(name) if name in names else len(names) for name in VALIDATED_FIELDS])
+        fixed = (cls._COVER_TYPE,)
+        checked_authors = set()
+        checked_genres = set()
+        books = []
+        errors = []
+        for number, row in enumerate(rows):
+            try:
+                values = _constructor_args(row, names, defaults)
+                validate_book_fields(*select(values + fixed), checked_authors, checked_genres)
+            except (TypeError, ValueError) as error:
+                errors.append((number, error))
+            else:
+                books.append(cls(*values, trusted=True))
+        return books, errors
+
+    def subscribe(self, callback) -> None:
+        """
+        Подписка на изменения книги
+        callback(book, event) вызывается после изменения,
+        event - 'borrow', 'return', 'condition' (изменение состояния),
+        'scratches' (изменение количества царапин GlossyCover)
+        или 'borrow_count' (изменение счетчика взятий без взятия, см. set_state)
+        """
+        self._observers = self._observers + (callback,)
+
+    def unsubscribe(self, callback) -> None:
+        """Отмена подписки на изменения книги"""
+        self._observers = tuple(observer for observer in self._observers if observer != callback)
+
+    def _notify(self, event: str) -> None:
+        """Оповещение подписчиков об изменении книги"""
+        for observer in self._observers:
+            observer(self, event)
+
     def get_age(self, current_year: int = datetime.now().year) -> int:
         """Возраст книги в годах"""
         return current_year - self.year
 
     def get_condition(self) -> str:
         """Текстовое описание состояния книги"""
-        if self.condition > 90:
-            return "Как новая"
-        elif self.condition > 70:
-            return "Хорошая"
-        elif self.condition > 40:
-            return "Поношенная"
-        elif self.condition > 15:
-            return "Сильно изношенная"
-        else:
-            return "Аварийное состояние"
+        return condition_band(self.condition)
 
     def update_condition(self, change: int) -> None:
         """Обновление состояния книги, ограничение значения от 0 до 100"""
-        self.condition = max(0, min(100, self.condition + change))
+        condition = max(0, min(100, self.condition + change))
+        if condition != self.condition:
+            self.condition = condition
+            self._notify('condition')
 
     def borrow(self) -> bool:
         """Взятие книги, если она ещё не взята"""
         if not self._is_borrowed:
             self._is_borrowed = True
             self._borrow_count += 1
+            self._notify('borrow')
             return True
         return False
 
     def return_book(self) -> None:
         """Возвращение книгу"""
-        self._is_borrowed = False
+        if self._is_borrowed:
+            self._is_borrowed = False
+            self._notify('return')
 
     def is_borrowed(self) -> bool:
         """Проверка, взята ли книга"""
@@ -130,14 +224,36 @@ class Book:
             raise ValueError("урон не может быть отрицательным")
         self.update_condition(-amount)
 
+    def set_state(self, condition: int, borrow_count: int, is_borrowed: bool, scratches: int = 0) -> None:
+        """
+        Перевод книги в заданное состояние (восстановление из журнала, запись модели износа)
+        Подписчики оповещаются о каждом измененном поле: 'borrow_count', 'borrow'
+        или 'return', 'condition'. Повторный вызов с тем же состоянием ничего не меняет
+        Параметры:
+        scratches - количество царапин (учитывается только у GlossyCover)
+        """
+        # borrow() сам увеличивает счетчик взятий, поэтому до взятия счетчик на единицу меньше
+        count = borrow_count - 1 if is_borrowed and not self._is_borrowed else borrow_count
+        if count != self._borrow_count:
+            self._borrow_count = count
+            self._notify('borrow_count')
+        if is_borrowed:
+            self.borrow()
+        else:
+            self.return_book()
+        self.update_condition(condition - self.condition)
+
 
 class HardCover(Book):
     """Класс для книг с твердой обложкой"""
+
+    __slots__ = ()
+    _COVER_TYPE = CoverType.HARD
     
     def __init__(self, title: str, author: str, year: int, genre: str, 
-                 isbn: str, condition: int = 100, has_images: bool = False) -> None:
+                 isbn: str, condition: int = 100, has_images: bool = False, *, trusted: bool = False) -> None:
         # Вызов конструктора родительского класса
-        super().__init__(title, author, year, genre, CoverType.HARD, isbn, condition, has_images)
+        super().__init__(title, author, year, genre, CoverType.HARD, isbn, condition, has_images, trusted=trusted)
         self.cover_type = CoverType.HARD
         self.has_images = has_images
         self.update_condition(20)  # Бонус к состоянию для твердой обложки
@@ -164,11 +280,14 @@ class HardCover(Book):
 
 class SoftCover(Book):
     """Класс для книг с мягкой обложкой"""
+
+    __slots__ = ()
+    _COVER_TYPE = CoverType.SOFT
     
     def __init__(self, title: str, author: str, year: int, genre: str, 
-                 isbn: str, condition: int = 100, has_images: bool = False) -> None:
+                 isbn: str, condition: int = 100, has_images: bool = False, *, trusted: bool = False) -> None:
         # Вызов конструктора родительского класса
-        super().__init__(title, author, year, genre, CoverType.SOFT, isbn, condition, has_images)
+        super().__init__(title, author, year, genre, CoverType.SOFT, isbn, condition, has_images, trusted=trusted)
         self.cover_type = CoverType.SOFT
         self.has_images = has_images
 
@@ -193,11 +312,14 @@ class SoftCover(Book):
 
 class GlossyCover(Book):
     """Класс для книг с глянцевой обложкой"""
+
+    __slots__ = ('_scratches',)
+    _COVER_TYPE = CoverType.GLOSSY
     
     def __init__(self, title: str, author: str, year: int, genre: str, 
-                 isbn: str, condition: int = 100, has_images: bool = True) -> None:
+                 isbn: str, condition: int = 100, has_images: bool = True, *, trusted: bool = False) -> None:
         # Вызов конструктора родительского класса
-        super().__init__(title, author, year, genre, CoverType.GLOSSY, isbn, condition, has_images)
+        super().__init__(title, author, year, genre, CoverType.GLOSSY, isbn, condition, has_images, trusted=trusted)
         self.cover_type = CoverType.GLOSSY
         self.has_images = has_images
         self._scratches = 0  # Счетчик царапин для глянцевой обложки
@@ -231,8 +353,45 @@ class GlossyCover(Book):
     def add_scratches(self, count: int = 1) -> None:
         """Добавление царапин на глянцевую обложку"""
         self._scratches += count
+        # Царапины меняются и при состоянии 0, когда события 'condition' не будет
+        self._notify('scratches')
         self.update_condition(-count * 2)  # Каждая царапина ухудшает состояние на 2
 
     def damage(self, amount: int = 10):
         """Нанесение урона книге с глянцевой обложкой"""
-        self.update_condition(-amount)
\ No newline at end of file
+        self.update_condition(-amount)
+
+    def set_state(self, condition: int, borrow_count: int, is_borrowed: bool, scratches: int = 0) -> None:
+        """Перевод книги в заданное состояние с количеством царапин (событие 'scratches')"""
+        if scratches != self._scratches:
+            self._scratches = scratches
+            self._notify('scratches')
+        super().set_state(condition, borrow_count, is_borrowed)
+
+# Классы книг по имени класса - для восстановления сохраненных книг
+BOOK_CLASSES = {cls.__name__: cls for cls in (Book, HardCover, SoftCover, GlossyCover)}
+
+
+def restore_book(kind: str, title: str, author: str, year: int, genre: str, cover_type: str,
+                 isbn: str, condition: int, has_images: bool, borrow_count: int = 0,
+                 is_borrowed: bool = False, scratches: int = 0) -> Book:
+    """
+    Восстановление сохраненной книги в точном состоянии (без валидации и без
+    бонусов конструктора, например +20 к состоянию у HardCover)
+    Параметры:
+    kind - имя класса книги из BOOK_CLASSES
+    borrow_count, is_borrowed, scratches - сохраненное состояние книги
+    """
+    cls = BOOK_CLASSES.get(kind)
+    if cls is None:
+        raise ValueError(f"неизвестный класс книги: {kind}")
+    if cls is Book:
+        book = Book(title, author, year, genre, cover_type, isbn, condition, has_images, trusted=True)
+    else:
+        book = cls(title, author, year, genre, isbn, condition, has_images, trusted=True)
+    book.condition = condition
+    book._borrow_count = borrow_count
+    book._is_borrowed = bool(is_borrowed)
+    if cls is GlossyCover:
+        book._scratches = scratches
+    return book
@@ -1,16 +1,33 @@
+from itertools import islice
 from books import Book  
 
 class BookCollection:
-    """Класс для управления коллекцией книг"""
+    """
+    Класс для управления коллекцией книг
+    Книги хранятся в словаре ISBN -> Book в порядке добавления.
+    Коллекция может быть представлением чужого хранилища (например,
+    основного хранилища Library), тогда она не хранит отдельной копии книг
+    и доступна только для чтения: книги хранилища записаны и во вторичные
+    индексы, поэтому изменять его нужно через владельца (Library)
+    """
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, books: dict = None):
         """
         Конструктор класса BookCollection
         Параметры:
         name - название коллекции
+        books - общее хранилище ISBN -> Book (по умолчанию создается собственное);
+                коллекция над общим хранилищем только для чтения
         """
         self.name = name
-        self._books = []  # Приватный список для хранения книг
+        self._books = {} if books is None else books  # Приватное хранилище книг (ISBN -> Book)
+        self._read_only = books is not None  # Представление чужого хранилища
+
+    def _check_writable(self) -> None:
+        """Запрет изменения представления: хранилище изменяется его владельцем вместе с индексами"""
+        if self._read_only:
+            raise TypeError(f"коллекция '{self.name}' - представление хранилища только для чтения, "
+                            f"книги добавляются и удаляются через библиотеку")
 
     def __len__(self) -> int:
         """Количество книг в коллекции"""
@@ -18,11 +35,27 @@ class BookCollection:
 
     def __iter__(self):
         """Итерация по коллекции книг"""
-        return iter(self._books)
+        return iter(self._books.values())
+
+    def __contains__(self, book) -> bool:
+        """Проверка наличия книги (или ISBN) в коллекции за O(1)"""
+        if isinstance(book, str):
+            return book in self._books
+        return self._books.get(book.isbn) is book
 
-    def __getitem__(self, index: int):
-        """Доступ к книге по индексу"""
-        return self._books[index]
+    def __getitem__(self, index):
+        """
+        Доступ к книге по порядковому номеру (или срезу)
+        Словарь не поддерживает доступ по номеру, поэтому книга ищется
+        перебором: O(i) для номера i (для отрицательных - O(n))
+        """
+        if isinstance(index, slice):
+            return list(self._books.values())[index]
+        if index < 0:
+            index += len(self._books)
+        if not 0 <= index < len(self._books):
+            raise IndexError("индекс книги вне диапазона коллекции")
+        return next(islice(self._books.values(), index, None))
     
     def add_book(self, book: Book) -> None:
         """
@@ -30,24 +63,39 @@ class BookCollection:
         Параметры:
         book - объект класса Book для добавления
         """
-        self._books.append(book)
+        self._check_writable()
+        self._books[book.isbn] = book
+
+    def remove_by_isbn(self, isbn: str) -> bool:
+        """
+        Удаление книги из коллекции по ISBN за O(1)
+        Параметры:
+        isbn - ISBN книги для удаления
+        Возвращает:
+        bool - True если книга была удалена, False если не найдена
+        """
+        self._check_writable()
+        return self._books.pop(isbn, None) is not None
 
     def remove_by_title(self, title: str) -> bool:
         """
-        Удаление книги из коллекции по названию
+        Удаление книги из коллекции по названию (без учета регистра)
+        Индекса названий у коллекции нет, поэтому книга ищется перебором за O(n)
+        (в библиотеке - Library.remove_book_by_title по индексу)
         Параметры:
         title - название книги для удаления
         Возвращает:
         bool - True если книга была удалена, False если не найдена
         """
-        for i, book in enumerate(self._books):
+        self._check_writable()
+        for isbn, book in self._books.items():
             if book.title.lower() == title.lower():
-                removed_book = self._books.pop(i)  # Удаляем книгу по индексу
+                del self._books[isbn]  # Удаляем книгу по ISBN
                 return True
         return False  # Книга не найдена
 
     def show_collection(self) -> None:
         """Отображение всей коллекции книг в консоли"""
         print(f"\n=== Коллекция '{self.name}' ({len(self)} книг) ===")
-        for i, book in enumerate(self._books):
-            print(f"{i}: {book}")  # Используется строковое представление книги
\ No newline at end of file
+        for i, book in enumerate(self._books.values()):
+            print(f"{i}: {book}")  # Используется строковое представление книги
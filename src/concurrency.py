@@ -0,0 +1,132 @@
+import threading
+
+
+class RWLock:
+    """
+    Блокировка читателей-писателей
+    Читатели работают одновременно, писатель получает монопольный доступ.
+    Ожидающий писатель не пропускает новых читателей (писатели не голодают).
+    Повторный захват в том же потоке разрешен: чтение внутри чтения, чтение
+    и запись внутри записи. Повысить чтение до записи нельзя - это взаимоблокировка
+    """
+
+    def __init__(self):
+        self._mutex = threading.Lock()
+        self._condition = threading.Condition(self._mutex)
+        self._readers = 0           # Потоки, удерживающие чтение
+        self._waiting_writers = 0   # Писатели в очереди
+        self._writer = None         # Идентификатор потока-писателя
+        self._writer_depth = 0      # Глубина повторного захвата записи
+        self._local = threading.local()
+        self._read_guard = _Guard(self.acquire_read, self.release_read)
+        self._write_guard = _Guard(self.acquire_write, self.release_write)
+
+    def acquire_read(self) -> None:
+        """Захват на чтение"""
+        local = self._local
+        depth = getattr(local, 'reads', 0)
+        if depth:
+            local.reads = depth + 1
+            return
+        if self._writer == threading.get_ident():
+            # Чтение внутри записи: доступ уже монопольный
+            local.nested = getattr(local, 'nested', 0) + 1
+            return
+        with self._mutex:
+            # Быстрый путь без ожидания: писателей нет
+            if self._writer is None and not self._waiting_writers:
+                self._readers += 1
+                local.reads = 1
+                return
+        with self._condition:
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        local.reads = 1
+
+    def release_read(self) -> None:
+        """Освобождение чтения"""
+        local = self._local
+        if getattr(local, 'nested', 0) and self._writer == threading.get_ident():
+            local.nested -= 1
+            return
+        local.reads -= 1
+        if local.reads:
+            return
+        with self._mutex:
+            self._readers -= 1
+            if not self._readers and self._waiting_writers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """Захват на запись (монопольный)"""
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writer_depth += 1
+            return
+        if getattr(self._local, 'reads', 0):
+            raise RuntimeError("нельзя захватить запись, удерживая чтение")
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer is not None or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self) -> None:
+        """Освобождение записи"""
+        self._writer_depth -= 1
+        if self._writer_depth:
+            return
+        with self._condition:
+            self._writer = None
+            self._condition.notify_all()
+
+    def read(self) -> '_Guard':
+        """Контекст чтения: with lock.read(): ..."""
+        return self._read_guard
+
+    def write(self) -> '_Guard':
+        """Контекст записи: with lock.write(): ..."""
+        return self._write_guard
+
+
+class _Guard:
+    """Контекстный менеджер захвата и освобождения (без создания генератора на каждый вызов)"""
+
+    __slots__ = ('_acquire', '_release')
+
+    def __init__(self, acquire, release):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self) -> None:
+        self._acquire()
+
+    def __exit__(self, *exc_info) -> None:
+        self._release()
+
+
+class StripedLock:
+    """
+    Набор блокировок, распределенных по ключам (например, ISBN)
+    Операции с разными ключами почти всегда идут параллельно, с одним ключом -
+    последовательно. Память не зависит от количества ключей
+    """
+
+    def __init__(self, stripes: int = 64):
+        """
+        Параметры:
+        stripes - количество блокировок
+        """
+        if stripes < 1:
+            raise ValueError("количество блокировок должно быть положительным")
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def lock_for(self, key) -> threading.Lock:
+        """Блокировка ключа: with striped.lock_for(isbn): ..."""
+        return self._locks[hash(key) % len(self._locks)]
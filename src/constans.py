@@ -17,6 +17,21 @@ SIMULATION_EVENTS = [
 ]
 
 
+# Текстовые описания состояния книги: (описание, порог), состояние строго больше порога.
+# Порядок - от лучшего состояния к худшему
+CONDITION_BANDS = [
+    ("Как новая", 90),
+    ("Хорошая", 70),
+    ("Поношенная", 40),
+    ("Сильно изношенная", 15),
+    ("Аварийное состояние", -1)
+]
+
+
+# Специальные символы, запрещенные в названии, имени автора и жанре
+FORBIDDEN_SYMBOLS = ['@', '#', '$', '%', '^', '&', '*', '=', '+', '<', '>', '/', '\\', '|', '~', '`']
+
+
 class CoverType:
     """Класс для типов обложки книг"""
     HARD = 'Твёрдая'   # Твердая обложка
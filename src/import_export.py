@@ -0,0 +1,174 @@
+import csv
+import json
+import os
+from itertools import islice
+from books import BOOK_CLASSES
+from constans import CoverType
+from records import RECORD_FIELDS, book_to_record
+
+
+FORMATS = ('csv', 'jsonl')
+
+# Класс книги по типу обложки, если в записи не указан класс
+KIND_BY_COVER_TYPE = {
+    CoverType.HARD: 'HardCover',
+    CoverType.SOFT: 'SoftCover',
+    CoverType.GLOSSY: 'GlossyCover',
+}
+
+
+def detect_format(path: str, format: str = None) -> str:
+    """Формат файла: заданный явно или по расширению (.csv, .jsonl)"""
+    if format is None:
+        format = os.path.splitext(path)[1].lstrip('.').lower()
+    if format not in FORMATS:
+        raise ValueError(f"неизвестный формат файла книг: {format} (поддерживаются: {', '.join(FORMATS)})")
+    return format
+
+
+def read_records(path: str, format: str = None):
+    """
+    Построчное чтение записей книг из файла
+    Генератор пар (номер строки, запись) - в памяти держится одна строка файла.
+    Строки JSONL, которые не удалось разобрать, возвращаются как (номер, исключение)
+    """
+    format = detect_format(path, format)
+    with open(path, encoding='utf-8', newline='') as file:
+        if format == 'csv':
+            reader = csv.DictReader(file)
+            for record in reader:
+                yield reader.line_num, record
+        else:
+            for number, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield number, json.loads(line)
+                except ValueError as error:
+                    yield number, error
+
+
+def _to_int(value, name: str) -> int:
+    """Целое число из значения записи (в CSV все значения - строки)"""
+    if isinstance(value, bool):
+        raise ValueError(f"поле {name} должно быть целым числом")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"поле {name} должно быть целым числом: {value!r}") from None
+
+
+def _to_bool(value) -> bool:
+    """Логическое значение из записи ('True'/'False', '1'/'0', 'да'/'нет' в CSV)"""
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value in ('true', '1', 'да', 'yes', 'y'):
+            return True
+        if value in ('false', '0', 'нет', 'no', 'n', ''):
+            return False
+        raise ValueError(f"ожидается логическое значение: {value!r}")
+    return bool(value)
+
+
+def parse_book(record: dict):
+    """
+    Создание книги из записи файла с проверкой конструктором класса книги
+    Класс определяется полем kind или типом обложки. Сохраненное состояние
+    (condition, borrow_count, is_borrowed, scratches) переносится без изменений
+    """
+    if not isinstance(record, dict):
+        raise ValueError("запись книги должна быть объектом")
+    kind = record.get('kind') or KIND_BY_COVER_TYPE.get(record.get('cover_type'), 'Book')
+    cls = BOOK_CLASSES.get(kind)
+    if cls is None:
+        raise ValueError(f"неизвестный класс книги: {kind}")
+    missing = [name for name in ('title', 'author', 'year', 'genre', 'isbn') if record.get(name) in (None, '')]
+    if missing:
+        raise ValueError(f"не заданы поля книги: {', '.join(missing)}")
+
+    condition = _to_int(record['condition'], 'condition') if record.get('condition') not in (None, '') else 100
+    year = _to_int(record['year'], 'year')
+    fields = (record['title'], record['author'], year, record['genre'])
+    if record.get('has_images') in (None, ''):
+        has_images = kind == 'GlossyCover'  # Как по умолчанию в конструкторах
+    else:
+        has_images = _to_bool(record['has_images'])
+    if kind == 'Book':
+        book = cls(*fields, record.get('cover_type'), record['isbn'], condition, has_images)
+    else:
+        book = cls(*fields, record['isbn'], condition, has_images)
+
+    # Точное состояние из файла (без бонусов конструктора)
+    book.condition = condition
+    book._borrow_count = _to_int(record.get('borrow_count') or 0, 'borrow_count')
+    book._is_borrowed = _to_bool(record.get('is_borrowed') or False)
+    if hasattr(book, '_scratches'):
+        book._scratches = _to_int(record.get('scratches') or 0, 'scratches')
+    return book
+
+
+def import_books(library, path: str, format: str = None, chunk_size: int = 1000) -> tuple:
+    """
+    Потоковый импорт книг из файла CSV или JSONL
+    Записи разбираются и проверяются по одной и добавляются в библиотеку
+    пакетами по chunk_size книг (library.add_books), поэтому расход памяти
+    не зависит от размера файла
+    Параметры:
+    library - библиотека (Library или SqliteLibrary)
+    path - путь к файлу
+    format - 'csv' или 'jsonl' (по умолчанию - по расширению файла)
+    chunk_size - размер пакета добавления
+    Возвращает:
+    (imported, errors) - количество добавленных книг и ошибки (номер строки, описание)
+    """
+    imported = 0
+    errors = []
+    records = read_records(path, format)
+    while True:
+        chunk = []
+        lines = []  # Номера строк файла для книг пакета
+        read = 0
+        for number, record in islice(records, chunk_size):
+            read += 1
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                chunk.append(parse_book(record))
+                lines.append(number)
+            except (TypeError, ValueError) as error:
+                errors.append((number, str(error)))
+        if chunk:
+            duplicates = library.add_books(chunk)
+            imported += len(chunk) - len(duplicates)
+            for position, isbn in duplicates:
+                errors.append((lines[position], f"Книга с ISBN {isbn} уже существует"))
+        if read < chunk_size:
+            return imported, errors
+
+
+def export_books(library, path: str, format: str = None) -> int:
+    """
+    Потоковый экспорт книг в файл CSV или JSONL
+    Книги записываются по одной при обходе библиотеки, без промежуточных списков.
+    Записи содержат класс и состояние книги, поэтому import_books восстанавливает их точно
+    Параметры:
+    library - библиотека или любой итерируемый набор книг
+    path - путь к файлу
+    format - 'csv' или 'jsonl' (по умолчанию - по расширению файла)
+    Возвращает:
+    int - количество записанных книг
+    """
+    format = detect_format(path, format)
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        if format == 'csv':
+            writer = csv.DictWriter(file, RECORD_FIELDS)
+            writer.writeheader()
+            for book in library:
+                writer.writerow(book_to_record(book))
+                count += 1
+        else:
+            for book in library:
+                file.write(json.dumps(book_to_record(book), ensure_ascii=False) + '\n')
+                count += 1
+    return count
@@ -1,23 +1,123 @@
-from books import Book
+from itertools import islice
+from operator import attrgetter
+from bitmap_index import BitmapIndex, Bits
+from book_store import ColumnarBookStore
+from books import Book, condition_band, condition_band_bounds
+from constans import CONDITION_BANDS
+from sorted_index import SortedIndex
+from title_index import TitleIndex
+
+
+# Атрибуты с небольшим числом значений, для которых ведутся битовые индексы
+BITMAP_ATTRIBUTES = {
+    'cover_type': lambda book: book.cover_type,
+    'has_images': lambda book: bool(book.has_images),
+    'genre': lambda book: book.genre,
+    'condition_band': lambda book: condition_band(book.condition),
+}
+
+
+def _add_to_bucket(index: dict, key, book: Book) -> None:
+    """Добавление книги в корзину индекса (корзина - словарь ISBN -> Book)"""
+    bucket = index.get(key)
+    if bucket is None:
+        bucket = index[key] = {}
+    bucket[book.isbn] = book
+
+
+def _add_many_to_buckets(index: dict, key, books: list) -> None:
+    """Пакетное добавление книг в корзины индекса, key - функция получения ключа книги"""
+    for book in books:
+        value = key(book)
+        bucket = index.get(value)
+        if bucket is None:
+            bucket = index[value] = {}
+        bucket[book.isbn] = book
+
+
+def _remove_from_bucket(index: dict, key, book: Book) -> None:
+    """Удаление книги из корзины индекса, пустая корзина удаляется вместе с ключом"""
+    bucket = index.get(key)
+    if bucket is None:
+        return
+    bucket.pop(book.isbn, None)
+    if not bucket:
+        del index[key]
+
 
 class IndexDict:
-    """Класс для индексации книг по различным критериям"""
+    """
+    Класс для индексации книг по различным критериям
+    Корзины всех индексов - словари ISBN -> Book: они сохраняют порядок
+    добавления и позволяют добавлять и удалять книгу за O(1)
+    """
+
+    # Поля с корзинами книг (для bucket_sizes и метрик)
+    INDEXED_FIELDS = ('title', 'author', 'year', 'genre', 'cover_type', 'has_images', 'condition')
     
-    def __init__(self):
+    def __init__(self, columnar: bool = False, verbose: bool = True):
+        """
+        Параметры:
+        columnar - вести колоночное хранилище для векторных агрегатов
+        verbose - выводить сообщения о добавлении и удалении книг
+        """
+        self.verbose = verbose
         # Инициализация индексов для разных типов поиска
-        self._isbn_index = {}   # Индекс по ISBN (ISBN -> Book)
-        self._title_index = {}  # Индекс по названию (title -> list[Book])
-        self._author_index = {} # Индекс по автору (author -> list[Book])
-        self._year_index = {}   # Индекс по году (year -> list[Book])
-        self._all_books = []    # Список всех книг
+        self._isbn_index = {}   # Индекс по ISBN (ISBN -> Book), хранит все книги в порядке добавления
+        self._title_index = {}  # Индекс по названию (title -> {ISBN: Book})
+        self._author_index = {} # Индекс по автору (author -> {ISBN: Book})
+        self._year_index = SortedIndex()  # Упорядоченный индекс по году (year -> {ISBN: Book})
+        self._genre_index = {}  # Индекс по жанру (genre -> {ISBN: Book})
+        self._cover_type_index = {}  # Индекс по типу обложки (cover_type -> {ISBN: Book})
+        self._has_images_index = {}  # Индекс по наличию иллюстраций (bool -> {ISBN: Book})
+        self._title_search = TitleIndex()  # Индекс для поиска по подстроке и префиксу названия
+        self._borrowed_index = {}  # Взятые книги (ISBN -> Book), обновляется по событиям книг
+        self._condition_index = SortedIndex()  # Упорядоченный индекс по состоянию (condition -> {ISBN: Book})
+        self._indexed_condition = {}  # Состояние, под которым книга записана в индекс (ISBN -> condition)
+        self._book_ids = {}     # Плотные внутренние идентификаторы книг (ISBN -> id)
+        self._free_ids = []     # Освободившиеся идентификаторы для повторного использования
+        self._bitmaps = BitmapIndex(BITMAP_ATTRIBUTES)  # Битовые индексы по плотным идентификаторам
+        self.columns = ColumnarBookStore() if columnar else None  # Колоночное хранилище (необязательно)
+        self._listeners = ()    # Подписчики на изменения коллекции (например, журнал операций)
+
+    def subscribe(self, callback) -> None:
+        """
+        Подписка на изменения коллекции
+        callback(book, event) вызывается после изменения, event - 'add', 'remove'
+        или событие книги коллекции ('borrow', 'return', 'condition', 'scratches', 'borrow_count')
+        """
+        self._listeners = self._listeners + (callback,)
+
+    def unsubscribe(self, callback) -> None:
+        """Отмена подписки на изменения коллекции"""
+        self._listeners = tuple(listener for listener in self._listeners if listener != callback)
+
+    def _notify(self, book: Book, event: str) -> None:
+        """Оповещение подписчиков об изменении коллекции"""
+        for listener in self._listeners:
+            listener(book, event)
 
     def __len__(self) -> int:
         """Общее количество книг в коллекции"""
-        return len(self._all_books)
+        return len(self._isbn_index)
 
     def __iter__(self):
         """Итератор по всем книгам"""
-        return iter(self._all_books)
+        return iter(self._isbn_index.values())
+
+    def __contains__(self, key) -> bool:
+        """Проверка наличия книги по ISBN (или объекту Book) за O(1)"""
+        if isinstance(key, str):
+            return key in self._isbn_index
+        return key.isbn in self._isbn_index
+
+    @property
+    def store(self) -> dict:
+        """
+        Основное хранилище книг (ISBN -> Book) в порядке добавления
+        Изменять его напрямую нельзя - только через add_book/remove_book
+        """
+        return self._isbn_index
 
     def __getitem__(self, key):
         """
@@ -35,12 +135,12 @@ class IndexDict:
             if key in self._isbn_index:
                 return self._isbn_index[key]  # Возвращаем книгу по ISBN
             elif key in self._author_index:
-                return self._author_index[key] # Возвращаем список книг автора
+                return list(self._author_index[key].values()) # Возвращаем список книг автора
             else:
                 raise KeyError(f"Не найден ISBN или автор: {key}")
         elif isinstance(key, int):
             if key in self._year_index:
-                return self._year_index[key]  # Возвращаем список книг года
+                return list(self._year_index[key].values())  # Возвращаем список книг года
             else:
                 return []  # Возвращаем пустой список если год не найден
         else:
@@ -54,40 +154,105 @@ class IndexDict:
 
     def add_to_author_index(self, book: Book) -> None:
         """Добавление книги в индекс по автору"""
-        if book.author not in self._author_index:
-            self._author_index[book.author] = []
-        self._author_index[book.author].append(book)
+        _add_to_bucket(self._author_index, book.author, book)
 
     def add_to_title_index(self, book: Book) -> None:
         """Добавление книги в индекс по названию"""
-        if book.title not in self._title_index:
-            self._title_index[book.title] = []
-        self._title_index[book.title].append(book)
+        _add_to_bucket(self._title_index, book.title, book)
 
     def add_to_year_index(self, book: Book) -> None:
         """Добавление книги в индекс по году"""
-        if book.year not in self._year_index:
-            self._year_index[book.year] = []
-        self._year_index[book.year].append(book)
+        self._year_index.add(book.year, book)
+
+    def add_to_genre_index(self, book: Book) -> None:
+        """Добавление книги в индекс по жанру"""
+        _add_to_bucket(self._genre_index, book.genre, book)
+
+    def add_to_cover_type_index(self, book: Book) -> None:
+        """Добавление книги в индекс по типу обложки"""
+        _add_to_bucket(self._cover_type_index, book.cover_type, book)
+
+    def add_to_has_images_index(self, book: Book) -> None:
+        """Добавление книги в индекс по наличию иллюстраций"""
+        _add_to_bucket(self._has_images_index, bool(book.has_images), book)
 
     def add_book(self, book: Book) -> None:
-        """Добавление книги во все индексы и общий список"""
-        if book in self._all_books:
+        """Добавление книги во все индексы"""
+        if self._isbn_index.get(book.isbn) is book:
             raise ValueError("Книга уже есть в коллекции")
         
         try:
-            # Добавляем книгу во все индексы
+            # Добавляем книгу во все индексы (индекс по ISBN - общий список книг)
             self.add_to_isbn_index(book)
             self.add_to_author_index(book)
             self.add_to_year_index(book)
             self.add_to_title_index(book)
+            self.add_to_genre_index(book)
+            self.add_to_cover_type_index(book)
+            self.add_to_has_images_index(book)
+            self._title_search.add(book)
+            if book.is_borrowed():
+                self._borrowed_index[book.isbn] = book
+            self._condition_index.add(book.condition, book)
+            self._indexed_condition[book.isbn] = book.condition
+            book_id = self._allocate_id(book.isbn)
+            self._bitmaps.add(book_id, book)
+            if self.columns is not None:
+                self.columns.set_row(book_id, book)
+            # Индексы узнают об изменениях книги через подписку
+            book.subscribe(self._on_book_changed)
+            self._notify(book, 'add')
             
-            # Добавляем книгу в общий список
-            self._all_books.append(book)
-            
-            print(f"    Книга '{book.title}' добавлена в индексы")
+            if self.verbose:
+                print(f"    Книга '{book.title}' добавлена в индексы")
         except ValueError:
-            print(f"[Индексы] Ошибка при добавлении")
+            if self.verbose:
+                print(f"[Индексы] Ошибка при добавлении")
+
+    def add_books(self, books) -> list:
+        """
+        Пакетное добавление книг
+        Сначала книги записываются в основное хранилище, затем все индексы
+        строятся за один проход по новым книгам (без вывода сообщения на каждую книгу)
+        Возвращает:
+        list - отклоненные книги с уже существующим ISBN: (номер в пакете, ISBN)
+        """
+        # Запись в основное хранилище с проверкой дубликатов (в том числе внутри пакета)
+        added = []
+        duplicates = []
+        for position, book in enumerate(books):
+            if book.isbn in self._isbn_index:
+                duplicates.append((position, book.isbn))
+                continue
+            self._isbn_index[book.isbn] = book
+            added.append(book)
+
+        # Построение всех индексов за один проход по каждому индексу
+        _add_many_to_buckets(self._author_index, attrgetter('author'), added)
+        _add_many_to_buckets(self._title_index, attrgetter('title'), added)
+        _add_many_to_buckets(self._genre_index, attrgetter('genre'), added)
+        _add_many_to_buckets(self._cover_type_index, attrgetter('cover_type'), added)
+        _add_many_to_buckets(self._has_images_index, lambda book: bool(book.has_images), added)
+        ids = []
+        for book in added:
+            if book.is_borrowed():
+                self._borrowed_index[book.isbn] = book
+            self._indexed_condition[book.isbn] = book.condition
+            book_id = self._allocate_id(book.isbn)
+            ids.append((book_id, book))
+            if self.columns is not None:
+                self.columns.set_row(book_id, book)
+            book.subscribe(self._on_book_changed)
+        self._bitmaps.add_many(ids)
+
+        # Упорядоченные и текстовые индексы сливаются с новыми книгами целиком
+        self._year_index.add_many((book.year, book) for book in added)
+        self._condition_index.add_many((book.condition, book) for book in added)
+        self._title_search.add_many(added)
+        if self._listeners:
+            for book in added:
+                self._notify(book, 'add')
+        return duplicates
 
     def remove_from_isbn_index(self, isbn: str) -> None:
         """Удаление книги из индекса по ISBN"""
@@ -96,25 +261,35 @@ class IndexDict:
 
     def remove_from_author_index(self, book: Book) -> None:
         """Удаление книги из индекса по автору"""
-        if book.author in self._author_index:
-            self._author_index[book.author].remove(book)
-           
-            # Если у автора больше нет книг, удаляем автора из индекса
-            if not self._author_index[book.author]:
-                del self._author_index[book.author]
+        # Если у автора больше нет книг, автор удаляется из индекса
+        _remove_from_bucket(self._author_index, book.author, book)
+
+    def remove_from_title_index(self, book: Book) -> None:
+        """Удаление книги из индекса по названию"""
+        _remove_from_bucket(self._title_index, book.title, book)
 
     def remove_from_year_index(self, book: Book) -> None:
         """Удаление книги из индекса по году"""
-        if book.year in self._year_index:
-            self._year_index[book.year].remove(book)
-            # Если в этом году больше нет книг, удаляем год из индекса
-            if not self._year_index[book.year]:
-                del self._year_index[book.year]
+        # Пустые корзины удаляются из индекса вместе с ключом
+        self._year_index.remove(book.year, book)
+
+    def remove_from_genre_index(self, book: Book) -> None:
+        """Удаление книги из индекса по жанру"""
+        _remove_from_bucket(self._genre_index, book.genre, book)
+
+    def remove_from_cover_type_index(self, book: Book) -> None:
+        """Удаление книги из индекса по типу обложки"""
+        _remove_from_bucket(self._cover_type_index, book.cover_type, book)
+
+    def remove_from_has_images_index(self, book: Book) -> None:
+        """Удаление книги из индекса по наличию иллюстраций"""
+        _remove_from_bucket(self._has_images_index, bool(book.has_images), book)
 
     def remove_book(self, isbn: str) -> bool:
         """Удаление книги из всех индексов по ISBN"""
         if isbn not in self._isbn_index:
-            print(f"    Книга с ISBN {isbn} не найдена")
+            if self.verbose:
+                print(f"    Книга с ISBN {isbn} не найдена")
             return False
         
         # Получаем книгу по ISBN
@@ -123,26 +298,172 @@ class IndexDict:
         # Удаляем книгу из всех индексов
         self.remove_from_isbn_index(isbn)
         self.remove_from_author_index(book)
+        self.remove_from_title_index(book)
         self.remove_from_year_index(book)
+        self.remove_from_genre_index(book)
+        self.remove_from_cover_type_index(book)
+        self.remove_from_has_images_index(book)
+        self._title_search.remove(book)
+        self._borrowed_index.pop(isbn, None)
+        self._condition_index.remove(self._indexed_condition.pop(isbn), book)
+        self._release_id(isbn)
+        book.unsubscribe(self._on_book_changed)
+        self._notify(book, 'remove')
         
-        # Удаляем книгу из общего списка
-        self._all_books.remove(book)
-        
-        print(f"    Книга '{book.title}' удалена из индексов")
+        if self.verbose:
+            print(f"    Книга '{book.title}' удалена из индексов")
         return True
 
+    def _allocate_id(self, isbn: str) -> int:
+        """Выдача плотного идентификатора книге (освободившиеся используются повторно)"""
+        book_id = self._free_ids.pop() if self._free_ids else len(self._book_ids) + len(self._free_ids)
+        self._book_ids[isbn] = book_id
+        return book_id
+
+    def _release_id(self, isbn: str) -> None:
+        """Освобождение плотного идентификатора книги"""
+        book_id = self._book_ids.pop(isbn)
+        self._bitmaps.remove(book_id)
+        if self.columns is not None:
+            self.columns.clear_row(book_id)
+        self._free_ids.append(book_id)
+
+    def _on_book_changed(self, book: Book, event: str) -> None:
+        """Обновление индексов состояния при изменении книги"""
+        if self.columns is not None:
+            self.columns.update_state(self._book_ids[book.isbn], book)
+        if event == 'borrow':
+            self._borrowed_index[book.isbn] = book
+        elif event == 'return':
+            self._borrowed_index.pop(book.isbn, None)
+        elif event == 'condition':
+            # Книга переносится в корзину нового состояния
+            self._condition_index.remove(self._indexed_condition[book.isbn], book)
+            self._condition_index.add(book.condition, book)
+            self._indexed_condition[book.isbn] = book.condition
+            self._bitmaps.update(self._book_ids[book.isbn], book, 'condition_band')
+        self._notify(book, event)
+
+    def bucket(self, field: str, value) -> dict:
+        """
+        Корзина индекса (ISBN -> Book) для поля и значения
+        Используется планировщиком запросов для пересечения без копирования
+        Возвращаемый словарь нельзя изменять.
+        Возвращает None, если для этого значения индекса нет
+        """
+        if field == 'borrowed':
+            # Индексируются только взятые книги, свободные проверяются перебором
+            return self._borrowed_index if value else None
+        if field == 'year':
+            # Год может быть задан диапазоном (lo, hi)
+            if isinstance(value, tuple):
+                return {book.isbn: book for book in self._year_index.range(*value)}
+            return self._year_index.get(value, {})
+        if field == 'has_images':
+            value = bool(value)
+        return self._field_index(field).get(value, {})
+
+    def _field_index(self, field: str):
+        """Индекс поля (значение -> {ISBN: Book})"""
+        return {
+            'author': self._author_index,
+            'title': self._title_index,
+            'year': self._year_index,
+            'genre': self._genre_index,
+            'cover_type': self._cover_type_index,
+            'has_images': self._has_images_index,
+            'condition': self._condition_index,
+        }[field]
+
+    def bucket_sizes(self, field: str) -> list:
+        """Количество книг для каждого значения поля field из INDEXED_FIELDS"""
+        index = self._field_index(field)
+        if isinstance(index, SortedIndex):
+            return [len(index[key]) for key in list(index.keys())]
+        return [len(bucket) for bucket in list(index.values())]
+
     def search_by_isbn(self, isbn: str):
         """Поиск книги по ISBN"""
         return self._isbn_index.get(isbn)
 
     def search_by_title(self, title: str):
         """Поиск книг по названию"""
-        return self._title_index.get(title)
+        bucket = self._title_index.get(title)
+        return list(bucket.values()) if bucket else None
     
     def search_by_author(self, author: str) -> list:
         """Поиск книг по автору"""
-        return self._author_index.get(author, [])
+        return list(self._author_index.get(author, {}).values())
     
     def search_by_year(self, year: int) -> list:
         """Поиск книг по году издания"""
-        return self._year_index.get(year, [])
\ No newline at end of file
+        return list(self._year_index.get(year, {}).values())
+
+    def search_title_contains(self, fragment: str) -> list:
+        """Поиск книг по подстроке названия без учета регистра (лучшие совпадения первыми)"""
+        return self._title_search.search_contains(fragment)
+
+    def search_title_prefix(self, prefix: str) -> list:
+        """Поиск книг по началу названия без учета регистра"""
+        return self._title_search.search_prefix(prefix)
+
+    def search_by_year_range(self, lo: int = None, hi: int = None, reverse: bool = False) -> list:
+        """
+        Поиск книг, изданных в диапазоне лет [lo, hi] включительно
+        Параметры:
+        lo - первый год диапазона (None - без нижней границы)
+        hi - последний год диапазона (None - без верхней границы)
+        reverse - порядок по убыванию года
+        """
+        return list(self._year_index.range(lo, hi, reverse))
+
+    def iter_by_year(self, reverse: bool = False):
+        """Итератор по всем книгам в порядке возрастания (или убывания) года"""
+        return self._year_index.range(reverse=reverse)
+
+    def search_by_genre(self, genre: str) -> list:
+        """Поиск книг по жанру"""
+        return list(self._genre_index.get(genre, {}).values())
+
+    def search_by_cover_type(self, cover_type: str) -> list:
+        """Поиск книг по типу обложки"""
+        return list(self._cover_type_index.get(cover_type, {}).values())
+
+    def search_by_has_images(self, has_images: bool) -> list:
+        """Поиск книг по наличию иллюстраций"""
+        return list(self._has_images_index.get(bool(has_images), {}).values())
+
+    def borrowed_books(self) -> list:
+        """Список взятых книг (без перебора коллекции)"""
+        return list(self._borrowed_index.values())
+
+    def borrowed_count(self) -> int:
+        """Количество взятых книг"""
+        return len(self._borrowed_index)
+
+    def worst_condition(self, k: int) -> list:
+        """k книг в худшем состоянии (по возрастанию состояния)"""
+        return list(islice(self._condition_index, k))
+
+    def books_in_condition_band(self, band: str) -> list:
+        """Книги с текстовым описанием состояния band (например, "Аварийное состояние")"""
+        return list(self._condition_index.range(*condition_band_bounds(band)))
+
+    def condition_band_counts(self) -> dict:
+        """Количество книг в каждом состоянии (описание -> количество)"""
+        return {band: self._condition_index.count(*condition_band_bounds(band))
+                for band, _ in CONDITION_BANDS}
+
+    def bitmap(self, field: str, value) -> Bits:
+        """
+        Битовая карта книг с заданным значением поля
+        Поля: cover_type, has_images, genre, condition_band.
+        Карты комбинируются операциями &, |, ~, - и считаются через count()
+        """
+        if field == 'has_images':
+            value = bool(value)
+        return self._bitmaps.bits(field, value)
+
+    def all_bits(self) -> Bits:
+        """Битовая карта всех книг"""
+        return self._bitmaps.all()
@@ -0,0 +1,322 @@
+import json
+import os
+import re
+import threading
+from records import STATE_FIELDS, apply_state, book_state, book_to_record, record_to_book
+
+
+class Journal:
+    """
+    Журнал операций библиотеки (write-ahead log) со снимками
+    Каждое изменение коллекции (добавление, удаление, взятие, возврат, изменение
+    состояния книги) дописывается в конец журнала одной строкой JSON за O(1).
+    fsync выполняется пакетами раз в sync_every записей (и при sync/close).
+    Раз в compact_every записей файл журнала закрывается как часть
+    journal.<seq>.log (fsync и переименование - тоже O(1)), а фоновый поток
+    сливает такие части с предыдущим снимком в новый снимок, читая только
+    файлы, а не библиотеку. Восстановление читает снимок, оставшиеся части
+    и хвост журнала. Записи журнала хранят итоговое состояние книги, а не
+    разницу, поэтому повторное применение записи ничего не меняет
+    """
+
+    SNAPSHOT = 'snapshot.jsonl'
+    LOG = 'journal.log'
+    SEGMENT = re.compile(r'journal\.(\d+)\.log$')  # Закрытые части журнала, ожидающие слияния
+
+    def __init__(self, directory: str, sync_every: int = 64, compact_every: int = 10000):
+        """
+        Параметры:
+        directory - каталог для файлов снимка и журнала
+        sync_every - количество записей между fsync (1 - после каждой записи)
+        compact_every - количество записей между фоновыми снимками (0 - только вручную через compact)
+        """
+        if sync_every < 1:
+            raise ValueError("sync_every должен быть положительным")
+        self.directory = directory
+        self.sync_every = sync_every
+        self.compact_every = compact_every
+        self.library = None
+        self._seq = 0             # Номер последней записи журнала
+        self._unsynced = 0        # Записи после последнего fsync
+        self._in_log = 0          # Записи в текущем файле журнала
+        self._file = None
+        self._lock = threading.Lock()  # Запуск и завершение фонового слияния
+        self._compactor = None         # Поток фонового слияния
+        self._compaction_error = None  # Ошибка фонового слияния (передается в wait)
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, self.SNAPSHOT)
+
+    @property
+    def log_path(self) -> str:
+        return os.path.join(self.directory, self.LOG)
+
+    def segments(self) -> list:
+        """Закрытые части журнала по порядку: (номер последней записи, путь)"""
+        found = []
+        for name in os.listdir(self.directory):
+            match = self.SEGMENT.match(name)
+            if match:
+                found.append((int(match.group(1)), os.path.join(self.directory, name)))
+        return sorted(found)
+
+    def open(self, library) -> int:
+        """
+        Восстановление библиотеки из снимка и журнала и подключение к ней
+        Дальнейшие изменения библиотеки и ее книг записываются в журнал
+        Параметры:
+        library - библиотека (пустая, если в каталоге уже есть данные)
+        Возвращает:
+        int - количество примененных записей журнала
+        """
+        if self.library is not None:
+            raise ValueError("журнал уже подключен к библиотеке")
+        existing = len(library)
+        segments = self.segments()
+        has_data = os.path.exists(self.snapshot_path) or os.path.exists(self.log_path) or segments
+        if existing and has_data:
+            raise ValueError("журнал с данными подключается только к пустой библиотеке")
+
+        snapshot_seq = self._load_snapshot(library)
+        self._seq = snapshot_seq
+        replayed = 0
+        for _, path in segments:
+            replayed += self._replay_log(library, path, snapshot_seq)
+        self._in_log = self._replay_log(library, self.log_path, snapshot_seq)
+        replayed += self._in_log
+        created = not os.path.exists(self.log_path)
+        self._file = open(self.log_path, 'a', encoding='utf-8')
+        if created:
+            self._sync_directory()
+        self.library = library
+        library.index.subscribe(self._on_change)
+        if existing:
+            # Книги, добавленные до подключения журнала, сохраняются снимком
+            self.compact()
+        elif segments:
+            # Части, не слитые до остановки, сливаются в фоне
+            self._start_compaction()
+        return replayed
+
+    def _load_snapshot(self, library) -> int:
+        """Загрузка книг из снимка пакетным добавлением, возвращает номер записи снимка"""
+        if not os.path.exists(self.snapshot_path):
+            return 0
+        with open(self.snapshot_path, encoding='utf-8') as file:
+            header = json.loads(file.readline())
+            library.index.add_books(record_to_book(json.loads(line)) for line in file)
+        return header['seq']
+
+    def _replay_log(self, library, path: str, after: int) -> int:
+        """
+        Применение записей файла журнала path с номером больше after
+        Недописанная последняя строка (сбой во время записи) отбрасывается
+        """
+        if not os.path.exists(path):
+            return 0
+        replayed = 0
+        with open(path, 'rb+') as file:
+            valid = 0
+            for line in file:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("недописанная запись")
+                    record = json.loads(line)
+                except ValueError:
+                    file.truncate(valid)
+                    break
+                valid += len(line)
+                self._seq = max(self._seq, record['seq'])
+                if record['seq'] > after:
+                    self._apply(library.index, record)
+                    replayed += 1
+        return replayed
+
+    @staticmethod
+    def _apply(index, record: dict) -> None:
+        """Применение одной записи журнала к индексам библиотеки"""
+        op = record['op']
+        if op == 'add':
+            if record['book']['isbn'] not in index:
+                index.add_books([record_to_book(record['book'])])
+        elif op == 'remove':
+            if record['isbn'] in index:
+                index.remove_book(record['isbn'])
+        elif op == 'state':
+            book = index.search_by_isbn(record['isbn'])
+            if book is not None:
+                apply_state(book, record)
+        else:
+            raise ValueError(f"неизвестная операция журнала: {op}")
+
+    @staticmethod
+    def _merge(books: dict, record: dict) -> None:
+        """Применение одной записи журнала к записям книг снимка (ISBN -> запись), как _apply"""
+        op = record['op']
+        if op == 'add':
+            books.setdefault(record['book']['isbn'], record['book'])
+        elif op == 'remove':
+            books.pop(record['isbn'], None)
+        elif op == 'state':
+            book = books.get(record['isbn'])
+            if book is not None:
+                book.update((field, record[field]) for field in STATE_FIELDS)
+        else:
+            raise ValueError(f"неизвестная операция журнала: {op}")
+
+    def _on_change(self, book, event: str) -> None:
+        """Запись изменения библиотеки в журнал"""
+        if event == 'add':
+            record = {'op': 'add', 'book': book_to_record(book)}
+        elif event == 'remove':
+            record = {'op': 'remove', 'isbn': book.isbn}
+        else:
+            record = {'op': 'state', 'isbn': book.isbn, **book_state(book)}
+        self.append(record)
+
+    def append(self, record: dict) -> None:
+        """Дописывание записи в конец журнала (fsync - пакетами, снимок - в фоне)"""
+        self._seq += 1
+        record['seq'] = self._seq
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._unsynced += 1
+        self._in_log += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+        if self.compact_every and self._in_log >= self.compact_every:
+            self._rotate()
+
+    def sync(self) -> None:
+        """Сброс записанных операций на диск"""
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def _rotate(self) -> None:
+        """
+        Закрытие текущего файла журнала как части journal.<seq>.log и запуск
+        фонового слияния; на пути записи - только fsync и переименование
+        """
+        self.sync()
+        self._file.close()
+        os.replace(self.log_path, os.path.join(self.directory, f'journal.{self._seq}.log'))
+        self._file = open(self.log_path, 'w', encoding='utf-8')
+        self._sync_directory()
+        self._in_log = 0
+        self._start_compaction()
+
+    def _start_compaction(self) -> None:
+        """Запуск потока фонового слияния, если он еще не работает"""
+        with self._lock:
+            if self._compactor is None:
+                self._compactor = threading.Thread(target=self._compact_segments, name='journal-compaction',
+                                                   daemon=True)
+                self._compactor.start()
+
+    def _compact_segments(self) -> None:
+        """
+        Фоновое слияние: снимок и закрытые части журнала читаются из файлов
+        и записываются новым снимком, пока есть несобранные части.
+        Поток делит GIL с потоком записи, но запись не ждет всего слияния
+        """
+        try:
+            while True:
+                with self._lock:
+                    segments = self.segments()
+                    if not segments:
+                        self._compactor = None
+                        return
+                self._merge_segments(segments)
+        except Exception as error:
+            with self._lock:
+                self._compaction_error = error
+                self._compactor = None
+
+    def _merge_segments(self, segments: list) -> None:
+        """Новый снимок из текущего снимка и частей segments; слитые части удаляются"""
+        books = {}
+        seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding='utf-8') as file:
+                seq = json.loads(file.readline())['seq']
+                for line in file:
+                    record = json.loads(line)
+                    books[record['isbn']] = record
+        for last, path in segments:
+            with open(path, encoding='utf-8') as file:
+                for line in file:
+                    record = json.loads(line)
+                    if record['seq'] > seq:
+                        self._merge(books, record)
+            seq = max(seq, last)
+        self._write_snapshot(seq, len(books), books.values())
+        for _, path in segments:
+            os.remove(path)
+        self._sync_directory()
+
+    def wait(self) -> None:
+        """Ожидание завершения фонового слияния; его ошибка передается вызывающему"""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        error, self._compaction_error = self._compaction_error, None
+        if error is not None:
+            raise error
+
+    def compact(self) -> None:
+        """
+        Сохранение текущего состояния библиотеки в снимок и очистка журнала
+        Выполняется в вызывающем потоке за O(n) (в отличие от фонового слияния по
+        compact_every). Снимок пишется во временный файл и атомарно заменяет старый;
+        если сбой случится до очистки журнала, записи с номером не больше номера
+        снимка будут пропущены при восстановлении
+        """
+        self.wait()
+        self.sync()
+        self._write_snapshot(self._seq, len(self.library), (book_to_record(book) for book in self.library))
+        for _, path in self.segments():
+            os.remove(path)
+        self._file.close()
+        self._file = open(self.log_path, 'w', encoding='utf-8')
+        os.fsync(self._file.fileno())
+        self._sync_directory()
+        self._in_log = 0
+
+    def _write_snapshot(self, seq: int, count: int, records) -> None:
+        """
+        Запись снимка: временный файл, fsync, атомарная замена старого снимка
+        и fsync каталога (переименование сохранено на диске только после него)
+        """
+        temporary = self.snapshot_path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            file.write(json.dumps({'seq': seq, 'count': count}) + '\n')
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.snapshot_path)
+        self._sync_directory()
+
+    def _sync_directory(self) -> None:
+        """fsync каталога журнала: создание и переименование файлов сохраняются на диске"""
+        if os.name == 'nt':
+            return  # В Windows каталог нельзя открыть для fsync
+        descriptor = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+    def close(self) -> None:
+        """Сброс журнала на диск, ожидание фонового слияния и отключение от библиотеки"""
+        if self._file is None:
+            return
+        self.sync()
+        self._file.close()
+        self._file = None
+        self.library.index.unsubscribe(self._on_change)
+        self.library = None
+        self.wait()
@@ -1,103 +1,463 @@
 from books import Book
+from book_store import ColumnarBookStore
 from books_collection import BookCollection
+from import_export import export_books, import_books
 from index_dict import IndexDict
+from journal import Journal
+from metrics import LibraryMetrics, LIBRARY_OPERATIONS, INDEX_OPERATIONS
+from parallel_import import parallel_import
+from mmap_catalog import MmapCatalog, write_catalog
+from query_planner import QueryPlan, QueryPlanner
 
 
 class Library:
-    """Класс библиотеки, объединяющий коллекцию книг и индексы для быстрого поиска"""
+    """
+    Класс библиотеки, объединяющий коллекцию книг и индексы для быстрого поиска
+    Все книги хранятся в одном основном хранилище ISBN -> Book внутри IndexDict,
+    коллекция книг - представление этого хранилища, а не отдельная копия
+    """
+
+    index_class = IndexDict  # Класс индексов (подклассы библиотеки могут заменить)
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, columnar: bool = False, verbose: bool = True):
         """
         Инициализация библиотеки
         Параметры:
         name - название библиотеки
+        columnar - вести колоночное хранилище для быстрой аналитики
+        verbose - выводить сообщения об операциях в консоль
         """
         self.name = name
-        # Создаем коллекцию книг для хранения
-        self.book_collection = BookCollection(f"Коллекция библиотеки '{name}'")
-        # Создаем индексы для быстрого поиска
-        self.index = IndexDict()
+        # Создаем индексы для быстрого поиска (в них же основное хранилище книг)
+        self.index = self.index_class(columnar, verbose)
+        # Коллекция книг - представление основного хранилища
+        self.book_collection = BookCollection(f"Коллекция библиотеки '{name}'", self.index.store)
+        # Планировщик составных запросов поверх индексов
+        self.planner = QueryPlanner(self.index)
+        # Журнал операций (подключается attach_journal)
+        self.journal = None
+        # Метрики операций (подключаются enable_metrics)
+        self.metrics = None
+
+    @staticmethod
+    def open_mmap(path: str, name: str = None, verbose: bool = True) -> 'MmapLibrary':
+        """
+        Открытие библиотеки только для чтения из файла каталога (см. save_mmap)
+        Файл отображается в память через mmap: запуск не требует построения индексов,
+        поиск по ISBN, автору и году идет по страницам файла, объекты Book создаются
+        при обращении. Процессы, открывшие один каталог, делят одну копию данных.
+        Возвращает MmapLibrary - только операции, которые поддерживает каталог
+        """
+        return MmapLibrary(path, name, verbose)
+
+    def save_mmap(self, path: str) -> None:
+        """Запись всех книг библиотеки в файл каталога для open_mmap"""
+        count = write_catalog(path, self.index)
+        if self.verbose:
+            print(f"[Библиотека] Каталог из {count} книг записан в {path}")
+
+    def attach_journal(self, directory: str, sync_every: int = 64, compact_every: int = 10000) -> Journal:
+        """
+        Подключение журнала операций: библиотека восстанавливается из снимка
+        и журнала в каталоге directory, дальнейшие изменения записываются в журнал
+        Параметры:
+        directory - каталог файлов журнала
+        sync_every - количество записей между fsync
+        compact_every - количество записей между фоновыми снимками
+        """
+        journal = Journal(directory, sync_every, compact_every)
+        replayed = journal.open(self)
+        self.journal = journal
+        if self.verbose:
+            print(f"[Библиотека] Журнал {directory}: {len(self)} книг, применено записей журнала: {replayed}")
+        return journal
+
+    def enable_metrics(self) -> LibraryMetrics:
+        """
+        Подключение метрик: операции библиотеки и индексов заменяются обертками,
+        считающими вызовы, ошибки и время (library.metrics.snapshot(), to_prometheus())
+        Повторный вызов возвращает уже подключенные метрики
+        """
+        if self.metrics is None:
+            metrics = LibraryMetrics(self)
+            metrics.instrument(self, 'library', LIBRARY_OPERATIONS)
+            metrics.instrument(self.index, 'index', INDEX_OPERATIONS)
+            self.metrics = metrics
+        return self.metrics
+
+    def disable_metrics(self) -> None:
+        """Отключение метрик: обертки снимаются, накладных расходов не остается"""
+        if self.metrics is not None:
+            self.metrics.uninstrument()
+            self.metrics = None
+
+    @property
+    def verbose(self) -> bool:
+        """Вывод сообщений об операциях (общий с индексами)"""
+        return self.index.verbose
+
+    @verbose.setter
+    def verbose(self, value: bool) -> None:
+        self.index.verbose = value
 
     def __len__(self):
         """Количество книг в библиотеке"""
-        return len(self.book_collection)
+        return len(self.index)
+
+    def __iter__(self):
+        """Итерация по книгам библиотеки в порядке добавления"""
+        return iter(self.index)
+
+    def __contains__(self, isbn) -> bool:
+        """Проверка наличия книги по ISBN (или объекту Book) за O(1)"""
+        return isbn in self.index
 
     def add_book(self, book: Book) -> None:
-        """Добавление книги в библиотеку (в коллекцию и индексы)"""
+        """Добавление книги в библиотеку (в основное хранилище и индексы)"""
         if book.isbn in self.index:
             raise ValueError(f"Книга с ISBN {book.isbn} уже существует")
         
-        # Добавляем книгу в коллекцию
-        self.book_collection.add_book(book)
-        # Добавляем книгу в индексы для быстрого поиска
+        # Книга попадает в хранилище и во все индексы, коллекция видит ее сразу
         self.index.add_book(book)
 
+    def add_books(self, books) -> list:
+        """
+        Пакетное добавление книг: книги записываются в хранилище,
+        затем все индексы строятся за один проход
+        Возвращает:
+        list - отклоненные книги с уже существующим ISBN: (номер в пакете, ISBN)
+        """
+        duplicates = self.index.add_books(books)
+        if self.verbose:
+            print(f"[Библиотека] Пакетное добавление: {len(self.index)} книг в библиотеке, "
+                  f"отклонено дубликатов ISBN: {len(duplicates)}")
+        return duplicates
+
+    def import_books(self, path: str, format: str = None, chunk_size: int = 1000, workers: int = 1) -> list:
+        """
+        Потоковый импорт книг из файла CSV или JSONL пакетами по chunk_size книг
+        При workers > 1 файл разбирается и проверяется в нескольких процессах
+        (parallel_import), а книги добавляются одним пакетом
+        Возвращает:
+        list - ошибки строк файла: (номер строки, описание)
+        """
+        if workers > 1:
+            imported, errors = parallel_import(self, path, format, workers)
+        else:
+            imported, errors = import_books(self, path, format, chunk_size)
+        if self.verbose:
+            print(f"[Библиотека] Импортировано {imported} книг из {path}, ошибок: {len(errors)}")
+        return errors
+
+    def export_books(self, path: str, format: str = None) -> int:
+        """Потоковый экспорт всех книг в файл CSV или JSONL, возвращает количество книг"""
+        count = export_books(self, path, format)
+        if self.verbose:
+            print(f"[Библиотека] Экспортировано {count} книг в {path}")
+        return count
+
     def borrow_book_by_title(self, title: str) -> bool:
-        """Взятие книги по названию"""
-        for book in self.book_collection:
-            if book.title == title:
-                if book.borrow():
-                    return True  # Книга успешно взята
-                else:
-                    return False  # Книга уже взята
-            else:
-                return False  # Книга с таким названием не найдена
-        return False  # Книга не найдена
+        """Взятие книги по названию (первого свободного экземпляра)"""
+        books = self.index.bucket('title', title)
+        if not books:
+            return False  # Книга с таким названием не найдена
+        # Перебор корзины без копирования: обычно первый экземпляр свободен
+        for book in books.values():
+            if book.borrow():
+                return True  # Книга успешно взята
+        return False  # Все экземпляры уже взяты
 
     def borrow_book_by_isbn(self, isbn: str) -> bool:
         """Взятие книги по ISBN"""
         book = self.index.search_by_isbn(isbn)
         if book:
-            # Используем поиск по названию для взятия книги
-            return self.borrow_book_by_title(book.title)
+            return book.borrow()
         return False  # Книга не найдена
 
+    def return_book_by_isbn(self, isbn: str) -> bool:
+        """Возврат взятой книги по ISBN"""
+        book = self.index.search_by_isbn(isbn)
+        if book is None or not book.is_borrowed():
+            return False  # Книга не найдена или не была взята
+        book.return_book()
+        return True
+
+    def borrowed_books(self) -> list:
+        """Список взятых книг (из индекса взятых книг, без перебора коллекции)"""
+        return self.index.borrowed_books()
+
+    def borrowed_count(self) -> int:
+        """Количество взятых книг"""
+        return self.index.borrowed_count()
+
+    def available_count(self) -> int:
+        """Количество книг, доступных для выдачи"""
+        return len(self.index) - self.index.borrowed_count()
+
+    def remove_book_by_isbn(self, isbn: str) -> bool:
+        """Удаление книги из библиотеки по ISBN"""
+        return self.index.remove_book(isbn)
+
     def remove_book_by_title(self, title: str) -> bool:
-        """Удаление книги из библиотеки по названию"""
-        for book in self.book_collection:
-            if book.title == title:
-                # Удаляем книгу из индексов
-                self.index.remove_book(book.isbn)
-                # Удаляем книгу из коллекции
-                self.book_collection.remove_by_title(title)
-                return True  # Книга успешно удалена
+        """Удаление книги из библиотеки по названию (первого экземпляра)"""
+        books = self.index.bucket('title', title)
+        if not books:
             return False  # Книга с таким названием не найдена
-        return False  # Книга не найдена
+        # Первый ISBN корзины без копирования корзины в список
+        return self.remove_book_by_isbn(next(iter(books)))
 
     def search_by_isbn(self, isbn: str):
         """Поиск книги по ISBN"""
         result = self.index.search_by_isbn(isbn)
-        if result:
-            print(f"[Библиотека] Найдена книга по ISBN {isbn}: {result.title}")
-        else:
-            print(f"[Библиотека] Книга с ISBN {isbn} не найдена")
+        if self.verbose:
+            if result:
+                print(f"[Библиотека] Найдена книга по ISBN {isbn}: {result.title}")
+            else:
+                print(f"[Библиотека] Книга с ISBN {isbn} не найдена")
         return result
 
     def search_by_title(self, title: str):
         """Поиск книги по названию"""
         result = self.index.search_by_title(title)
-        if result:
-            print(f"[Библиотека] Найдена книга {title}")
-        else:
-            print(f"[Библиотека] Книга {title} не найдена")
+        if self.verbose:
+            if result:
+                print(f"[Библиотека] Найдена книга {title}")
+            else:
+                print(f"[Библиотека] Книга {title} не найдена")
+        return result
+
+    def search_title_contains(self, fragment: str) -> list:
+        """Поиск книг по части названия без учета регистра"""
+        result = self.index.search_title_contains(fragment)
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг, название которых содержит '{fragment}'")
+        return result
+
+    def search_title_prefix(self, prefix: str) -> list:
+        """Поиск книг по началу названия без учета регистра"""
+        result = self.index.search_title_prefix(prefix)
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг, название которых начинается с '{prefix}'")
         return result
 
     def search_by_author(self, author: str) -> list:
         """Поиск книг по автору"""
         result = self.index.search_by_author(author)
-        print(f"[Библиотека] Найдено {len(result)} книг автора '{author}'")
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг автора '{author}'")
         return result
 
     def search_by_year(self, year: int) -> list:
         """Поиск книг по году издания"""
         result = self.index.search_by_year(year)
-        print(f"[Библиотека] Найдено {len(result)} книг {year} года")
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг {year} года")
+        return result
+
+    def search_by_year_range(self, lo: int = None, hi: int = None, reverse: bool = False) -> list:
+        """Поиск книг, изданных в диапазоне лет [lo, hi]"""
+        result = self.index.search_by_year_range(lo, hi, reverse)
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг {lo}-{hi} годов")
+        return result
+
+    def search_by_genre(self, genre: str) -> list:
+        """Поиск книг по жанру"""
+        result = self.index.search_by_genre(genre)
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг жанра '{genre}'")
         return result
 
+    def search_by_cover_type(self, cover_type: str) -> list:
+        """Поиск книг по типу обложки"""
+        result = self.index.search_by_cover_type(cover_type)
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг с обложкой '{cover_type}'")
+        return result
+
+    def query(self, author: str = None, year=None, genre: str = None,
+              cover_type: str = None, borrowed: bool = None) -> list:
+        """
+        Поиск книг по нескольким условиям одновременно
+        Параметры:
+        author - автор
+        year - год издания или диапазон лет (lo, hi)
+        genre - жанр
+        cover_type - тип обложки
+        borrowed - взята ли книга
+        Условия со значением None не учитываются
+        """
+        plan = self.explain(author=author, year=year, genre=genre,
+                            cover_type=cover_type, borrowed=borrowed)
+        result = self.planner.execute(plan)
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг по запросу")
+        return result
+
+    def explain(self, author: str = None, year=None, genre: str = None,
+                cover_type: str = None, borrowed: bool = None) -> QueryPlan:
+        """План выполнения запроса query (str(plan) - текстовое описание)"""
+        return self.planner.plan(author=author, year=year, genre=genre,
+                                 cover_type=cover_type, borrowed=borrowed)
+
+    def worst_condition(self, k: int) -> list:
+        """k книг в худшем состоянии (для ремонта)"""
+        result = self.index.worst_condition(k)
+        if self.verbose:
+            print(f"[Библиотека] Отобрано {len(result)} книг в худшем состоянии")
+        return result
+
+    def books_in_condition_band(self, band: str) -> list:
+        """Книги с текстовым описанием состояния band"""
+        result = self.index.books_in_condition_band(band)
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг в состоянии '{band}'")
+        return result
+
+    def condition_band_counts(self) -> dict:
+        """Количество книг в каждом состоянии"""
+        return self.index.condition_band_counts()
+
+    def bitmap(self, field: str, value):
+        """
+        Битовая карта книг для поля с небольшим числом значений
+        (cover_type, has_images, genre, condition_band)
+        Пример: (library.bitmap('cover_type', CoverType.GLOSSY)
+                 & ~library.bitmap('has_images', False)).count()
+        """
+        return self.index.bitmap(field, value)
+
+    def count_where(self, **criteria) -> int:
+        """
+        Количество книг, удовлетворяющих всем условиям поле=значение,
+        по битовым индексам без создания списков книг
+        """
+        bits = self.index.all_bits()
+        for field, value in criteria.items():
+            bits = bits & self.index.bitmap(field, value)
+        return bits.count()
+
+    def _columns(self) -> ColumnarBookStore:
+        """Колоночное хранилище библиотеки (без columnar - временное, за один проход)"""
+        if self.index.columns is not None:
+            return self.index.columns
+        store = ColumnarBookStore()
+        for book_id, book in enumerate(self.index):
+            store.set_row(book_id, book)
+        return store
+
+    def mean_condition_by_cover_type(self) -> dict:
+        """Среднее состояние книг по типам обложки"""
+        return self._columns().mean_condition_by_cover_type()
+
+    def age_histogram(self, bin_width: int = 10, current_year: int = None) -> list:
+        """Гистограмма возраста книг: список (возраст от, возраст до, количество)"""
+        if current_year is None:
+            return self._columns().age_histogram(bin_width)
+        return self._columns().age_histogram(bin_width, current_year)
+
+    def borrow_count_percentiles(self, percentiles=(50, 90, 99)) -> dict:
+        """Перцентили количества взятий книг"""
+        return self._columns().borrow_count_percentiles(percentiles)
+
     def show_all_books(self) -> None:
         """Отображение всех книг в библиотеке"""
         print(f"\n{'='*50}")
         print(f"БИБЛИОТЕКА: {self.name}")
         print(f"{'='*50}")
         # Метод коллекции для отображения книг
-        self.book_collection.show_collection()
\ No newline at end of file
+        self.book_collection.show_collection()
+
+
+class UnsupportedOperation(AttributeError, TypeError):
+    """
+    Операция Library, которой нет у MmapLibrary
+    Подкласс AttributeError: hasattr и getattr со значением по умолчанию
+    работают как для отсутствующего атрибута; подкласс TypeError - для
+    кода, который ловит ошибку неподдерживаемой операции
+    """
+
+
+class MmapLibrary:
+    """
+    Библиотека только для чтения поверх каталога MmapCatalog (Library.open_mmap)
+    Поддерживает размер, итерацию, проверку ISBN и поиск по ISBN, автору и году.
+    Остальные операции Library (изменения, прочие поиски, запросы, аналитика)
+    каталог не поддерживает: обращение к ним вызывает UnsupportedOperation
+    """
+
+    def __init__(self, path: str, name: str = None, verbose: bool = True):
+        """
+        Параметры:
+        path - путь к файлу каталога
+        name - название библиотеки (по умолчанию - путь к файлу)
+        verbose - выводить сообщения о поиске в консоль
+        """
+        self.name = path if name is None else name
+        self.verbose = verbose
+        self.index = MmapCatalog(path)
+        self.book_collection = BookCollection(f"Коллекция библиотеки '{self.name}'", self.index.store)
+
+    def __getattr__(self, name: str):
+        """Операции Library, которых нет у каталога, - AttributeError с понятным сообщением"""
+        if not name.startswith('_') and hasattr(Library, name):
+            raise UnsupportedOperation(f"операция {name} не поддерживается библиотекой только для чтения "
+                            f"из каталога mmap (поддерживаются поиск по ISBN, автору и году)")
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Закрытие файла каталога"""
+        self.index.close()
+
+    def __len__(self) -> int:
+        """Количество книг в каталоге"""
+        return len(self.index)
+
+    def __iter__(self):
+        """Итерация по книгам в порядке добавления"""
+        return iter(self.index)
+
+    def __contains__(self, isbn) -> bool:
+        """Проверка наличия книги по ISBN (или объекту Book)"""
+        return isbn in self.index
+
+    def search_by_isbn(self, isbn: str):
+        """Поиск книги по ISBN"""
+        result = self.index.search_by_isbn(isbn)
+        if self.verbose:
+            if result:
+                print(f"[Библиотека] Найдена книга по ISBN {isbn}: {result.title}")
+            else:
+                print(f"[Библиотека] Книга с ISBN {isbn} не найдена")
+        return result
+
+    def search_by_author(self, author: str) -> list:
+        """Поиск книг по автору"""
+        result = self.index.search_by_author(author)
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг автора '{author}'")
+        return result
+
+    def search_by_year(self, year: int) -> list:
+        """Поиск книг по году издания"""
+        result = self.index.search_by_year(year)
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг {year} года")
+        return result
+
+    def search_by_year_range(self, lo: int = None, hi: int = None, reverse: bool = False) -> list:
+        """Поиск книг, изданных в диапазоне лет [lo, hi]"""
+        result = self.index.search_by_year_range(lo, hi, reverse)
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг {lo}-{hi} годов")
+        return result
+
+    def show_all_books(self) -> None:
+        """Отображение всех книг каталога"""
+        Library.show_all_books(self)
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import random
+import time
+from urllib.parse import quote
+from book_store import percentile
+
+
+def make_workload(books: list, count: int, write_share: float = 0.1, seed: int = 1) -> list:
+    """
+    Набор запросов для нагрузки: (метод, адрес, тело)
+    Доля write_share - взятие и возврат книг, остальное - поиск по ISBN, автору и году
+    """
+    rng = random.Random(seed)
+    isbns = [book.isbn for book in books]
+    authors = sorted({book.author for book in books})
+    years = sorted({book.year for book in books})
+    requests = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < write_share:
+            action = 'borrow' if rng.random() < 0.5 else 'return'
+            requests.append(('POST', f'/books/{quote(rng.choice(isbns))}/{action}', b''))
+        elif roll < write_share + (1 - write_share) * 0.6:
+            requests.append(('GET', f'/books/{quote(rng.choice(isbns))}', b''))
+        elif roll < write_share + (1 - write_share) * 0.8:
+            requests.append(('GET', f'/books?author={quote(rng.choice(authors))}', b''))
+        else:
+            requests.append(('GET', f'/books?year={rng.choice(years)}', b''))
+    return requests
+
+
+def _encode(method: str, path: str, body: bytes, host: str) -> bytes:
+    """Запрос HTTP/1.1 keep-alive"""
+    return (f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode('utf-8') + body
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple:
+    """Чтение ответа: (статус, тело)"""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ', 2)[1])
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def request(host: str, port: int, method: str, path: str, data=None) -> tuple:
+    """Одиночный запрос в отдельном соединении: (статус, разобранный JSON)"""
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps(data, ensure_ascii=False).encode('utf-8') if data is not None else b''
+    writer.write(_encode(method, path, body, host))
+    await writer.drain()
+    status, payload = await _read_response(reader)
+    writer.close()
+    await writer.wait_closed()
+    return status, json.loads(payload)
+
+
+async def run_load(host: str, port: int, requests: list, connections: int = 16, pipeline: int = 4) -> dict:
+    """
+    Нагрузка на сервер: requests распределяются по connections соединениям keep-alive,
+    в каждом соединении до pipeline запросов отправляются, не дожидаясь ответов
+    Возвращает:
+    dict - запросов в секунду, задержки p50/p99 (мс) и количество ответов по статусам
+    """
+    latencies = []
+    statuses = {}
+
+    async def connection(share: list) -> None:
+        reader, writer = await asyncio.open_connection(host, port)
+        sent = []  # Время отправки неотвеченных запросов, по порядку
+        window = asyncio.Semaphore(pipeline)
+
+        async def send() -> None:
+            for method, path, body in share:
+                await window.acquire()
+                sent.append(time.perf_counter())
+                writer.write(_encode(method, path, body, host))
+                await writer.drain()
+
+        sender = asyncio.create_task(send())
+        for _ in share:
+            status, _ = await _read_response(reader)
+            latencies.append(time.perf_counter() - sent.pop(0))
+            statuses[status] = statuses.get(status, 0) + 1
+            window.release()
+        await sender
+        writer.close()
+        await writer.wait_closed()
+
+    shares = [requests[number::connections] for number in range(connections)]
+    started = time.perf_counter()
+    await asyncio.gather(*(connection(share) for share in shares if share))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'statuses': statuses,
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+    from memory_usage import make_books
+
+    parser = argparse.ArgumentParser(description="Нагрузочный клиент сервера библиотеки")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--books', type=int, default=10000, help="количество книг на сервере (как в server.py)")
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--pipeline', type=int, default=4)
+    parser.add_argument('--write-share', type=float, default=0.1)
+    arguments = parser.parse_args()
+
+    # Сервер заполняется make_books с тем же зерном, поэтому ISBN совпадают
+    workload = make_workload(make_books(arguments.books), arguments.requests, arguments.write_share)
+    result = asyncio.run(run_load(arguments.host, arguments.port, workload,
+                                  arguments.connections, arguments.pipeline))
+    print(f"{result['requests']} запросов за {result['seconds']:.2f} с: "
+          f"{result['requests_per_second']:.0f} запр./с, p50 {result['p50_ms']:.2f} мс, "
+          f"p99 {result['p99_ms']:.2f} мс, статусы {result['statuses']}")
@@ -5,6 +5,7 @@ from books_collection import BookCollection
 from index_dict import IndexDict
 from library import Library
 from constans import *
+from validation import has_digits, has_forbidden_symbols
     
 def str_validation(s:str) -> bool:
     """
@@ -17,9 +18,8 @@ def str_validation(s:str) -> bool:
     if s == "":
         print("Ошибка: поле не может быть пустым")
         return False
-    for symbol in range(len(s)):
-        if s[symbol] in ['@', '#', '$', '%', '^', '&', '*', '=', '+', '<', '>', '/', '\\', '|', '~', '`']:
-            return False
+    if has_forbidden_symbols(s):
+        return False
     if not s[0].isupper():
         print("Ошибка: должно начинаться с большой буквы")
         return False
@@ -41,6 +41,8 @@ def print_commands():
     print("8. Найти книги по году")
     print("9. Проверить состояние всех книг")
     print("10. Удалить книгу")
+    print("11. Импортировать книги из файла (CSV/JSONL)")
+    print("12. Экспортировать книги в файл (CSV/JSONL)")
     print("0. Выход")
 
 
@@ -94,10 +96,9 @@ def input_genre() -> str:
     print(f"Возможно вы искали: {', '.join(GENRES)}")
     while True:
         genre = input("Жанр книги (с заглавной буквы): ").strip()
-        for symbol in range(len(genre)):
-            if genre[symbol].isdigit() == True:
-                print("Ошибка: жанр не может содержать цифры")
-                return False
+        if has_digits(genre):
+            print("Ошибка: жанр не может содержать цифры")
+            return False
         if str_validation(genre) == True:
             return genre
 
@@ -156,7 +157,7 @@ def add_book(library: Library) -> None:
     condition = input_condition()
     has_images = input_has_images()
 
-    if isbn in library.index:
+    if isbn in library:
         print(f"\nОшибка: книга с ISBN '{isbn}' уже существует в библиотеке\n")
         return
 
@@ -237,25 +238,17 @@ def borrow_book(library: Library) -> None:
 
 def return_book(library: Library) -> None:
     """Возврат взятой книги"""
-    title = input_title("Введите название или позже ISBN: ").strip()
+    if len(library) == 0:
+        print('\nНет книг в библиотеке')
+        return
+    if library.borrowed_count() == 0:
+        print('\nНет взятых книг для возврата')
+        return
     isbn = input("Введите ISBN: ").strip()
-
-    if len(library.book_collection) != 0:
-        borrowed_books = []
-        for b in library:
-            if b.is_borrowed:
-                borrowed_books.append(b)
-        if borrowed_books:
-            if title is None:
-                book = library.search_by_isbn(isbn)
-            else:
-                book = library.search_by_title(title)
-                book.return_book()
-                print(f"Книга возвращена: {book.title}")
-        else:
-            print('\nНет взятых книг для возврата')
+    if library.return_book_by_isbn(isbn):
+        print(f"Книга возвращена: {library.index.search_by_isbn(isbn).title}")
     else:
-        print('\nНет книг в библиотеке')
+        print(f"Книга с ISBN '{isbn}' не найдена среди взятых")
 
 
 def damage_book(library: Library)  -> None:
@@ -338,12 +331,9 @@ def search_by_year(library: Library) -> None:
 def search_by_genre(library: Library) -> None:
     """Поиск книг по жанру"""
     if len(library.book_collection) != 0:
-        found_books = []
         search_genre =input("Введите жанр: ").strip()
         print(f"Поиск книг с жанром: {search_genre}")
-        for book in library.book_collection:
-            if book.genre == search_genre:
-                found_books.append(book)
+        found_books = library.search_by_genre(search_genre)
         print(f"  Найдено: {len(found_books)} книг")
         for book in found_books: 
             print(f"    - {book}")
@@ -352,12 +342,15 @@ def search_by_genre(library: Library) -> None:
 
 
 def check_condition(library: Library) -> None:
-    """Проверка состояния всех книг в библиотеке"""
+    """Проверка состояния книг в библиотеке: сводка по состояниям и худшие книги"""
     if len(library.book_collection) != 0:
         print(f"Проверка состояния книг:")
-        for book in library.book_collection:
+        for band, count in library.condition_band_counts().items():
+            print(f"  {band}: {count} книг")
+        print(f"Книги в худшем состоянии:")
+        for book in library.worst_condition(10):
             condition = book.get_condition()
-            print(f"  {book.title}: {condition}")        
+            print(f"  {book.title}: {condition} ({book.condition}%)")
     else:
          print('Нет книг для проверки состояния')
                 
@@ -377,12 +370,35 @@ def remove_book(library: Library) -> None:
         print('[Нет книг для удаления')
 
 
+def import_books(library: Library) -> None:
+    """Импорт книг из файла CSV или JSONL"""
+    path = input("Путь к файлу (.csv или .jsonl): ").strip()
+    try:
+        errors = library.import_books(path)
+    except (OSError, ValueError) as error:
+        print(f"Не удалось импортировать книги: {error}")
+        return
+    for number, message in errors[:10]:
+        print(f"  строка {number}: {message}")
+    if len(errors) > 10:
+        print(f"  ... и еще {len(errors) - 10} ошибок")
+
+
+def export_books(library: Library) -> None:
+    """Экспорт книг в файл CSV или JSONL"""
+    path = input("Путь к файлу (.csv или .jsonl): ").strip()
+    try:
+        library.export_books(path)
+    except (OSError, ValueError) as error:
+        print(f"Не удалось экспортировать книги: {error}")
+
+
 def main() -> None:
     """Главная функция - основной цикл программы"""
     library = Library('Мvv')
     while True:
         print_commands()
-        choice = input("Выберите действие (0-10): ").strip()
+        choice = input("Выберите действие (0-12): ").strip()
 
         if choice == '1':
             add_book(library)
@@ -404,6 +420,10 @@ def main() -> None:
             check_condition(library)
         elif choice == '10':
             remove_book(library)
+        elif choice == '11':
+            import_books(library)
+        elif choice == '12':
+            export_books(library)
         elif choice == "0":
             print("\nДо свидания!")
             break
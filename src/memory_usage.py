@@ -0,0 +1,53 @@
+import random
+import tracemalloc
+from books import GlossyCover, HardCover, SoftCover
+from constans import *
+
+
+def _fresh(text: str) -> str:
+    """Новый объект строки с тем же значением (как после чтения из файла или ввода)"""
+    return text.encode().decode()
+
+
+def make_books(count: int, seed: int = 1) -> list:
+    """Набор книг с данными из constans.py, как в симуляции"""
+    rng = random.Random(seed)
+    books = []
+    for number in range(count):
+        title = _fresh(rng.choice(TITLES))
+        cover = number % 3
+        if cover == 0:
+            books.append(HardCover(title, _fresh(rng.choice(AUTHORS)), rng.randint(1900, 2026),
+                                   _fresh(rng.choice(GENRES)), f"HC-{number:08d}", rng.randint(30, 80)))
+        elif cover == 1:
+            books.append(SoftCover(title, _fresh(rng.choice(AUTHORS)), rng.randint(1990, 2026),
+                                   _fresh(rng.choice(GENRES)), f"SC-{number:08d}", rng.randint(30, 100)))
+        else:
+            books.append(GlossyCover(title, _fresh('Редакция журнала'), rng.randint(2000, 2026),
+                                     _fresh(rng.choice(['Журнал', 'Альбом', 'Каталог'])), f"GC-{number:08d}",
+                                     rng.randint(30, 100)))
+    return books
+
+
+def measure_book_memory(count: int = 100000, seed: int = 1) -> float:
+    """
+    Средний объем памяти на одну книгу в байтах (по tracemalloc)
+    Учитываются объекты книг и их уникальные строки (название, ISBN);
+    интернированные строки (автор, жанр, тип обложки) делятся между книгами
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        books = make_books(count, seed)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    # Список самих ссылок на книги не относится к стоимости книги
+    allocated -= books.__sizeof__()
+    return allocated / count
+
+
+if __name__ == "__main__":
+    for count in (10000, 100000):
+        print(f"{count} книг: {measure_book_memory(count):.1f} байт на книгу")
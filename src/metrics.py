@@ -0,0 +1,212 @@
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter_ns
+
+
+# Операции библиотеки и индексов, время которых измеряется
+LIBRARY_OPERATIONS = (
+    'add_book', 'add_books', 'import_books', 'export_books',
+    'borrow_book_by_title', 'borrow_book_by_isbn', 'return_book_by_isbn',
+    'remove_book_by_isbn', 'remove_book_by_title',
+    'search_by_isbn', 'search_by_title', 'search_title_contains', 'search_title_prefix',
+    'search_by_author', 'search_by_year', 'search_by_year_range', 'search_by_genre',
+    'search_by_cover_type', 'query', 'worst_condition', 'books_in_condition_band', 'count_where',
+)
+INDEX_OPERATIONS = (
+    'add_book', 'add_books', 'remove_book', 'bucket',
+    'search_by_isbn', 'search_by_title', 'search_title_contains', 'search_title_prefix',
+    'search_by_author', 'search_by_year', 'search_by_year_range', 'search_by_genre',
+    'search_by_cover_type', 'borrowed_books', 'worst_condition', 'books_in_condition_band',
+    'condition_band_counts',
+)
+
+# Верхние границы корзин гистограммы задержек, нс (1 мкс - 10 с, шаг 1-2.5-5)
+LATENCY_BOUNDS = tuple(int(base * 10 ** power) for power in range(3, 10) for base in (1, 2.5, 5)) + (10 ** 10,)
+
+
+class Histogram:
+    """
+    Гистограмма задержек с фиксированными границами корзин
+    Наблюдение - один bisect и два сложения; количество вызовов - сумма корзин
+    """
+
+    def __init__(self, bounds: tuple = LATENCY_BOUNDS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Последняя корзина - больше наибольшей границы
+        self.total = 0  # Сумма наблюдений, нс
+
+    def observe(self, value: int) -> None:
+        """Добавление наблюдения value (нс)"""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def quantile(self, q: float):
+        """
+        Оценка квантиля q (0..1) по корзинам, нс: верхняя граница корзины,
+        в которую попадает квантиль (None - наблюдений нет)
+        """
+        count = self.count
+        if not count:
+            return None
+        rank = q * count
+        seen = 0
+        for bound, bucket_count in zip(self.bounds, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+class LibraryMetrics:
+    """
+    Метрики библиотеки: количество вызовов, ошибки и гистограммы задержек
+    операций библиотеки и индексов, а также показатели, считываемые при снимке
+    (количество книг, взятые книги, размеры корзин индексов)
+    Подключается Library.enable_metrics; пока метрики не подключены, методы
+    библиотеки не обернуты и не имеют накладных расходов. Счетчики обновляются
+    без блокировок: при работе из многих потоков возможны редкие потери отсчетов
+    """
+
+    def __init__(self, library, bounds: tuple = LATENCY_BOUNDS):
+        self.library = library
+        self.bounds = bounds
+        self.histograms = {}  # (компонент, операция) -> Histogram
+        self.errors = {}      # (компонент, операция) -> количество исключений
+        self._wrapped = []    # Обернутые объекты и имена методов (для disable)
+
+    def instrument(self, target, component: str, operations) -> None:
+        """Замена методов operations объекта target на измеряющие обертки (в словаре экземпляра)"""
+        for name in operations:
+            method = getattr(target, name, None)
+            if method is None:
+                continue
+            setattr(target, name, self._timed(component, name, method))
+            self._wrapped.append((target, name))
+
+    def uninstrument(self) -> None:
+        """Удаление оберток: снова вызываются методы класса"""
+        for target, name in self._wrapped:
+            target.__dict__.pop(name, None)
+        self._wrapped = []
+
+    def _timed(self, component: str, name: str, method):
+        """Обертка метода, измеряющая время вызова"""
+        key = (component, name)
+        histogram = self.histograms[key] = Histogram(self.bounds)
+        self.errors[key] = 0
+        # Локальные ссылки, чтобы не искать атрибуты при каждом вызове
+        counts, bounds, errors = histogram.counts, histogram.bounds, self.errors
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            started = perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            except Exception:
+                errors[key] += 1
+                raise
+            finally:
+                elapsed = perf_counter_ns() - started
+                counts[bisect_left(bounds, elapsed)] += 1
+                histogram.total += elapsed
+        return timed
+
+    def reset(self) -> None:
+        """Обнуление счетчиков и гистограмм"""
+        for key, histogram in self.histograms.items():
+            histogram.counts[:] = [0] * len(histogram.counts)
+            histogram.total = 0
+            self.errors[key] = 0
+
+    def gauges(self) -> dict:
+        """Показатели, считываемые в момент вызова: книги, взятые книги, размеры корзин индексов"""
+        index = self.library.index
+        borrowed_count = getattr(index, 'borrowed_count', None)
+        result = {
+            'books': len(self.library),
+            'borrowed': borrowed_count() if borrowed_count is not None else 0,
+            'indexes': {},
+        }
+        if hasattr(index, 'bucket_sizes'):
+            for field in index.INDEXED_FIELDS:
+                sizes = index.bucket_sizes(field)
+                result['indexes'][field] = {
+                    'keys': len(sizes),
+                    'max_bucket': max(sizes, default=0),
+                    'mean_bucket': sum(sizes) / len(sizes) if sizes else 0.0,
+                }
+        return result
+
+    def snapshot(self) -> dict:
+        """
+        Снимок метрик в виде словаря
+        Возвращает:
+        dict - 'operations' ('компонент.операция' -> calls, errors, total_seconds,
+               mean_us, p50_us, p99_us; только вызывавшиеся операции) и показатели gauges
+        """
+        operations = {}
+        for (component, name), histogram in self.histograms.items():
+            calls = histogram.count
+            if not calls:
+                continue
+            p50, p99 = histogram.quantile(0.5), histogram.quantile(0.99)
+            operations[f'{component}.{name}'] = {
+                'calls': calls,
+                'errors': self.errors[(component, name)],
+                'total_seconds': histogram.total / 1e9,
+                'mean_us': histogram.total / calls / 1000,
+                'p50_us': p50 / 1000,
+                'p99_us': p99 / 1000,
+            }
+        return {'operations': operations, **self.gauges()}
+
+    def to_prometheus(self) -> str:
+        """Метрики в текстовом формате Prometheus (гистограммы в секундах)"""
+        library = _escape(self.library.name)
+        lines = [
+            '# HELP library_operation_seconds Время операций библиотеки и индексов',
+            '# TYPE library_operation_seconds histogram',
+        ]
+        for (component, name), histogram in self.histograms.items():
+            labels = f'library="{library}",component="{component}",operation="{name}"'
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.bounds, histogram.counts):
+                cumulative += bucket_count
+                lines.append(f'library_operation_seconds_bucket{{{labels},le="{bound / 1e9:g}"}} {cumulative}')
+            cumulative += histogram.counts[-1]
+            lines.append(f'library_operation_seconds_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f'library_operation_seconds_sum{{{labels}}} {histogram.total / 1e9:.9f}')
+            lines.append(f'library_operation_seconds_count{{{labels}}} {cumulative}')
+        lines += [
+            '# HELP library_operation_errors_total Исключения в операциях',
+            '# TYPE library_operation_errors_total counter',
+        ]
+        for (component, name), errors in self.errors.items():
+            lines.append(f'library_operation_errors_total{{library="{library}",component="{component}",'
+                         f'operation="{name}"}} {errors}')
+        gauges = self.gauges()
+        lines += [
+            '# HELP library_books Количество книг в библиотеке',
+            '# TYPE library_books gauge',
+            f'library_books{{library="{library}"}} {gauges["books"]}',
+            '# HELP library_borrowed_books Количество взятых книг',
+            '# TYPE library_borrowed_books gauge',
+            f'library_borrowed_books{{library="{library}"}} {gauges["borrowed"]}',
+        ]
+        for metric, field_name, description in (
+                ('library_index_keys', 'keys', 'Количество различных значений в индексе'),
+                ('library_index_bucket_max', 'max_bucket', 'Наибольшее количество книг с одним значением'),
+                ('library_index_bucket_mean', 'mean_bucket', 'Среднее количество книг с одним значением')):
+            lines += [f'# HELP {metric} {description}', f'# TYPE {metric} gauge']
+            for field, sizes in gauges['indexes'].items():
+                lines.append(f'{metric}{{library="{library}",index="{field}"}} {sizes[field_name]:g}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    """Экранирование значения метки Prometheus"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
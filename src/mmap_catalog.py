@@ -0,0 +1,332 @@
+import mmap
+import struct
+import zlib
+from collections.abc import Mapping
+from books import BOOK_CLASSES, restore_book
+
+
+# Формат файла каталога (все числа little-endian):
+#   заголовок   - сигнатура, версия, количество книг и смещения разделов
+#   строки      - записи книг фиксированной ширины (ROW), строковые поля - ссылки в кучу
+#   куча строк  - UTF-8 строки, повторяющиеся (автор, жанр) хранятся один раз
+#   ISBN        - хеш-таблица с открытой адресацией: номер строки + 1 (0 - пустая ячейка)
+#   авторы      - хеш-таблица авторов и записи AUTHOR (строка в куче, начало и длина списка книг)
+#   годы        - записи YEAR, отсортированные по году (двоичный поиск)
+#   списки книг - номера строк книг автора / года в порядке добавления
+MAGIC = b'LIBCAT01'
+VERSION = 1
+HEADER = struct.Struct('<8s12Q')
+ROW = struct.Struct('<IHIHIHIHIHhBBBBII')
+AUTHOR = struct.Struct('<IHII')
+YEAR = struct.Struct('<hII')
+SLOT = struct.Struct('<I')
+
+# Коды классов книг в записи
+KINDS = tuple(BOOK_CLASSES)
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+
+
+def _hash(key: bytes) -> int:
+    """Хеш ключа хеш-таблиц каталога (одинаковый во всех процессах, в отличие от hash())"""
+    return zlib.crc32(key)
+
+
+def _table_size(count: int) -> int:
+    """Размер хеш-таблицы: степень двойки, заполнение не больше половины"""
+    size = 8
+    while size < count * 2:
+        size *= 2
+    return size
+
+
+def _align(buffer: bytearray) -> None:
+    """Выравнивание следующего раздела по 8 байт"""
+    buffer.extend(bytes(-len(buffer) % 8))
+
+
+def _build_table(keys: list) -> bytearray:
+    """Хеш-таблица с линейным пробированием: ячейка хранит номер ключа + 1"""
+    size = _table_size(len(keys))
+    slots = [0] * size
+    for number, key in enumerate(keys):
+        slot = _hash(key) & (size - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (size - 1)
+        slots[slot] = number + 1
+    return bytearray(struct.pack(f'<{size}I', *slots))
+
+
+def write_catalog(path: str, books) -> int:
+    """
+    Запись книг в файл каталога для открытия через MmapCatalog
+    Параметры:
+    path - путь к файлу каталога
+    books - книги в порядке добавления
+    Возвращает:
+    int - количество записанных книг
+    """
+    books = list(books)
+    heap = bytearray()
+    strings = {}
+
+    def put(text: str) -> tuple:
+        """Строка в куче: (смещение, длина), повторяющиеся строки записываются один раз"""
+        ref = strings.get(text)
+        if ref is None:
+            data = text.encode('utf-8')
+            if len(data) > 0xFFFF:
+                raise ValueError(f"строка слишком длинная для каталога: {text[:20]}...")
+            ref = strings[text] = (len(heap), len(data))
+            heap.extend(data)
+        return ref
+
+    rows = bytearray()
+    isbns = []
+    authors = {}
+    years = {}
+    for number, book in enumerate(books):
+        kind = KIND_CODES.get(type(book).__name__)
+        if kind is None:
+            raise ValueError(f"неизвестный класс книги: {type(book).__name__}")
+        rows += ROW.pack(*put(book.title), *put(book.author), *put(book.genre),
+                         *put(book.cover_type), *put(book.isbn), book.year, book.condition,
+                         kind, bool(book.has_images), book.is_borrowed(),
+                         getattr(book, '_scratches', 0), book.borrow_count())
+        isbns.append(book.isbn.encode('utf-8'))
+        authors.setdefault(book.author, []).append(number)
+        years.setdefault(book.year, []).append(number)
+    if len(isbns) != len(set(isbns)):
+        raise ValueError("ISBN книг каталога должны быть уникальными")
+
+    # Списки книг авторов и годов хранятся подряд в одном массиве
+    postings = []
+    author_entries = bytearray()
+    for author, numbers in authors.items():
+        author_entries += AUTHOR.pack(*put(author), len(postings), len(numbers))
+        postings.extend(numbers)
+    year_entries = bytearray()
+    for year in sorted(years):
+        year_entries += YEAR.pack(year, len(postings), len(years[year]))
+        postings.extend(years[year])
+
+    # Сборка файла: разделы выравниваются по 8 байт, смещения записываются в заголовок
+    data = bytearray(HEADER.size)
+    data += rows
+    _align(data)
+    heap_offset = len(data)
+    data += heap
+    _align(data)
+    isbn_offset = len(data)
+    data += _build_table(isbns)
+    _align(data)
+    author_offset = len(data)
+    data += _build_table([author.encode('utf-8') for author in authors])
+    _align(data)
+    author_entries_offset = len(data)
+    data += author_entries
+    _align(data)
+    years_offset = len(data)
+    data += year_entries
+    _align(data)
+    postings_offset = len(data)
+    data += struct.pack(f'<{len(postings)}I', *postings)
+    HEADER.pack_into(data, 0, MAGIC, VERSION, len(books), heap_offset, isbn_offset,
+                     _table_size(len(isbns)), author_offset, _table_size(len(authors)),
+                     author_entries_offset, len(authors), years_offset, len(years), postings_offset)
+    with open(path, 'wb') as file:
+        file.write(data)
+    return len(books)
+
+
+class MmapCatalog:
+    """
+    Каталог книг только для чтения, открытый через mmap
+    Поиск по ISBN, автору и году выполняется прямо по отображенным страницам файла,
+    объекты Book создаются только при обращении к книге и кешируются.
+    Несколько процессов, открывших один файл, используют одну копию в страничном кеше ОС.
+    Изменения созданных книг (взятие, урон) остаются в памяти процесса и в файл не пишутся
+    """
+
+    def __init__(self, path: str):
+        """
+        Открытие каталога
+        Параметры:
+        path - путь к файлу, записанному write_catalog
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"файл {path} не является каталогом книг")
+        (magic, version, self._count, self._heap, self._isbn_table, self._isbn_slots,
+         self._author_table, self._author_slots, self._author_entries, self._author_count,
+         self._years, self._year_count, self._postings_offset) = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"файл {path} не является каталогом книг версии {VERSION}")
+        self._books = {}  # Номер строки -> созданный объект Book
+
+    def __len__(self) -> int:
+        """Количество книг в каталоге"""
+        return self._count
+
+    def __iter__(self):
+        """Итерация по всем книгам в порядке добавления"""
+        return (self._book(number) for number in range(self._count))
+
+    def __contains__(self, key) -> bool:
+        """Проверка наличия книги по ISBN (или объекту Book) без создания объектов"""
+        isbn = key if isinstance(key, str) else key.isbn
+        return self._find_isbn(isbn) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Закрытие отображения файла (созданные книги остаются доступными)"""
+        self._mmap.close()
+
+    @property
+    def store(self) -> 'MmapStore':
+        """Хранилище ISBN -> Book только для чтения (для BookCollection)"""
+        return MmapStore(self)
+
+    def _string(self, offset: int, length: int) -> str:
+        """Строка из кучи"""
+        start = self._heap + offset
+        return str(self._mmap[start:start + length], 'utf-8')
+
+    def _row(self, number: int) -> tuple:
+        """Сырая запись книги"""
+        return ROW.unpack_from(self._mmap, HEADER.size + number * ROW.size)
+
+    def _book(self, number: int):
+        """Объект книги по номеру строки (создается при первом обращении)"""
+        book = self._books.get(number)
+        if book is None:
+            (title, title_len, author, author_len, genre, genre_len, cover, cover_len,
+             isbn, isbn_len, year, condition, kind, has_images, is_borrowed,
+             scratches, borrow_count) = self._row(number)
+            book = self._books[number] = restore_book(
+                KINDS[kind], self._string(title, title_len), self._string(author, author_len),
+                year, self._string(genre, genre_len), self._string(cover, cover_len),
+                self._string(isbn, isbn_len), condition, bool(has_images),
+                borrow_count, is_borrowed, scratches)
+        return book
+
+    def _lookup(self, table: int, size: int, key: bytes, key_at) -> int:
+        """
+        Поиск в хеш-таблице каталога
+        key_at(номер) - ссылка (смещение, длина) на ключ записи в куче
+        Возвращает номер записи или None
+        """
+        mask = size - 1
+        slot = _hash(key) & mask
+        while True:
+            (value,) = SLOT.unpack_from(self._mmap, table + slot * SLOT.size)
+            if not value:
+                return None
+            offset, length = key_at(value - 1)
+            start = self._heap + offset
+            if length == len(key) and self._mmap[start:start + length] == key:
+                return value - 1
+            slot = (slot + 1) & mask
+
+    def _find_isbn(self, isbn: str):
+        """Номер строки книги по ISBN"""
+        return self._lookup(self._isbn_table, self._isbn_slots, isbn.encode('utf-8'),
+                            lambda number: self._row(number)[8:10])
+
+    def _postings(self, start: int, count: int) -> list:
+        """Книги из общего массива списков книг"""
+        numbers = struct.unpack_from(f'<{count}I', self._mmap, self._postings_offset + start * SLOT.size)
+        return [self._book(number) for number in numbers]
+
+    def _year_entry(self, position: int) -> tuple:
+        """Запись года по позиции в отсортированном разделе годов"""
+        return YEAR.unpack_from(self._mmap, self._years + position * YEAR.size)
+
+    def _year_position(self, year: int) -> int:
+        """Первая позиция раздела годов с годом не меньше year (двоичный поиск)"""
+        lo, hi = 0, self._year_count
+        while lo < hi:
+            middle = (lo + hi) // 2
+            if self._year_entry(middle)[0] < year:
+                lo = middle + 1
+            else:
+                hi = middle
+        return lo
+
+    def search_by_isbn(self, isbn: str):
+        """Поиск книги по ISBN"""
+        number = self._find_isbn(isbn)
+        return None if number is None else self._book(number)
+
+    def search_by_author(self, author: str) -> list:
+        """Поиск книг по автору"""
+        number = self._lookup(self._author_table, self._author_slots, author.encode('utf-8'),
+                              lambda entry: AUTHOR.unpack_from(self._mmap, self._author_entries + entry * AUTHOR.size)[:2])
+        if number is None:
+            return []
+        _, _, start, count = AUTHOR.unpack_from(self._mmap, self._author_entries + number * AUTHOR.size)
+        return self._postings(start, count)
+
+    def search_by_year(self, year: int) -> list:
+        """Поиск книг по году издания"""
+        position = self._year_position(year)
+        if position == self._year_count:
+            return []
+        key, start, count = self._year_entry(position)
+        return self._postings(start, count) if key == year else []
+
+    def search_by_year_range(self, lo: int = None, hi: int = None, reverse: bool = False) -> list:
+        """Поиск книг, изданных в диапазоне лет [lo, hi] включительно"""
+        first = 0 if lo is None else self._year_position(lo)
+        last = self._year_count if hi is None else self._year_position(hi + 1)
+        positions = range(first, last)
+        result = []
+        for position in (reversed(positions) if reverse else positions):
+            _, start, count = self._year_entry(position)
+            result.extend(self._postings(start, count))
+        return result
+
+    def add_book(self, book) -> None:
+        """Каталог только для чтения"""
+        raise TypeError("каталог только для чтения: книги добавляются при записи write_catalog")
+
+    def add_books(self, books) -> list:
+        """Каталог только для чтения"""
+        raise TypeError("каталог только для чтения: книги добавляются при записи write_catalog")
+
+    def remove_book(self, isbn: str) -> bool:
+        """Каталог только для чтения"""
+        raise TypeError("каталог только для чтения: книги удаляются при записи write_catalog")
+
+
+class MmapStore(Mapping):
+    """Хранилище ISBN -> Book только для чтения поверх MmapCatalog"""
+
+    def __init__(self, catalog: MmapCatalog):
+        self._catalog = catalog
+
+    def __getitem__(self, isbn: str):
+        book = self._catalog.search_by_isbn(isbn)
+        if book is None:
+            raise KeyError(isbn)
+        return book
+
+    def __contains__(self, isbn) -> bool:
+        return isbn in self._catalog
+
+    def __len__(self) -> int:
+        return len(self._catalog)
+
+    def __iter__(self):
+        return (book.isbn for book in self._catalog)
+
+    def values(self):
+        return iter(self._catalog)
@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from books import restore_book
+from import_export import detect_format, parse_book
+from records import RECORD_FIELDS, book_to_record
+
+
+# Минимальный размер части файла: меньшие части не окупают передачу между процессами
+MIN_RANGE_BYTES = 1 << 20
+
+
+def split_ranges(path: str, parts: int, skip_header: bool = False, quoted: bool = False) -> tuple:
+    """
+    Разбиение файла на части по байтовым смещениям, выровненным по концам строк
+    Параметры:
+    path - путь к файлу
+    parts - желаемое количество частей
+    skip_header - первая строка (заголовок CSV) не входит ни в одну часть
+    quoted - граница не попадает внутрь значения CSV в кавычках: части читаются
+             целиком, и граница сдвигается, пока количество кавычек до нее нечетное
+    Возвращает:
+    (header, ranges) - заголовок (bytes или None) и список пар (начало, конец)
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as file:
+        header = file.readline() if skip_header else None
+        start = file.tell()
+        step = max(MIN_RANGE_BYTES, (size - start) // max(1, parts) + 1)
+        ranges = []
+        quotes = 0  # Кавычки от начала частей до текущей границы
+        while start < size:
+            file.seek(min(size, start + step))
+            file.readline()  # Граница части сдвигается на конец строки
+            end = min(size, file.tell())
+            if quoted:
+                file.seek(start)
+                quotes += file.read(end - start).count(b'"')
+                while quotes % 2 and end < size:
+                    # Перевод строки внутри кавычек: часть продолжается до следующей строки
+                    line = file.readline()
+                    quotes += line.count(b'"')
+                    end += len(line)
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+
+def _parse_range(path: str, format: str, start: int, end: int, header: bytes) -> tuple:
+    """
+    Разбор и проверка строк части файла (выполняется в отдельном процессе)
+    Возвращает:
+    (records, lines, errors, line_count) - записи проверенных книг (кортежи полей
+    RECORD_FIELDS), номера их строк и ошибки (номер строки, описание) относительно
+    начала части, количество строк в части. Строки делятся и нумеруются как при
+    последовательном чтении (read_records): номер записи CSV - номер ее последней
+    строки (reader.line_num), пустые строки пропускаются, но учитываются
+    """
+    with open(path, 'rb') as file:
+        file.seek(start)
+        text = file.read(end - start).decode('utf-8')
+    if format == 'csv':
+        fields = next(csv.reader([header.decode('utf-8')]))
+        reader = csv.DictReader(io.StringIO(text, newline=''), fields)
+        parsed = ((reader.line_num, row) for row in reader)
+    else:
+        parsed = ((number, row) for number, row in enumerate(io.StringIO(text, newline=''), 1) if row.strip())
+    records = []
+    lines = []
+    errors = []
+    for number, row in parsed:
+        try:
+            record = json.loads(row) if format == 'jsonl' else row
+            book = parse_book(record)
+        except (TypeError, ValueError) as error:
+            errors.append((number, str(error)))
+            continue
+        record = book_to_record(book)
+        records.append(tuple(record[name] for name in RECORD_FIELDS))
+        lines.append(number)
+    return records, lines, errors, sum(1 for _ in io.StringIO(text, newline=''))
+
+
+def parallel_import(library, path: str, format: str = None, workers: int = None) -> tuple:
+    """
+    Импорт книг из файла CSV или JSONL с разбором и проверкой в нескольких процессах
+    Файл делится на части по байтовым смещениям, каждая часть разбирается
+    в ProcessPoolExecutor, процессы возвращают компактные кортежи проверенных
+    записей. Книги добавляются в библиотеку одним пакетным add_books, поэтому
+    проверка дубликатов ISBN общая для всего файла. Номера строк ошибок
+    совпадают с последовательным импортом (import_books)
+    Параметры:
+    library - библиотека (Library или SqliteLibrary)
+    path - путь к файлу
+    format - 'csv' или 'jsonl' (по умолчанию - по расширению файла)
+    workers - количество процессов (по умолчанию - количество ядер)
+    Возвращает:
+    (imported, errors) - количество добавленных книг и ошибки (номер строки, описание)
+    """
+    format = detect_format(path, format)
+    workers = workers or os.cpu_count() or 1
+    # Частей больше, чем процессов, чтобы процессы загружались равномерно
+    header, ranges = split_ranges(path, workers * 4, skip_header=format == 'csv', quoted=format == 'csv')
+    first_line = 2 if format == 'csv' else 1
+
+    books = []
+    lines = []
+    errors = []
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(_parse_range, path, format, start, end, header) for start, end in ranges]
+        base = first_line - 1  # Номер строки перед началом части
+        for future in futures:
+            records, numbers, range_errors, line_count = future.result()
+            books.extend(restore_book(*record) for record in records)
+            lines.extend(base + number for number in numbers)
+            errors.extend((base + number, message) for number, message in range_errors)
+            base += line_count
+
+    duplicates = library.add_books(books)
+    for position, isbn in duplicates:
+        errors.append((lines[position], f"Книга с ISBN {isbn} уже существует"))
+    errors.sort()
+    return len(books) - len(duplicates), errors
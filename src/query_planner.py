@@ -0,0 +1,119 @@
+from index_dict import IndexDict
+
+
+class PlanStep:
+    """Шаг плана запроса: поиск по индексу или фильтрация перебором"""
+
+    def __init__(self, field: str, value, kind: str, estimate: int = None):
+        """
+        Параметры:
+        field - имя поля предиката
+        value - искомое значение
+        kind - способ выполнения: 'index' (поиск по индексу) или 'scan' (фильтр)
+        estimate - размер корзины индекса (для шагов по индексу)
+        """
+        self.field = field
+        self.value = value
+        self.kind = kind
+        self.estimate = estimate
+
+    def __repr__(self) -> str:
+        return f"PlanStep('{self.field}', {self.value!r}, '{self.kind}', {self.estimate})"
+
+
+class QueryPlan:
+    """План выполнения составного запроса к библиотеке"""
+
+    def __init__(self, steps: list, candidates: list = None):
+        """
+        Параметры:
+        steps - шаги плана в порядке выполнения
+        candidates - корзины индексов (ISBN -> Book) в том же порядке, что и индексные шаги
+        """
+        self.steps = steps
+        self._candidates = candidates or []
+
+    @property
+    def full_scan(self) -> bool:
+        """Требуется ли полный перебор коллекции (нет ни одного индексного предиката)"""
+        return not any(step.kind == 'index' for step in self.steps)
+
+    def __str__(self) -> str:
+        """Текстовое описание плана (результат explain)"""
+        lines = ["План запроса:"]
+        number = 1
+        if self.full_scan:
+            lines.append(f"  {number}. Полный перебор коллекции")
+            number += 1
+        first_index = True
+        for step in self.steps:
+            if step.kind == 'index':
+                action = "Индекс" if first_index else "Пересечение с индексом"
+                first_index = False
+                lines.append(f"  {number}. {action} {step.field}={step.value!r} ({step.estimate} книг)")
+            else:
+                lines.append(f"  {number}. Фильтр {step.field}={step.value!r} (перебор кандидатов)")
+            number += 1
+        return "\n".join(lines)
+
+
+class QueryPlanner:
+    """
+    Планировщик составных запросов поверх IndexDict
+    Выбирает самый селективный индекс, пересекает корзины индексов
+    от меньшей к большей и проверяет перебором только неиндексированные предикаты
+    """
+
+    # Поля, для которых в IndexDict есть индекс
+    INDEXED_FIELDS = ('author', 'year', 'genre', 'cover_type', 'has_images', 'title', 'borrowed')
+
+    # Поля (или значения полей) без индекса проверяются перебором (поле -> функция получения значения)
+    SCAN_FIELDS = {
+        'borrowed': lambda book: book.is_borrowed(),
+    }
+
+    def __init__(self, index: IndexDict):
+        self.index = index
+
+    def plan(self, **predicates) -> QueryPlan:
+        """
+        Построение плана запроса
+        Параметры:
+        predicates - условия поле=значение; None означает отсутствие условия
+        """
+        index_steps = []
+        scan_steps = []
+        for field, value in predicates.items():
+            if value is None:
+                continue
+            # Год может быть задан диапазоном (lo, hi)
+            bucket = self.index.bucket(field, value) if field in self.INDEXED_FIELDS else None
+            if bucket is not None:
+                index_steps.append((PlanStep(field, value, 'index', len(bucket)), bucket))
+            elif field in self.SCAN_FIELDS:
+                scan_steps.append(PlanStep(field, value, 'scan'))
+            else:
+                raise ValueError(f"неизвестное поле запроса: {field}")
+
+        # Самые селективные индексы выполняются первыми
+        index_steps.sort(key=lambda item: item[0].estimate)
+        steps = [step for step, _ in index_steps] + scan_steps
+        return QueryPlan(steps, [bucket for _, bucket in index_steps])
+
+    def execute(self, plan: QueryPlan) -> list:
+        """Выполнение плана запроса"""
+        if plan.full_scan:
+            result = list(self.index)
+        else:
+            # Корзины - словари по ISBN, поэтому проверка принадлежности стоит O(1)
+            result = list(plan._candidates[0].values())
+            for bucket in plan._candidates[1:]:
+                if not result:
+                    break
+                result = [book for book in result if book.isbn in bucket]
+
+        for step in plan.steps:
+            if step.kind == 'scan':
+                getter = self.SCAN_FIELDS[step.field]
+                result = [book for book in result if getter(book) == step.value]
+        return result
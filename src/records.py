@@ -0,0 +1,50 @@
+from books import Book, restore_book
+
+
+# Поля записи книги: данные конструктора и изменяемое состояние
+RECORD_FIELDS = ('kind', 'title', 'author', 'year', 'genre', 'cover_type', 'isbn',
+                 'condition', 'has_images', 'borrow_count', 'is_borrowed', 'scratches')
+# Поля изменяемого состояния книги (book_state)
+STATE_FIELDS = ('condition', 'borrow_count', 'is_borrowed', 'scratches')
+
+
+def book_state(book: Book) -> dict:
+    """Изменяемое состояние книги: состояние, взятие, счетчик взятий, царапины"""
+    return {
+        'condition': book.condition,
+        'borrow_count': book.borrow_count(),
+        'is_borrowed': book.is_borrowed(),
+        'scratches': getattr(book, '_scratches', 0),
+    }
+
+
+def book_to_record(book: Book) -> dict:
+    """Запись книги (словарь простых значений) для сохранения в JSON"""
+    return {
+        'kind': type(book).__name__,
+        'title': book.title,
+        'author': book.author,
+        'year': book.year,
+        'genre': book.genre,
+        'cover_type': book.cover_type,
+        'isbn': book.isbn,
+        'has_images': bool(book.has_images),
+        **book_state(book),
+    }
+
+
+def record_to_book(record: dict) -> Book:
+    """Восстановление книги из записи book_to_record в точном состоянии"""
+    return restore_book(record['kind'], record['title'], record['author'], record['year'],
+                        record['genre'], record['cover_type'], record['isbn'],
+                        record['condition'], record['has_images'], record.get('borrow_count', 0),
+                        record.get('is_borrowed', False), record.get('scratches', 0))
+
+
+def apply_state(book: Book, state: dict) -> None:
+    """
+    Перевод книги в сохраненное состояние book_state методом Book.set_state:
+    подписчики (индексы, журнал, хранилища) оповещаются о каждом измененном поле.
+    Повторное применение того же состояния ничего не меняет
+    """
+    book.set_state(state['condition'], state['borrow_count'], state['is_borrowed'], state['scratches'])
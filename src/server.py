@@ -0,0 +1,425 @@
+import asyncio
+import contextlib
+import io
+import json
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+from import_export import parse_book
+from records import book_to_record
+
+
+MAX_BODY_BYTES = 1 << 20  # Наибольший размер тела запроса
+DEFAULT_LIMIT = 100       # Книг в ответе поиска по умолчанию
+MAX_LIMIT = 1000          # Наибольшее количество книг в ответе поиска
+
+
+class HttpError(Exception):
+    """Ошибка запроса с HTTP-статусом ответа"""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _json(data) -> bytes:
+    """Тело ответа JSON"""
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+class LookupBatcher:
+    """
+    Микропакетирование запросов поиска
+    Поиски, пришедшие за один проход цикла событий (или за window секунд),
+    выполняются одним пакетом: одинаковые запросы выполняются и сериализуются
+    один раз, а ответ получают все ожидающие
+    """
+
+    def __init__(self, lookups: dict, window: float = 0.0, max_batch: int = 256):
+        """
+        Параметры:
+        lookups - функции поиска по виду запроса: вид -> функция(ключ) -> данные ответа
+        window - время накопления пакета в секундах (0 - до следующего прохода цикла)
+        max_batch - размер пакета, при котором он выполняется сразу
+        """
+        self._lookups = lookups
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = {}  # (вид, ключ) -> future с телом ответа
+        self._handle = None
+        self.batches = 0    # Выполнено пакетов
+        self.lookups = 0    # Выполнено поисков (без повторов внутри пакета)
+
+    def lookup(self, kind: str, key) -> asyncio.Future:
+        """Постановка поиска в пакет, future получит тело ответа JSON"""
+        loop = asyncio.get_running_loop()
+        future = self._pending.get((kind, key))
+        if future is None:
+            future = self._pending[(kind, key)] = loop.create_future()
+            if len(self._pending) >= self.max_batch:
+                self.flush()
+            elif self._handle is None:
+                self._handle = (loop.call_later(self.window, self.flush) if self.window
+                                else loop.call_soon(self.flush))
+        return future
+
+    def flush(self) -> None:
+        """Выполнение накопленного пакета"""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        self.batches += 1
+        for (kind, key), future in pending.items():
+            self.lookups += 1
+            try:
+                body = _json(self._lookups[kind](key))
+            except Exception as error:
+                future.set_exception(error)
+            else:
+                future.set_result(body)
+
+
+class LibraryServer:
+    """
+    HTTP/JSON-сервер библиотеки на asyncio (только стандартная библиотека)
+    Запросы:
+    GET  /books/{isbn}                      - книга по ISBN
+    GET  /books?author=... | year=... | title=... | prefix=...  [&offset=0&limit=100]
+                                            - {"total": n, "books": [...]}
+    POST /books                             - добавление книги (запись JSON, как в import_export)
+    POST /books/{isbn}/borrow | /return     - взятие и возврат
+    POST /books/{isbn}/damage               - урон, тело {"amount": n}
+    GET  /stats                             - счетчики сервера и библиотеки
+    Соединения keep-alive, запросы одного соединения можно отправлять конвейером
+    (ответы приходят в порядке запросов). Поиски объединяются в микропакеты.
+    Ограничения нагрузки: max_connections соединений, pipeline_depth
+    необработанных запросов на соединение (дальше сервер перестает читать
+    сокет) и max_in_flight запросов всего (сверх - ответ 503)
+    """
+
+    def __init__(self, library, host: str = '127.0.0.1', port: int = 8080,
+                 max_connections: int = 1000, pipeline_depth: int = 32,
+                 max_in_flight: int = 10000, batch_window: float = 0.0, max_batch: int = 256):
+        self.library = library
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.pipeline_depth = pipeline_depth
+        self.max_in_flight = max_in_flight
+        index = library.index
+        self.batcher = LookupBatcher({
+            'isbn': lambda isbn: self._book_or_404(index.search_by_isbn(isbn), isbn),
+            'author': lambda key: self._page(index.search_by_author, *key),
+            'year': lambda key: self._page(index.search_by_year, *key),
+            'title': lambda key: self._page(index.search_title_contains, *key),
+            'prefix': lambda key: self._page(index.search_title_prefix, *key),
+        }, batch_window, max_batch)
+        self.connections = 0
+        self.in_flight = 0
+        self.served = 0
+        self.rejected = 0
+        self._server = None
+        self._writers = set()
+        self._handlers = set()  # Задачи обработчиков открытых соединений
+
+    @staticmethod
+    def _page(search, value, offset: int, limit: int) -> dict:
+        """Страница результатов поиска: общее количество и записи книг offset..offset+limit"""
+        books = search(value)
+        return {'total': len(books), 'books': [book_to_record(book) for book in books[offset:offset + limit]]}
+
+    @staticmethod
+    def _book_or_404(book, isbn: str) -> dict:
+        if book is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Книга с ISBN {isbn} не найдена")
+        return book_to_record(book)
+
+    async def start(self) -> None:
+        """Запуск сервера (port=0 - свободный порт, фактический записывается в self.port)"""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Запуск и работа до отмены"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Остановка сервера и закрытие открытых соединений"""
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        # Обработчики соединений завершаются после закрытия сокетов
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Обработка соединения: чтение запросов конвейером, ответы по порядку"""
+        if self.connections >= self.max_connections:
+            self.rejected += 1
+            writer.write(self._response(HTTPStatus.SERVICE_UNAVAILABLE,
+                                        _json({'error': 'слишком много соединений'}), keep_alive=False))
+            await self._close_writer(writer)
+            return
+        self.connections += 1
+        self._writers.add(writer)
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        # Очередь ответов ограничена: при заполнении чтение сокета приостанавливается
+        responses = asyncio.Queue(self.pipeline_depth)
+        sender = asyncio.create_task(self._send_responses(responses, writer))
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await responses.put((self._dispatch(method, target, body), keep_alive))
+                if not keep_alive:
+                    break
+        except HttpError as error:
+            await responses.put((self._error(error), False))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            # Отправитель выбирает очередь до конца и после ошибки записи, поэтому место в ней будет
+            if not sender.done():
+                await responses.put(None)
+            await sender
+            self._writers.discard(writer)
+            self._handlers.discard(handler)
+            self.connections -= 1
+            await self._close_writer(writer)
+
+    @staticmethod
+    async def _close_writer(writer: asyncio.StreamWriter) -> None:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """Чтение одного запроса HTTP/1.1: (метод, адрес, заголовки, тело) или None при закрытии"""
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError as error:
+            if error.partial.strip():
+                raise HttpError(HTTPStatus.BAD_REQUEST, "неполный запрос") from None
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "слишком большие заголовки") from None
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, _ = lines[0].split(' ', 2)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "неверная строка запроса") from None
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "неверный Content-Length") from None
+        if length < 0:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "неверный Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "слишком большое тело запроса")
+        body = await reader.readexactly(length) if length else b''
+        return method, target, headers, body
+
+    async def _send_responses(self, responses: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        """
+        Отправка ответов в порядке запросов
+        После ошибки записи соединение закрывается (чтение запросов завершается),
+        а оставшиеся ответы выбираются из очереди без отправки, чтобы обработчик
+        соединения не ждал места в очереди
+        """
+        connected = True
+        while True:
+            item = await responses.get()
+            if item is None:
+                return
+            pending, keep_alive = item
+            status, body = await pending
+            self.served += 1
+            if not connected:
+                continue
+            try:
+                writer.write(self._response(status, body, keep_alive))
+                await writer.drain()
+            except ConnectionError:
+                connected = False
+                writer.close()
+
+    @staticmethod
+    def _response(status: HTTPStatus, body: bytes, keep_alive: bool = True) -> bytes:
+        """Ответ HTTP/1.1"""
+        return (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode('latin-1') + body
+
+    @staticmethod
+    def _error(error: HttpError) -> asyncio.Future:
+        """Готовый ответ с ошибкой"""
+        future = asyncio.get_running_loop().create_future()
+        future.set_result((error.status, _json({'error': str(error)})))
+        return future
+
+    def _dispatch(self, method: str, target: str, body: bytes) -> asyncio.Future:
+        """
+        Обработка запроса; возвращает future с (статус, тело)
+        Поиски ставятся в микропакет, изменения выполняются сразу
+        (после выполнения накопленных поисков, чтобы сохранить порядок запросов)
+        """
+        loop = asyncio.get_running_loop()
+        if self.in_flight >= self.max_in_flight:
+            self.rejected += 1
+            return self._error(HttpError(HTTPStatus.SERVICE_UNAVAILABLE, "сервер перегружен"))
+        self.in_flight += 1
+        try:
+            lookup = self._route(method, target, body)
+        except HttpError as error:
+            self.in_flight -= 1
+            return self._error(error)
+        except (ValueError, TypeError) as error:
+            self.in_flight -= 1
+            return self._error(HttpError(HTTPStatus.BAD_REQUEST, str(error)))
+        except Exception as error:
+            self.in_flight -= 1
+            return self._error(HttpError(HTTPStatus.INTERNAL_SERVER_ERROR, str(error)))
+
+        result = loop.create_future()
+
+        def done(pending: asyncio.Future) -> None:
+            # Счетчик запросов уменьшается при любом исходе, в том числе при отмене
+            try:
+                if pending.cancelled():
+                    result.set_result((HTTPStatus.SERVICE_UNAVAILABLE, _json({'error': 'запрос отменен'})))
+                    return
+                error = pending.exception()
+                if error is None:
+                    result.set_result((HTTPStatus.OK, pending.result()))
+                elif isinstance(error, HttpError):
+                    result.set_result((error.status, _json({'error': str(error)})))
+                else:
+                    result.set_result((HTTPStatus.INTERNAL_SERVER_ERROR, _json({'error': str(error)})))
+            finally:
+                self.in_flight -= 1
+
+        lookup.add_done_callback(done)
+        return result
+
+    def _route(self, method: str, target: str, body: bytes) -> asyncio.Future:
+        """Выбор обработчика по методу и адресу"""
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip('/').split('/') if part]
+        if method == 'GET':
+            if parts == ['stats']:
+                return self._ready(self._stats())
+            if parts[:1] == ['books'] and len(parts) == 2:
+                return self.batcher.lookup('isbn', parts[1])
+            if parts == ['books']:
+                query = {name: values[0] for name, values in parse_qs(url.query).items()}
+                offset = int(query.get('offset', 0))
+                limit = min(MAX_LIMIT, int(query.get('limit', DEFAULT_LIMIT)))
+                if offset < 0 or limit < 0:
+                    raise HttpError(HTTPStatus.BAD_REQUEST, "offset и limit не могут быть отрицательными")
+                for kind in ('author', 'year', 'title', 'prefix'):
+                    if kind in query:
+                        value = int(query[kind]) if kind == 'year' else query[kind]
+                        return self.batcher.lookup(kind, (value, offset, limit))
+                raise HttpError(HTTPStatus.BAD_REQUEST, "нужен параметр author, year, title или prefix")
+        elif method == 'POST':
+            # Накопленные поиски выполняются до изменения библиотеки
+            self.batcher.flush()
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise HttpError(HTTPStatus.BAD_REQUEST, "тело запроса должно быть объектом JSON")
+            if parts == ['books']:
+                return self._ready(self._add(data))
+            if parts[:1] == ['books'] and len(parts) == 3:
+                return self._ready(self._change(parts[1], parts[2], data))
+        raise HttpError(HTTPStatus.NOT_FOUND, f"неизвестный запрос: {method} {url.path}")
+
+    @staticmethod
+    def _ready(data) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(_json(data))
+        return future
+
+    def _add(self, data: dict) -> dict:
+        """Добавление книги из записи JSON"""
+        book = parse_book(data)
+        if book.isbn in self.library:
+            raise HttpError(HTTPStatus.CONFLICT, f"Книга с ISBN {book.isbn} уже существует")
+        # Сообщения библиотеки в консоль не нужны серверу
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.library.add_book(book)
+        return book_to_record(book)
+
+    def _change(self, isbn: str, action: str, data: dict) -> dict:
+        """Взятие, возврат или урон книги"""
+        book = self.library.index.search_by_isbn(isbn)
+        if book is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Книга с ISBN {isbn} не найдена")
+        if action == 'borrow':
+            if not self.library.borrow_book_by_isbn(isbn):
+                raise HttpError(HTTPStatus.CONFLICT, "книга уже взята")
+        elif action == 'return':
+            if not self.library.return_book_by_isbn(isbn):
+                raise HttpError(HTTPStatus.CONFLICT, "книга не была взята")
+        elif action == 'damage':
+            amount = data.get('amount', 10)
+            if isinstance(amount, bool) or not isinstance(amount, int) or amount < 0:
+                raise HttpError(HTTPStatus.BAD_REQUEST, "amount должен быть неотрицательным целым числом")
+            book.damage(amount)
+        else:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"неизвестное действие: {action}")
+        return book_to_record(book)
+
+    def _stats(self) -> dict:
+        """Счетчики сервера и библиотеки (и метрики операций, если они подключены)"""
+        stats = {
+            'books': len(self.library),
+            'borrowed': self.library.index.borrowed_count(),
+            'connections': self.connections,
+            'in_flight': self.in_flight,
+            'served': self.served,
+            'rejected': self.rejected,
+            'batches': self.batcher.batches,
+            'batched_lookups': self.batcher.lookups,
+        }
+        metrics = getattr(self.library, 'metrics', None)
+        if metrics is not None:
+            stats['metrics'] = metrics.snapshot()
+        return stats
+
+
+if __name__ == '__main__':
+    import argparse
+    from library import Library
+    from memory_usage import make_books
+
+    parser = argparse.ArgumentParser(description="HTTP/JSON-сервер библиотеки")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--books', type=int, default=10000, help="количество случайных книг при запуске")
+    parser.add_argument('--metrics', action='store_true', help="метрики операций библиотеки в /stats")
+    arguments = parser.parse_args()
+
+    library = Library('Сервер')
+    library.add_books(make_books(arguments.books))
+    if arguments.metrics:
+        library.enable_metrics()
+    server = LibraryServer(library, arguments.host, arguments.port)
+    print(f"[Сервер] http://{arguments.host}:{arguments.port}")
+    asyncio.run(server.serve_forever())
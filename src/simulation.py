@@ -1,5 +1,11 @@
 from typing import Optional
+import os
 import random
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from statistics import NormalDist, fmean, stdev
 from books import Book, GlossyCover, HardCover, SoftCover
 from books_collection import BookCollection
 from index_dict import IndexDict
@@ -7,249 +13,573 @@ from library import Library
 from constans import *  
 
 
-def run_simulation(steps: int = 40, seed: Optional[int] = None) -> None:
+# Износ при взятии книги: класс книги -> (диапазон урона, диапазон царапин или None)
+BORROW_WEAR = {
+    'HardCover': ((0, 5), None),     # Меньший урон для твердой обложки
+    'SoftCover': ((3, 7), None),     # Средний урон для мягкой обложки
+    'GlossyCover': ((3, 10), (0, 5)),  # Урон и царапины для глянцевой обложки
+}
+
+# Повреждение книги (событие damage_book): класс книги -> (диапазон урона, диапазон царапин или None)
+DAMAGE_WEAR = {
+    'HardCover': ((5, 15), None),
+    'SoftCover': ((10, 25), None),
+    'GlossyCover': ((8, 18), (1, 5)),
+}
+
+
+class BookPool(Sequence):
+    """
+    Книги, добавленные в симуляции, в порядке добавления
+    Удаленная книга оставляет пустое место, а книга с номером i находится
+    спуском по дереву Фенвика количеств занятых мест - O(log n) на добавление,
+    удаление и выбор вместо сдвига списка в list.remove. Номера книг совпадают
+    с номерами в списке с list.remove, поэтому rng.choice и rng.sample
+    выбирают те же книги, что и исходная симуляция со списком
+    """
+
+    def __init__(self, books=()):
+        self._fill(books)
+
+    def _fill(self, books) -> None:
+        """Заполнение набора книгами books по порядку"""
+        self._books = []      # Книги по местам, на месте удаленной - None
+        self._tree = [0]      # Дерево Фенвика занятых мест (нумерация с 1)
+        self._positions = {}  # ISBN -> место
+        for book in books:
+            self.add(book)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __iter__(self):
+        return (book for book in self._books if book is not None)
+
+    def __getitem__(self, index: int) -> Book:
+        """Книга с номером index среди оставшихся, O(log n)"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("номер книги вне набора")
+        # Спуск по дереву: наибольшее место, до которого занято не больше index мест
+        position = 0
+        remaining = index + 1
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            following = position + step
+            if following < len(self._tree) and self._tree[following] < remaining:
+                position = following
+                remaining -= self._tree[following]
+            step >>= 1
+        return self._books[position]
+
+    def _prefix(self, count: int) -> int:
+        """Количество занятых мест среди первых count"""
+        total = 0
+        while count:
+            total += self._tree[count]
+            count &= count - 1
+        return total
+
+    def add(self, book: Book) -> None:
+        """Добавление книги в конец"""
+        self._positions[book.isbn] = len(self._books)
+        self._books.append(book)
+        place = len(self._books)
+        # Узел дерева покрывает места (place - младший бит, place]
+        self._tree.append(1 + self._prefix(place - 1) - self._prefix(place - (place & -place)))
+
+    def remove(self, book: Book) -> None:
+        """Удаление книги"""
+        position = self._positions.pop(book.isbn)
+        self._books[position] = None
+        place = position + 1
+        while place < len(self._tree):
+            self._tree[place] -= 1
+            place += place & -place
+        if len(self._books) > 2 * len(self._positions) + 64:
+            self._fill(list(self))  # Пустые места убираются, порядок сохраняется
+
+    def choice(self, rng: random.Random) -> Book:
+        """Случайная книга"""
+        return rng.choice(self)
+
+
+class SimulationContext:
+    """
+    Состояние прогона, общее для обработчиков событий
+    say - функция вывода сообщений или None (тихий режим: только счетчики)
+    counters - счетчики исходов событий
+    """
+
+    def __init__(self, library: Library, rng: random.Random, pool: BookPool, say=None):
+        self.library = library
+        self.rng = rng
+        self.pool = pool
+        self.say = say
+        self.step = 0
+        self.counters = dict.fromkeys(('books_added', 'borrow_attempts', 'borrow_successes', 'returns',
+                                       'damages', 'removed', 'found'), 0)
+
+
+class SimulationEvent:
+    """Обработчик события симуляции; подклассы задают name и реализуют run"""
+
+    name = None
+
+    def run(self, context: SimulationContext) -> None:
+        raise NotImplementedError
+
+
+# Таблица обработчиков: название события -> обработчик
+EVENT_HANDLERS = {}
+
+
+def register_event(handler: SimulationEvent) -> SimulationEvent:
+    """Регистрация обработчика события в таблице EVENT_HANDLERS"""
+    EVENT_HANDLERS[handler.name] = handler
+    return handler
+
+
+def wear_ranges(book: Book, wear: dict):
+    """
+    Диапазоны износа книги из таблицы wear по ее классу или ближайшему базовому
+    классу (подкласс HardCover изнашивается как HardCover); None - износ не задан
+    Классы сравниваются по имени, как в таблицах BORROW_WEAR и DAMAGE_WEAR
+    """
+    for cls in type(book).__mro__:
+        ranges = wear.get(cls.__name__)
+        if ranges is not None:
+            return ranges
+    return None
+
+
+def apply_wear(book: Book, wear: dict, rng: random.Random) -> tuple:
+    """Износ книги по таблице wear (BORROW_WEAR или DAMAGE_WEAR): (урон, царапины)"""
+    ranges = wear_ranges(book, wear)
+    if ranges is None:
+        return 0, 0  # Для книг без типа обложки износ не задан
+    damage_range, scratch_range = ranges
+    scratches = 0
+    if scratch_range is not None:
+        scratches = rng.randint(*scratch_range)
+        book.add_scratches(scratches)  # Добавление царапин
+    damage = rng.randint(*damage_range)
+    book.damage(damage)
+    return damage, scratches
+
+
+class AddBook(SimulationEvent):
+    """Добавление книги заданного класса со случайными данными"""
+
+    def __init__(self, name: str, book_class, prefix: str, first_year: int,
+                 author: str = None, genres: list = GENRES):
+        """
+        Параметры:
+        book_class - класс книги
+        prefix - префикс ISBN
+        first_year - наименьший год издания
+        author - фиксированный автор (None - случайный из AUTHORS)
+        genres - жанры для случайного выбора
+        """
+        self.name = name
+        self.book_class = book_class
+        self.prefix = prefix
+        self.first_year = first_year
+        self.author = author
+        self.genres = genres
+
+    def run(self, context: SimulationContext) -> None:
+        rng = context.rng
+        title = rng.choice(TITLES)
+        author = self.author or rng.choice(AUTHORS)
+        year = rng.randint(self.first_year, 2026)
+        genre = rng.choice(self.genres)
+        isbn = f"{self.prefix}-{context.step:04d}-{rng.randint(1000,9999)}"  # Уникальный ISBN по номеру шага
+        condition = rng.randint(30, 100)  # Случайное начальное состояние
+        has_images = rng.choice([True, False])
+
+        book = self.book_class(title, author, year, genre, isbn, condition, has_images)
+        context.library.add_book(book)
+        context.pool.add(book)
+        context.counters['books_added'] += 1
+
+
+class BorrowBook(SimulationEvent):
+    """Взятие случайной книги с износом по типу обложки"""
+
+    name = 'borrow_book'
+
+    def run(self, context: SimulationContext) -> None:
+        say = context.say
+        if not context.pool:
+            if say:
+                say('[Симуляция] Нет книг для взятия')
+            return
+        book = context.pool.choice(context.rng)
+        if say:
+            say(f"[Симуляция] Пытаемся взять книгу: {book.title}\n")
+        context.counters['borrow_attempts'] += 1
+
+        if book.borrow():
+            context.counters['borrow_successes'] += 1
+            if say:
+                say(f"    Книга взята. Всего взятий: {book.borrow_count()}\n")
+            # Нанесение урона в зависимости от типа обложки
+            apply_wear(book, BORROW_WEAR, context.rng)
+        elif say:
+            say(' Книга уже взята')
+
+
+class ReturnBook(SimulationEvent):
+    """Возврат случайной взятой книги"""
+
+    name = 'return_book'
+
+    def run(self, context: SimulationContext) -> None:
+        say = context.say
+        if not context.pool:
+            if say:
+                say('[Симуляция] Нет книг в библиотеке')
+            return
+        # Взятые книги берутся из индекса библиотеки
+        borrowed_books = context.library.index.borrowed_books()
+        if borrowed_books:
+            book = context.rng.choice(borrowed_books)
+            book.return_book()
+            context.counters['returns'] += 1
+            if say:
+                say(f"[Симуляция] Книга возвращена: {book.title}")
+        elif say:
+            say('[Симуляция] Нет взятых книг для возврата')
+
+
+class DamageBook(SimulationEvent):
+    """Повреждение случайной книги по типу обложки"""
+
+    name = 'damage_book'
+
+    def run(self, context: SimulationContext) -> None:
+        say = context.say
+        if not context.pool:
+            if say:
+                say('[Симуляция] Нет книг для повреждения')
+            return
+        book = context.pool.choice(context.rng)
+        if say:
+            say(f"[Симуляция] Наносим повреждение: {book.title}\n")
+        damage, scratches = apply_wear(book, DAMAGE_WEAR, context.rng)
+        context.counters['damages'] += 1
+        if not say:
+            return
+        if scratches:
+            say(f"    Добавлено царапин: {scratches}.\nОбщая прочность {book.get_condition()}\n")
+        else:
+            say(f"    Прочность снижена на {damage}%. Текущее состояние: {book.get_condition()}\n")
+
+
+class SearchEvent(SimulationEvent):
+    """
+    Поиск по полю индекса со случайным значением
+    При выводе сообщений найденные книги перечисляются, в тихом режиме
+    считается только размер корзины индекса (без создания списка книг)
+    """
+
+    def __init__(self, name: str, field: str, choose, describe: str, search_method: str,
+                 choose_first: bool = False):
+        """
+        Параметры:
+        field - поле индекса (для IndexDict.bucket)
+        choose - функция(rng) -> искомое значение
+        describe - шаблон сообщения о поиске с {value}
+        search_method - метод Library для поиска с выводом
+        choose_first - значение выбирается и при пустой библиотеке (как в поиске по типу обложки),
+                       иначе случайное число не расходуется, если искать негде
+        """
+        self.name = name
+        self.field = field
+        self.choose = choose
+        self.describe = describe
+        self.search_method = search_method
+        self.choose_first = choose_first
+
+    def run(self, context: SimulationContext) -> None:
+        say = context.say
+        if context.pool or self.choose_first:
+            value = self.choose(context.rng)
+            if say:
+                say(self.describe.format(value=value))
+        if not context.pool:
+            if say:
+                say('[Симуляция] Библиотека пуста, поиск невозможен')
+            return
+        if say:
+            found_books = getattr(context.library, self.search_method)(value)
+            say(f"    Найдено: {len(found_books)} книг")
+            for book in found_books:
+                say(f"    - {book}")
+            context.counters['found'] += len(found_books)
+        else:
+            context.counters['found'] += len(context.library.index.bucket(self.field, value))
+
+
+class CheckCondition(SimulationEvent):
+    """Проверка состояния трех случайных книг"""
+
+    name = 'check_condition'
+
+    def run(self, context: SimulationContext) -> None:
+        say = context.say
+        if not context.pool:
+            if say:
+                say('[Симуляция] Нет книг для проверки состояния')
+            return
+        sample_books = context.rng.sample(context.pool, min(3, len(context.pool)))
+        if say:
+            say(f"[Симуляция] Проверка состояния книг:")
+            for book in sample_books:
+                say(f"  {book.title}: {book.get_condition()}")
+
+
+class RemoveBook(SimulationEvent):
+    """Удаление случайной книги"""
+
+    name = 'remove_book'
+
+    def run(self, context: SimulationContext) -> None:
+        say = context.say
+        if not context.pool:
+            if say:
+                say('[Симуляция] Нет книг для удаления')
+            return
+        book = context.pool.choice(context.rng)
+        if say:
+            say(f"[Симуляция] Удаляем книгу: {book.title}")
+        if context.library.remove_book_by_isbn(book.isbn):
+            context.pool.remove(book)
+            context.counters['removed'] += 1
+
+
+class GetNonexistent(SimulationEvent):
+    """Поиск несуществующей книги"""
+
+    name = 'get_nonexistent'
+
+    def run(self, context: SimulationContext) -> None:
+        say = context.say
+        if not context.pool:
+            if say:
+                say('[Симуляция] Библиотека пуста!')
+            return
+        fake_isbn = "ISBN-NOT-EXISTS"
+        result = context.library.search_by_isbn(fake_isbn)
+        if not say:
+            return
+        if result is None:
+            say(f"[Симуляция] Книга с ISBN '{fake_isbn}' не найдена")
+        else:
+            say(f"[Симуляция] Неожиданно найдена: {result}")
+
+
+register_event(AddBook('add_hardcover', HardCover, 'HC', 1900))
+register_event(AddBook('add_softcover', SoftCover, 'SC', 1990))
+# Глянцевые обложки: фиксированный автор и особые жанры
+register_event(AddBook('add_glossycover', GlossyCover, 'GC', 2000,
+                       author='Редакция журнала', genres=['Журнал', 'Альбом', 'Каталог']))
+register_event(BorrowBook())
+register_event(ReturnBook())
+register_event(DamageBook())
+register_event(SearchEvent('search_by_cover_type', 'cover_type',
+                           lambda rng: rng.choice([CoverType.HARD, CoverType.SOFT, CoverType.GLOSSY]),
+                           "[Симуляция] Поиск книг с обложкой: {value}", 'search_by_cover_type',
+                           choose_first=True))
+register_event(SearchEvent('search_by_author', 'author', lambda rng: rng.choice(AUTHORS),
+                           "[Симуляция] Поиск книг автора: {value}", 'search_by_author'))
+register_event(SearchEvent('search_by_year', 'year', lambda rng: rng.randint(1900, 2025),
+                           "[Симуляция] Поиск книг {value} года", 'search_by_year'))
+register_event(SearchEvent('search_by_genre', 'genre', lambda rng: rng.choice(GENRES),
+                           "[Симуляция] Поиск книг с жанром: {value}", 'search_by_genre'))
+register_event(CheckCondition())
+register_event(RemoveBook())
+register_event(GetNonexistent())
+
+
+def run_simulation(steps: int = 40, seed: Optional[int] = None, library: Optional[Library] = None,
+                   quiet: bool = False, sink=print) -> dict:
     """
     Запуск симуляции работы библиотеки
+    На каждом шаге выбирается случайное событие из SIMULATION_EVENTS и выполняется
+    его обработчик из таблицы EVENT_HANDLERS
     Параметры:
     steps - количество шагов симуляции
     seed - начальное значение для генератора случайных чисел (для воспроизводимости)
+    library - библиотека для симуляции (по умолчанию - новая пустая);
+              события выбирают книги и из уже имеющихся в ней
+    quiet - тихий режим: сообщения не формируются, ведутся только счетчики
+    sink - функция вывода сообщений (по умолчанию print; например, list.append -
+           тогда сообщения библиотеки не выводятся)
+    Возвращает:
+    dict - показатели прогона (см. _run_metrics)
     """
+    say = None if quiet else sink
+    if say:
+        say(f"\n{'='*60}")
+        say(f"СИМУЛЯЦИЯ БИБЛИОТЕКИ")
+        say(f"{'='*60}")
     
-    print(f"\n{'='*60}")
-    print(f"СИМУЛЯЦИЯ БИБЛИОТЕКИ")
-    print(f"{'='*60}")
-    
-    # Установка seed для воспроизводимости случайных событий
-    if seed is not None:
-        random.seed(seed)
-        print(f"[Симуляция] Seed установлен: {seed}")
+    # Собственный генератор прогона: прогоны в разных процессах независимы
+    rng = random.Random(seed)
+    if say and seed is not None:
+        say(f"[Симуляция] Seed установлен: {seed}")
     
     # Создание библиотеки
-    library = Library('Библиотека')
-    added_books_history = []  # История добавленных книг для отслеживания
-   
+    if library is None:
+        library = Library('Библиотека')
+    verbose = library.verbose
+    # Сообщения самой библиотеки идут только в консоль
+    library.verbose = say is print
+    context = SimulationContext(library, rng, BookPool(library), say)
+    # Обработчики в порядке SIMULATION_EVENTS: выбор события - один rng.choice
+    handlers = [EVENT_HANDLERS[event] for event in SIMULATION_EVENTS]
+    events = dict.fromkeys(SIMULATION_EVENTS, 0)
     
     # Основной цикл симуляции
-    for step in range(1, steps + 1):
-        print(f"\n-- Шаг {step}/{steps} --")
-        
-        # Выбор случайного события из списка
-        event = random.choice(SIMULATION_EVENTS)
-        print(f"Событие: {event}")
-        
-
-        # Добавление книги с твердой обложкой
-        if event == 'add_hardcover':
-            title = random.choice(TITLES)
-            author = random.choice(AUTHORS)
-            year = random.randint(1900, 2026)
-            genre = random.choice(GENRES)
-            isbn = f"HC-{step:04d}-{random.randint(1000,9999)}"  # Уникальный ISBN для твердой обложки
-            condition = random.randint(30, 100)  # Случайное начальное состояние
-            has_images = random.choice([True, False])
-
-            book = HardCover(title, author, year, genre, isbn, condition, has_images)
-            library.add_book(book)
-            added_books_history.append(book)
-
-
-        # Добавление книги с мягкой обложкой
-        elif event == 'add_softcover':
-            title = random.choice(TITLES)
-            author = random.choice(AUTHORS)
-            year = random.randint(1990, 2026)
-            genre = random.choice(GENRES)
-            isbn = f"SC-{step:04d}-{random.randint(1000,9999)}"  # Уникальный ISBN для мягкой обложки
-            condition = random.randint(30, 100)
-            has_images = random.choice([True, False])
-            
-            book = SoftCover(title, author, year, genre, isbn, condition, has_images)
-            library.add_book(book)
-            added_books_history.append(book)
-            
-
-        # Добавление книги с глянцевой обложкой
-        elif event == 'add_glossycover':
-            title = random.choice(TITLES)
-            author = 'Редакция журнала'  # Фиксированный автор для глянцевых обложек
-            year = random.randint(2000, 2026)
-            genre = random.choice(['Журнал', 'Альбом', 'Каталог'])  # Особые жанры для глянцевых обложек
-            isbn = f"GC-{step:04d}-{random.randint(1000,9999)}"  # Уникальный ISBN для глянцевой обложки
-            condition = random.randint(30, 100)
-            has_images = random.choice([True, False])
-           
-            book = GlossyCover(title, author, year, genre, isbn, condition, has_images)
-            library.add_book(book)
-
-            added_books_history.append(book)
-            
-        # Взятие книги в аренду
-        elif event == 'borrow_book':
-            if added_books_history:
-                book = random.choice(added_books_history)
-                print(f"[Симуляция] Пытаемся взять книгу: {book.title}\n")
-                
-                if book.borrow():
-                    print(f"    Книга взята. Всего взятий: {book.borrow_count()}\n")
-                    # Нанесение урона в зависимости от типа обложки
-                    if isinstance(book, HardCover):
-                        book.damage(random.randint(0, 5))  # Меньший урон для твердой обложки
-                    elif isinstance(book, SoftCover):
-                        book.damage(random.randint(3, 7))  # Средний урон для мягкой обложки
-                    elif isinstance(book, GlossyCover):
-                        book.add_scratches(random.randint(0, 5))  # Добавление царапин
-                        book.damage(random.randint(3, 10))  # Урон для глянцевой обложки
-                else:
-                    print(' Книга уже взята')
-            else:
-                print('[Симуляция] Нет книг для взятия')
-
-        # Возврат книги
-        elif event == 'return_book':
-            if added_books_history:
-                borrowed_books = []
-                # Поиск взятых книг
-                for b in added_books_history:
-                    if b.is_borrowed:
-                        borrowed_books.append(b)
-                        
-                if borrowed_books:
-                    book = random.choice(borrowed_books)
-                    book.return_book()
-                    print(f"[Симуляция] Книга возвращена: {book.title}")
-                else:
-                    print('[Симуляция] Нет взятых книг для возврата')
-            else:
-                print('[Симуляция] Нет книг в библиотеке')
-
-        # Нанесение повреждения книге
-        elif event == 'damage_book':
-            if added_books_history:
-                book = random.choice(added_books_history)
-                print(f"[Симуляция] Наносим повреждение: {book.title}\n")
-                
-                if isinstance(book, HardCover):
-                    damage = random.randint(5, 15)
-                    book.damage(damage)
-                    print(f"    Прочность снижена на {damage}%. Текущее состояние: {book.get_condition()}\n")
-                    
-                elif isinstance(book, SoftCover):
-                    damage = random.randint(10, 25)
-                    book.damage(damage)
-                    print(f"    Прочность снижена на {damage}%. Текущее состояние: {book.get_condition()}\n")  
-    
-                elif isinstance(book, GlossyCover):
-                    scratches = random.randint(1, 5)
-                    book.add_scratches(scratches)  # Добавление царапин
-                    damage = random.randint(8, 18)
-                    book.damage(damage)
-                    print(f"    Добавлено царапин: {scratches}.\nОбщая прочность {book.get_condition()}\n")              
-            else:
-                print('[Симуляция] Нет книг для повреждения')
-
-        # Поиск книг по типу обложки
-        elif event == 'search_by_cover_type':
-            cover_types = [CoverType.HARD, CoverType.SOFT, CoverType.GLOSSY]
-            search_type = random.choice(cover_types)
-            print(f"[Симуляция] Поиск книг с обложкой: {search_type}")
-            if added_books_history:
-                found_books = []
-                for book in library.book_collection:
-                    if book.cover_type == search_type:
-                        found_books.append(book)
-                
-                print(f"    Найдено: {len(found_books)} книг")
-                for book in found_books: 
-                    print(f"    - {book}")
-            else:
-                print('[Симуляция] Библиотека пуста, поиск невозможен')
-
-
-        # Поиск книг по автору
-        elif event == 'search_by_author':
-            if added_books_history:
-                found_books = []
-                search_author = random.choice(AUTHORS)
-                print(f"[Симуляция] Поиск книг автора: {search_author}")
-                for book in library.book_collection:
-                    if book.author == search_author:
-                        found_books.append(book)
-                print(f"    Найдено: {len(found_books)} книг")
-                for book in found_books: 
-                    print(f"    - {book}")
-            else:
-                print('[Симуляция] Библиотека пуста, поиск невозможен')
-
-        # Поиск книг по году издания
-        elif event == 'search_by_year':
-            if added_books_history:
-                found_books = []
-                search_year = random.randint(1900, 2025)
-                print(f"[Симуляция] Поиск книг {search_year} года")
-                for book in library.book_collection:
-                    if book.year == search_year:
-                        found_books.append(book)
-                print(f"    Найдено: {len(found_books)} книг")
-                for book in found_books: 
-                    print(f"    - {book}")
-            else:
-                print('[Симуляция] Библиотека пуста, поиск невозможен')
-        
-        # Поиск книг по жанру
-        elif event == 'search_by_genre':
-            if added_books_history:
-                found_books = []
-                search_genre = random.choice(GENRES)
-                print(f"[Симуляция] Поиск книг с жанром: {search_genre}")
-                for book in library.book_collection:
-                    if book.genre == search_genre:
-                        found_books.append(book)
-                print(f"    Найдено: {len(found_books)} книг")
-                for book in found_books: 
-                    print(f"    - {book}")
-            else:
-                print('[Симуляция] Библиотека пуста, поиск невозможен')
-                
-        # Проверка состояния книг
-        elif event == 'check_condition':
-            if added_books_history:
-                sample_size = min(3, len(added_books_history))
-                sample_books = random.sample(added_books_history, sample_size)
-                
-                print(f"[Симуляция] Проверка состояния книг:")
-                for book in sample_books:
-                    condition = book.get_condition()
-                    print(f"  {book.title}: {condition}")        
-            else:
-                print('[Симуляция] Нет книг для проверки состояния')           
-
-        # Удаление книги
-        elif event == 'remove_book':
-            if added_books_history:
-                book = random.choice(added_books_history)
-                print(f"[Симуляция] Удаляем книгу: {book.title}")
-                success = library.remove_book_by_title(book.title)
-                if success:
-                    added_books_history.remove(book)  # Удаляем из истории
-            else:
-                print('[Симуляция] Нет книг для удаления')
-         
-        # Поиск несуществующей книги
-        elif event == 'get_nonexistent':
-            if added_books_history:
-                fake_isbn = "ISBN-NOT-EXISTS"
-                result = library.search_by_isbn(fake_isbn)
-                if result is None:
-                    print(f"[Симуляция] Книга с ISBN '{fake_isbn}' не найдена")
-                else:
-                    print(f"[Симуляция] Неожиданно найдена: {result}")
-            else:
-                print('[Симуляция] Библиотека пуста!')
+    started = time.perf_counter()
+    try:
+        for step in range(1, steps + 1):
+            context.step = step
+            handler = rng.choice(handlers)
+            events[handler.name] += 1
+            if say:
+                say(f"\n-- Шаг {step}/{steps} --")
+                say(f"Событие: {handler.name}")
+            handler.run(context)
+    finally:
+        library.verbose = verbose
+    elapsed = time.perf_counter() - started
    
     # Завершение симуляции
-    print(f"Симуляция завершена. Книг в библиотеке: {len(added_books_history)}")
+    if say:
+        say(f"Симуляция завершена. Книг в библиотеке: {len(library)}")
+        say(f"Скорость: {steps / elapsed if elapsed else 0:.0f} шагов/с")
+    return _run_metrics(context, seed, steps, events, elapsed)
+
+
+def _run_metrics(context: SimulationContext, seed, steps: int, events: dict, elapsed: float) -> dict:
+    """Показатели одного прогона симуляции"""
+    library = context.library
+    counters = context.counters
+    conditions = [book.condition for book in library]
+    attempts = counters['borrow_attempts']
+    return {
+        'seed': seed,
+        'steps': steps,
+        'books_added': counters['books_added'],
+        'final_books': len(library),
+        'borrowed_at_end': library.index.borrowed_count(),
+        'borrow_attempts': attempts,
+        'borrow_success_rate': counters['borrow_successes'] / attempts if attempts else None,
+        'mean_condition': fmean(conditions) if conditions else None,
+        'condition_bands': library.index.condition_band_counts(),
+        'events': events,
+        'counters': counters,
+        'seconds': elapsed,
+        'steps_per_second': steps / elapsed if elapsed else None,
+    }
+
+
+def _run_quiet(seed, steps: int) -> dict:
+    """Прогон симуляции в тихом режиме (выполняется в процессе пула)"""
+    return run_simulation(steps, seed, quiet=True)
+
+
+def confidence_interval(values: list, confidence: float = 0.95) -> dict:
+    """
+    Среднее и доверительный интервал среднего (нормальное приближение)
+    Значения None (показатель не определен в прогоне) пропускаются
+    """
+    values = [value for value in values if value is not None]
+    if not values:
+        return {'n': 0, 'mean': None, 'stdev': None, 'ci_low': None, 'ci_high': None}
+    mean = fmean(values)
+    deviation = stdev(values) if len(values) > 1 else 0.0
+    margin = NormalDist().inv_cdf(0.5 + confidence / 2) * deviation / len(values) ** 0.5
+    return {'n': len(values), 'mean': mean, 'stdev': deviation, 'ci_low': mean - margin, 'ci_high': mean + margin}
+
+
+def aggregate_runs(runs: list, confidence: float = 0.95) -> dict:
+    """
+    Сводка по прогонам: для каждого числового показателя, каждого события
+    и каждой полосы состояния - среднее с доверительным интервалом
+    """
+    summary = {'runs': len(runs), 'confidence': confidence}
+    for name in ('books_added', 'final_books', 'borrowed_at_end', 'borrow_attempts',
+                 'borrow_success_rate', 'mean_condition', 'steps_per_second'):
+        summary[name] = confidence_interval([run[name] for run in runs], confidence)
+    for group in ('events', 'counters', 'condition_bands'):
+        keys = dict.fromkeys(key for run in runs for key in run[group])
+        summary[group] = {key: confidence_interval([run[group].get(key, 0) for run in runs], confidence)
+                          for key in keys}
+    return summary
+
+
+def run_simulations(seeds, steps: int = 40, workers: Optional[int] = None,
+                    confidence: float = 0.95) -> dict:
+    """
+    Прогоны симуляции для набора seed (метод Монте-Карло)
+    Каждый прогон использует свой random.Random(seed), поэтому результат
+    не зависит от количества процессов и порядка выполнения.
+    Прогоны выполняются в тихом режиме и распределяются по ProcessPoolExecutor пачками, чтобы передача
+    между процессами не съедала выигрыш на коротких прогонах
+    Параметры:
+    seeds - начальные значения генератора, по одному на прогон
+    steps - количество шагов каждого прогона
+    workers - количество процессов (по умолчанию - количество ядер; 1 - в текущем процессе)
+    confidence - уровень доверия интервалов
+    Возвращает:
+    dict - 'runs': показатели прогонов в порядке seeds, 'summary': сводка aggregate_runs
+    """
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(seeds) < 2:
+        runs = [_run_quiet(seed, steps) for seed in seeds]
+    else:
+        chunksize = max(1, len(seeds) // (workers * 4))
+        with ProcessPoolExecutor(workers) as executor:
+            runs = list(executor.map(_run_quiet, seeds, repeat(steps), chunksize=chunksize))
+    return {'runs': runs, 'summary': aggregate_runs(runs, confidence)}
 
 
 if __name__ == "__main__":
-    # Запуск симуляции с заданными параметрами
-    run_simulation(steps = 40, seed = 1)
\ No newline at end of file
+    import argparse
+    from memory_usage import make_books
+
+    parser = argparse.ArgumentParser(description="Симуляция работы библиотеки")
+    parser.add_argument('--steps', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--books', type=int, default=0, help="книг в библиотеке перед началом симуляции")
+    parser.add_argument('--quiet', action='store_true', help="без вывода событий, только итоговые показатели")
+    parser.add_argument('--runs', type=int, default=1, help="количество прогонов Монте-Карло (seed, seed+1, ...)")
+    parser.add_argument('--workers', type=int, default=None)
+    arguments = parser.parse_args()
+
+    if arguments.runs == 1:
+        # Запуск симуляции с заданными параметрами
+        library = Library('Библиотека', verbose=False)
+        library.add_books(make_books(arguments.books, arguments.seed))
+        metrics = run_simulation(arguments.steps, arguments.seed, library, quiet=arguments.quiet)
+        if arguments.quiet:
+            print(f"Шагов: {arguments.steps}, книг в библиотеке: {metrics['final_books']}, "
+                  f"{metrics['steps_per_second']:.0f} шагов/с")
+            print(f"События: {metrics['events']}")
+            print(f"Счетчики: {metrics['counters']}")
+    else:
+        seeds = range(arguments.seed, arguments.seed + arguments.runs)
+        summary = run_simulations(seeds, arguments.steps, arguments.workers)['summary']
+        print(f"Прогонов: {summary['runs']}, доверительные интервалы {summary['confidence']:.0%}")
+        for name in ('books_added', 'final_books', 'borrow_success_rate', 'mean_condition'):
+            interval = summary[name]
+            if interval['mean'] is not None:
+                print(f"  {name}: {interval['mean']:.3f} [{interval['ci_low']:.3f}; {interval['ci_high']:.3f}]")
+        for band, interval in summary['condition_bands'].items():
+            print(f"  {band}: {interval['mean']:.2f} [{interval['ci_low']:.2f}; {interval['ci_high']:.2f}]")
@@ -0,0 +1,104 @@
+from bisect import bisect_left, bisect_right, insort
+from operator import attrgetter
+
+
+class SortedIndex:
+    """
+    Индекс с упорядоченными ключами (key -> {ISBN: Book})
+    Хранит корзины книг в словаре и отсортированный список различных ключей,
+    что позволяет выполнять запросы по диапазону за O(log n + k),
+    где n - количество различных ключей, k - размер результата.
+    Добавление и удаление книги в существующую корзину - O(1),
+    появление или исчезновение ключа - O(n) по числу различных ключей
+    """
+
+    def __init__(self, ident=attrgetter('isbn')):
+        """
+        Параметры:
+        ident - функция, возвращающая уникальный ключ книги в корзине (по умолчанию ISBN)
+        """
+        self._ident = ident
+        self._buckets = {}  # Корзины книг по ключу (key -> {ident: Book})
+        self._keys = []     # Отсортированный список ключей
+
+    def __len__(self) -> int:
+        """Количество различных ключей в индексе"""
+        return len(self._keys)
+
+    def __contains__(self, key) -> bool:
+        """Проверка наличия ключа в индексе"""
+        return key in self._buckets
+
+    def __getitem__(self, key) -> dict:
+        """Корзина книг по ключу"""
+        return self._buckets[key]
+
+    def get(self, key, default=None):
+        """Корзина книг по ключу или значение по умолчанию"""
+        return self._buckets.get(key, default)
+
+    def add(self, key, book) -> None:
+        """Добавление книги в корзину ключа"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            # Новый ключ вставляется в отсортированный список
+            bucket = self._buckets[key] = {}
+            insort(self._keys, key)
+        bucket[self._ident(book)] = book
+
+    def add_many(self, items) -> None:
+        """
+        Пакетное добавление пар (key, book)
+        Новые ключи сортируются один раз в конце, а не вставляются по одному
+        """
+        new_keys = []
+        for key, book in items:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = {}
+                new_keys.append(key)
+            bucket[self._ident(book)] = book
+        if new_keys:
+            self._keys.extend(new_keys)
+            self._keys.sort()
+
+    def remove(self, key, book) -> None:
+        """Удаление книги из корзины ключа"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return
+        bucket.pop(self._ident(book), None)
+        # Если корзина опустела, удаляем ключ из индекса
+        if not bucket:
+            del self._buckets[key]
+            del self._keys[bisect_left(self._keys, key)]
+
+    def keys(self, reverse: bool = False):
+        """Итератор по ключам в порядке возрастания (или убывания)"""
+        return reversed(self._keys) if reverse else iter(self._keys)
+
+    def range(self, lo=None, hi=None, reverse: bool = False):
+        """
+        Итератор по книгам с ключами в диапазоне [lo, hi]
+        Параметры:
+        lo - нижняя граница (None - без ограничения)
+        hi - верхняя граница (None - без ограничения)
+        reverse - обход в порядке убывания ключей
+        """
+        start = 0 if lo is None else bisect_left(self._keys, lo)
+        stop = len(self._keys) if hi is None else bisect_right(self._keys, hi)
+        keys = self._keys[start:stop]
+        if reverse:
+            keys.reverse()
+        for key in keys:
+            yield from self._buckets[key].values()
+
+    def count(self, lo=None, hi=None) -> int:
+        """Количество книг с ключами в диапазоне [lo, hi] (без обхода книг)"""
+        start = 0 if lo is None else bisect_left(self._keys, lo)
+        stop = len(self._keys) if hi is None else bisect_right(self._keys, hi)
+        return sum(len(self._buckets[key]) for key in self._keys[start:stop])
+
+    def __iter__(self):
+        """Итератор по всем книгам в порядке возрастания ключей"""
+        return self.range()
@@ -0,0 +1,377 @@
+import sqlite3
+from books import Book, restore_book
+from import_export import export_books, import_books
+from records import book_state, book_to_record
+
+
+# Схема хранилища: порядок добавления книг задается id
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    genre TEXT NOT NULL,
+    cover_type TEXT NOT NULL,
+    isbn TEXT NOT NULL UNIQUE,
+    condition INTEGER NOT NULL,
+    has_images INTEGER NOT NULL,
+    borrow_count INTEGER NOT NULL DEFAULT 0,
+    is_borrowed INTEGER NOT NULL DEFAULT 0,
+    scratches INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS books_author ON books (author);
+CREATE INDEX IF NOT EXISTS books_year ON books (year);
+CREATE INDEX IF NOT EXISTS books_title ON books (title);
+CREATE INDEX IF NOT EXISTS books_genre ON books (genre);
+CREATE INDEX IF NOT EXISTS books_condition ON books (condition);
+CREATE INDEX IF NOT EXISTS books_borrowed ON books (is_borrowed) WHERE is_borrowed;
+"""
+
+# Триграммный полнотекстовый индекс названий, приведенных к регистру (rowid - id книги).
+# Строки добавляются вместе с книгами (casefold - функция Python, в триггере ее не вызвать),
+# удаляются триггером
+TITLE_SCHEMA = """
+CREATE VIRTUAL TABLE books_title_fts USING fts5(folded, tokenize = 'trigram case_sensitive 1');
+CREATE TRIGGER IF NOT EXISTS books_title_fts_delete AFTER DELETE ON books BEGIN
+    DELETE FROM books_title_fts WHERE rowid = old.id;
+END;
+"""
+
+# Запросы - постоянные строки: sqlite3 кеширует их подготовленные выражения
+COLUMNS = 'kind, title, author, year, genre, cover_type, isbn, condition, has_images, borrow_count, is_borrowed, scratches'
+SELECT = f'SELECT {COLUMNS} FROM books'
+INSERT = f'INSERT INTO books ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+# Изменения книг записываются разницей: копии одной книги из разных поисков не затирают друг друга
+ADD_CONDITION = 'UPDATE books SET condition = max(0, min(100, condition + ?)) WHERE isbn = ?'
+ADD_SCRATCHES = 'UPDATE books SET scratches = scratches + ? WHERE isbn = ?'
+ADD_BORROW_COUNT = 'UPDATE books SET borrow_count = borrow_count + ? WHERE isbn = ?'
+# Запрос, записывающий разницу поля, по событию книги
+ADD_BY_EVENT = {'condition': ADD_CONDITION, 'scratches': ADD_SCRATCHES, 'borrow_count': ADD_BORROW_COUNT}
+BORROW_BY_ISBN = 'UPDATE books SET is_borrowed = 1, borrow_count = borrow_count + 1 WHERE isbn = ? AND NOT is_borrowed'
+BORROW_BY_TITLE = ('UPDATE books SET is_borrowed = 1, borrow_count = borrow_count + 1 WHERE id = '
+                   '(SELECT id FROM books WHERE title = ? AND NOT is_borrowed ORDER BY id LIMIT 1)')
+RETURN_BY_ISBN = 'UPDATE books SET is_borrowed = 0 WHERE isbn = ? AND is_borrowed'
+DELETE_BY_ISBN = 'DELETE FROM books WHERE isbn = ?'
+DELETE_BY_TITLE = 'DELETE FROM books WHERE id = (SELECT id FROM books WHERE title = ? ORDER BY id LIMIT 1)'
+INSERT_TITLE = 'INSERT INTO books_title_fts (rowid, folded) SELECT id, casefold(title) FROM books WHERE isbn = ?'
+FILL_TITLES = 'INSERT INTO books_title_fts (rowid, folded) SELECT id, casefold(title) FROM books'
+# Фрагмент от 3 символов - поиск по триграммному индексу, короче - перебор названий
+SEARCH_TITLE = f'{SELECT} WHERE id IN (SELECT rowid FROM books_title_fts WHERE books_title_fts MATCH ?) ORDER BY id'
+SCAN_TITLE = f'{SELECT} WHERE instr(casefold(title), ?) ORDER BY id'
+
+
+def _casefold(text: str) -> str:
+    """Приведение к нижнему регистру для поиска по подстроке (lower в SQLite - только ASCII)"""
+    return text.casefold()
+
+
+class SqliteLibrary:
+    """
+    Библиотека с хранением книг в базе SQLite (вместо объектов в памяти)
+    Интерфейс совпадает с Library. Поиск идет по индексам SQL (isbn, автор, год,
+    название, жанр, состояние), книги создаются из строк с классом по сохраненному
+    типу. Изменения книг, полученных из поиска (взятие, урон), записываются обратно
+    отдельными изменениями строки (взятие и возврат - условием, состояние и царапины -
+    разницей), поэтому изменения нескольких копий одной книги не теряются.
+    Поиск по части названия от 3 символов идет по триграммному индексу FTS5
+    (если SQLite собран без FTS5 или старше 3.34 - перебором названий).
+    Записи объединяются в транзакции по batch_size операций (commit - вручную)
+    """
+
+    def __init__(self, name: str, path: str = ':memory:', batch_size: int = 500, verbose: bool = True):
+        """
+        Инициализация библиотеки
+        Параметры:
+        name - название библиотеки
+        path - путь к файлу базы (по умолчанию - база в памяти)
+        batch_size - количество изменений в одной транзакции
+        verbose - выводить сообщения об операциях в консоль
+        """
+        self.name = name
+        self.verbose = verbose
+        self.path = path
+        self.batch_size = batch_size
+        self._connection = sqlite3.connect(path)
+        self._connection.create_function('casefold', 1, _casefold, deterministic=True)
+        if path != ':memory:':
+            self._connection.execute('PRAGMA journal_mode = WAL')
+        self._connection.executescript(SCHEMA)
+        self._title_index = self._create_title_index()  # Есть ли триграммный индекс названий
+        self._pending = 0  # Изменения в текущей незавершенной транзакции
+
+    def _create_title_index(self) -> bool:
+        """
+        Создание триграммного индекса названий, если его еще нет в базе
+        Индекс базы, созданной без него, заполняется по существующим книгам
+        Возвращает:
+        bool - индекс доступен (FTS5 с токенизатором trigram поддерживается)
+        """
+        exists = self._connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'books_title_fts'").fetchone() is not None
+        if not exists:
+            try:
+                with self._connection:
+                    self._connection.executescript(f'BEGIN; {TITLE_SCHEMA} {FILL_TITLES}; COMMIT;')
+            except sqlite3.OperationalError as error:
+                if 'fts5' not in str(error) and 'trigram' not in str(error):
+                    raise
+                return False
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Завершение транзакции и закрытие базы"""
+        self.commit()
+        self._connection.close()
+
+    def commit(self) -> None:
+        """Завершение текущей транзакции"""
+        self._connection.commit()
+        self._pending = 0
+
+    def _write(self, sql: str, params: tuple) -> int:
+        """Выполнение изменения в текущей транзакции, возвращает количество измененных строк"""
+        changed = self._connection.execute(sql, params).rowcount
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.commit()
+        return changed
+
+    def _book(self, row: tuple) -> Book:
+        """Книга из строки таблицы, изменения книги записываются в базу"""
+        book = restore_book(*row[:8], bool(row[8]), row[9], bool(row[10]), row[11])
+        book.subscribe(self._writer(book))
+        return book
+
+    def _books(self, sql: str, params: tuple = ()) -> list:
+        """Книги по запросу к таблице"""
+        return [self._book(row) for row in self._connection.execute(sql, params)]
+
+    def _writer(self, book: Book):
+        """
+        Подписчик книги, записывающий ее изменения в базу
+        Запоминает состояние, царапины и счетчик взятий этого объекта при последней
+        записи и записывает только разницу с ними
+        """
+        state = book_state(book)
+        known = {event: state[event] for event in ADD_BY_EVENT}
+
+        def on_change(book: Book, event: str) -> None:
+            if event == 'borrow':
+                # Взятие увеличивает счетчик в базе само
+                self._write(BORROW_BY_ISBN, (book.isbn,))
+                known['borrow_count'] = book.borrow_count()
+            elif event == 'return':
+                self._write(RETURN_BY_ISBN, (book.isbn,))
+            elif event in known:
+                value = book_state(book)[event]
+                self._write(ADD_BY_EVENT[event], (value - known[event], book.isbn))
+                known[event] = value
+        return on_change
+
+    @staticmethod
+    def _row(book: Book) -> tuple:
+        """Строка таблицы для книги"""
+        record = book_to_record(book)
+        return tuple(record[column] for column in COLUMNS.split(', '))
+
+    def __len__(self) -> int:
+        """Количество книг в библиотеке"""
+        return self._connection.execute('SELECT count(*) FROM books').fetchone()[0]
+
+    def __iter__(self):
+        """Итерация по книгам библиотеки в порядке добавления"""
+        for row in self._connection.execute(f'{SELECT} ORDER BY id'):
+            yield self._book(row)
+
+    def __contains__(self, isbn) -> bool:
+        """Проверка наличия книги по ISBN (или объекту Book) по индексу"""
+        if not isinstance(isbn, str):
+            isbn = isbn.isbn
+        return self._connection.execute('SELECT 1 FROM books WHERE isbn = ?', (isbn,)).fetchone() is not None
+
+    def add_book(self, book: Book) -> None:
+        """Добавление книги в библиотеку"""
+        try:
+            if self._title_index:
+                # Книга и строка индекса названий - в одной транзакции
+                self._connection.execute(INSERT, self._row(book))
+                self._write(INSERT_TITLE, (book.isbn,))
+            else:
+                self._write(INSERT, self._row(book))
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Книга с ISBN {book.isbn} уже существует") from None
+        if self.verbose:
+            print(f"    Книга '{book.title}' добавлена в библиотеку")
+
+    def add_books(self, books) -> list:
+        """
+        Пакетное добавление книг одной транзакцией
+        Возвращает:
+        list - отклоненные книги с уже существующим ISBN: (номер в пакете, ISBN)
+        """
+        rows = []
+        duplicates = []
+        seen = set()
+        added = []
+        for position, book in enumerate(books):
+            if book.isbn in seen or book.isbn in self:
+                duplicates.append((position, book.isbn))
+                continue
+            seen.add(book.isbn)
+            rows.append(self._row(book))
+            added.append(book)
+        with self._connection:
+            self._connection.executemany(INSERT, rows)
+            if self._title_index:
+                self._connection.executemany(INSERT_TITLE, ((book.isbn,) for book in added))
+        self._pending = 0
+        if self.verbose:
+            print(f"[Библиотека] Пакетное добавление: {len(self)} книг в библиотеке, "
+                  f"отклонено дубликатов ISBN: {len(duplicates)}")
+        return duplicates
+
+    def import_books(self, path: str, format: str = None, chunk_size: int = 1000) -> list:
+        """Потоковый импорт книг из файла CSV или JSONL, возвращает ошибки строк"""
+        imported, errors = import_books(self, path, format, chunk_size)
+        if self.verbose:
+            print(f"[Библиотека] Импортировано {imported} книг из {path}, ошибок: {len(errors)}")
+        return errors
+
+    def export_books(self, path: str, format: str = None) -> int:
+        """Потоковый экспорт всех книг в файл CSV или JSONL"""
+        count = export_books(self, path, format)
+        if self.verbose:
+            print(f"[Библиотека] Экспортировано {count} книг в {path}")
+        return count
+
+    def borrow_book_by_title(self, title: str) -> bool:
+        """Взятие книги по названию (первого свободного экземпляра)"""
+        return self._write(BORROW_BY_TITLE, (title,)) == 1
+
+    def borrow_book_by_isbn(self, isbn: str) -> bool:
+        """Взятие книги по ISBN"""
+        return self._write(BORROW_BY_ISBN, (isbn,)) == 1
+
+    def return_book_by_isbn(self, isbn: str) -> bool:
+        """Возврат взятой книги по ISBN"""
+        return self._write(RETURN_BY_ISBN, (isbn,)) == 1
+
+    def borrowed_books(self) -> list:
+        """Список взятых книг"""
+        return self._books(f'{SELECT} WHERE is_borrowed ORDER BY id')
+
+    def borrowed_count(self) -> int:
+        """Количество взятых книг"""
+        return self._connection.execute('SELECT count(*) FROM books WHERE is_borrowed').fetchone()[0]
+
+    def available_count(self) -> int:
+        """Количество книг, доступных для выдачи"""
+        return len(self) - self.borrowed_count()
+
+    def remove_book_by_isbn(self, isbn: str) -> bool:
+        """Удаление книги из библиотеки по ISBN"""
+        return self._write(DELETE_BY_ISBN, (isbn,)) == 1
+
+    def remove_book_by_title(self, title: str) -> bool:
+        """Удаление книги из библиотеки по названию (первого экземпляра)"""
+        return self._write(DELETE_BY_TITLE, (title,)) == 1
+
+    def search_by_isbn(self, isbn: str):
+        """Поиск книги по ISBN"""
+        row = self._connection.execute(f'{SELECT} WHERE isbn = ?', (isbn,)).fetchone()
+        result = None if row is None else self._book(row)
+        if self.verbose:
+            if result:
+                print(f"[Библиотека] Найдена книга по ISBN {isbn}: {result.title}")
+            else:
+                print(f"[Библиотека] Книга с ISBN {isbn} не найдена")
+        return result
+
+    def search_by_title(self, title: str):
+        """Поиск книги по названию"""
+        result = self._books(f'{SELECT} WHERE title = ? ORDER BY id', (title,)) or None
+        if self.verbose:
+            if result:
+                print(f"[Библиотека] Найдена книга {title}")
+            else:
+                print(f"[Библиотека] Книга {title} не найдена")
+        return result
+
+    def search_title_contains(self, fragment: str) -> list:
+        """
+        Поиск книг по части названия без учета регистра
+        Фрагмент от 3 символов ищется по триграммному индексу (фраза MATCH -
+        точное вхождение подстроки), более короткий - перебором названий
+        """
+        folded = _casefold(fragment)
+        if self._title_index and len(folded) >= 3:
+            result = self._books(SEARCH_TITLE, ('"' + folded.replace('"', '""') + '"',))
+        else:
+            result = self._books(SCAN_TITLE, (folded,))
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг, название которых содержит '{fragment}'")
+        return result
+
+    def search_by_author(self, author: str) -> list:
+        """Поиск книг по автору"""
+        result = self._books(f'{SELECT} WHERE author = ? ORDER BY id', (author,))
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг автора '{author}'")
+        return result
+
+    def search_by_year(self, year: int) -> list:
+        """Поиск книг по году издания"""
+        result = self._books(f'{SELECT} WHERE year = ? ORDER BY id', (year,))
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг {year} года")
+        return result
+
+    def search_by_year_range(self, lo: int = None, hi: int = None, reverse: bool = False) -> list:
+        """Поиск книг, изданных в диапазоне лет [lo, hi]"""
+        # Условия только для заданных границ, чтобы запрос шел по индексу года
+        conditions = ['year >= ?' if lo is not None else None, 'year <= ?' if hi is not None else None]
+        where = ' AND '.join(condition for condition in conditions if condition) or '1'
+        params = tuple(bound for bound in (lo, hi) if bound is not None)
+        order = 'DESC' if reverse else 'ASC'
+        result = self._books(f'{SELECT} WHERE {where} ORDER BY year {order}, id', params)
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг {lo}-{hi} годов")
+        return result
+
+    def search_by_genre(self, genre: str) -> list:
+        """Поиск книг по жанру"""
+        result = self._books(f'{SELECT} WHERE genre = ? ORDER BY id', (genre,))
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг жанра '{genre}'")
+        return result
+
+    def search_by_cover_type(self, cover_type: str) -> list:
+        """Поиск книг по типу обложки"""
+        result = self._books(f'{SELECT} WHERE cover_type = ? ORDER BY id', (cover_type,))
+        if self.verbose:
+            print(f"[Библиотека] Найдено {len(result)} книг с обложкой '{cover_type}'")
+        return result
+
+    def worst_condition(self, k: int) -> list:
+        """k книг в худшем состоянии (для ремонта)"""
+        result = self._books(f'{SELECT} ORDER BY condition, id LIMIT ?', (k,))
+        if self.verbose:
+            print(f"[Библиотека] Отобрано {len(result)} книг в худшем состоянии")
+        return result
+
+    def show_all_books(self) -> None:
+        """Отображение всех книг в библиотеке"""
+        print(f"\n{'='*50}")
+        print(f"БИБЛИОТЕКА: {self.name}")
+        print(f"{'='*50}")
+        print(f"\n=== Коллекция библиотеки '{self.name}' ({len(self)} книг) ===")
+        for i, book in enumerate(self):
+            print(f"{i}: {book}")
@@ -0,0 +1,261 @@
+import contextlib
+import io
+import random
+import threading
+import time
+from functools import wraps
+from concurrency import RWLock, StripedLock
+from index_dict import IndexDict
+from library import Library
+
+
+def _with_state_lock(method):
+    """Выполнение метода индексов под блокировкой состояния книг"""
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._state_lock:
+            return method(self, *args, **kwargs)
+    return locked
+
+
+def _reading(method):
+    """Выполнение метода библиотеки под блокировкой индексов на чтение"""
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._index_lock.read():
+            return method(self, *args, **kwargs)
+    return locked
+
+
+def _writing(method):
+    """Выполнение метода библиотеки под блокировкой индексов на запись"""
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._index_lock.write():
+            return method(self, *args, **kwargs)
+    return locked
+
+
+class ThreadSafeIndexDict(IndexDict):
+    """
+    Индексы для многопоточной библиотеки
+    Индексы, зависящие от состояния книг (взятые книги, состояние, битовые карты,
+    колонки), обновляются по событиям книг из разных потоков, поэтому их
+    изменение и чтение выполняются под общей блокировкой состояния
+    """
+
+    def __init__(self, columnar: bool = False, verbose: bool = True):
+        super().__init__(columnar, verbose)
+        self._state_lock = threading.RLock()
+
+    add_book = _with_state_lock(IndexDict.add_book)
+    add_books = _with_state_lock(IndexDict.add_books)
+    remove_book = _with_state_lock(IndexDict.remove_book)
+    _on_book_changed = _with_state_lock(IndexDict._on_book_changed)
+    borrowed_books = _with_state_lock(IndexDict.borrowed_books)
+    borrowed_count = _with_state_lock(IndexDict.borrowed_count)
+    worst_condition = _with_state_lock(IndexDict.worst_condition)
+    books_in_condition_band = _with_state_lock(IndexDict.books_in_condition_band)
+    condition_band_counts = _with_state_lock(IndexDict.condition_band_counts)
+    bitmap = _with_state_lock(IndexDict.bitmap)
+    all_bits = _with_state_lock(IndexDict.all_bits)
+
+    def bucket(self, field: str, value) -> dict:
+        """Корзина индекса; корзина взятых книг меняется из других потоков и копируется"""
+        with self._state_lock:
+            bucket = super().bucket(field, value)
+            return dict(bucket) if field == 'borrowed' and bucket is not None else bucket
+
+
+class ThreadSafeLibrary(Library):
+    """
+    Библиотека для работы из нескольких потоков
+    - добавление и удаление книг захватывают индексы на запись (монопольно);
+    - поиск и отчеты захватывают индексы на чтение и выполняются одновременно;
+    - взятие и возврат выполняются под блокировкой ISBN из набора StripedLock:
+      проверка «свободна ли книга» и взятие атомарны, книги с разными ISBN
+      берутся параллельно.
+    Прочие изменения книги (урон, царапины) из нескольких потоков выполняются
+    внутри with library.book_lock(isbn)
+    """
+
+    index_class = ThreadSafeIndexDict
+
+    def __init__(self, name: str, columnar: bool = False, stripes: int = 64):
+        """
+        Параметры:
+        name - название библиотеки
+        columnar - вести колоночное хранилище для быстрой аналитики
+        stripes - количество блокировок для ISBN
+        """
+        super().__init__(name, columnar)
+        self._index_lock = RWLock()
+        self._book_locks = StripedLock(stripes)
+
+    def book_lock(self, isbn: str):
+        """Блокировка изменений книги с данным ISBN"""
+        return self._book_locks.lock_for(isbn)
+
+    def __iter__(self):
+        """Итерация по снимку списка книг (коллекция может меняться из других потоков)"""
+        with self._index_lock.read():
+            return iter(list(self.index))
+
+    __len__ = _reading(Library.__len__)
+    __contains__ = _reading(Library.__contains__)
+
+    add_book = _writing(Library.add_book)
+    add_books = _writing(Library.add_books)
+    remove_book_by_isbn = _writing(Library.remove_book_by_isbn)
+    remove_book_by_title = _writing(Library.remove_book_by_title)
+
+    def borrow_book_by_isbn(self, isbn: str) -> bool:
+        """Атомарное взятие книги по ISBN: книгу получает только один поток"""
+        with self._index_lock.read():
+            book = self.index.search_by_isbn(isbn)
+            if book is None:
+                return False
+            with self.book_lock(isbn):
+                return book.borrow()
+
+    def borrow_book_by_title(self, title: str) -> bool:
+        """Атомарное взятие первого свободного экземпляра по названию"""
+        with self._index_lock.read():
+            for book in self.index.search_by_title(title) or ():
+                with self.book_lock(book.isbn):
+                    if book.borrow():
+                        return True
+            return False
+
+    def return_book_by_isbn(self, isbn: str) -> bool:
+        """Атомарный возврат взятой книги по ISBN"""
+        with self._index_lock.read():
+            book = self.index.search_by_isbn(isbn)
+            if book is None:
+                return False
+            with self.book_lock(isbn):
+                if not book.is_borrowed():
+                    return False
+                book.return_book()
+                return True
+
+    borrowed_books = _reading(Library.borrowed_books)
+    borrowed_count = _reading(Library.borrowed_count)
+    available_count = _reading(Library.available_count)
+    search_by_isbn = _reading(Library.search_by_isbn)
+    search_by_title = _reading(Library.search_by_title)
+    search_title_contains = _reading(Library.search_title_contains)
+    search_title_prefix = _reading(Library.search_title_prefix)
+    search_by_author = _reading(Library.search_by_author)
+    search_by_year = _reading(Library.search_by_year)
+    search_by_year_range = _reading(Library.search_by_year_range)
+    search_by_genre = _reading(Library.search_by_genre)
+    search_by_cover_type = _reading(Library.search_by_cover_type)
+    query = _reading(Library.query)
+    explain = _reading(Library.explain)
+    worst_condition = _reading(Library.worst_condition)
+    books_in_condition_band = _reading(Library.books_in_condition_band)
+    condition_band_counts = _reading(Library.condition_band_counts)
+    bitmap = _reading(Library.bitmap)
+    count_where = _reading(Library.count_where)
+    mean_condition_by_cover_type = _reading(Library.mean_condition_by_cover_type)
+    age_histogram = _reading(Library.age_histogram)
+    borrow_count_percentiles = _reading(Library.borrow_count_percentiles)
+    export_books = _reading(Library.export_books)
+    save_mmap = _reading(Library.save_mmap)
+    show_all_books = _reading(Library.show_all_books)
+
+
+class GlobalLockLibrary(Library):
+    """Библиотека под одной общей блокировкой - для сравнения в contention_benchmark"""
+
+    def __init__(self, name: str, columnar: bool = False):
+        self._lock = threading.RLock()
+        super().__init__(name, columnar)
+
+
+def _globally_locked(method):
+    """Выполнение метода библиотеки под общей блокировкой"""
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return locked
+
+
+for _name in ('add_book', 'add_books', 'remove_book_by_isbn', 'search_by_isbn', 'search_by_author',
+              'borrow_book_by_isbn', 'return_book_by_isbn', 'borrowed_count'):
+    setattr(GlobalLockLibrary, _name, _globally_locked(getattr(Library, _name)))
+
+
+def contention_benchmark(library_class, threads: int = 8, books: int = 5000,
+                         operations: int = 20000, read_share: float = 0.9, seed: int = 1) -> dict:
+    """
+    Нагрузочный тест библиотеки из нескольких потоков
+    Потоки выполняют поиск по ISBN и автору (доля read_share), остальное - взятие,
+    возврат, добавление и удаление книг
+    Параметры:
+    library_class - класс библиотеки (например, ThreadSafeLibrary или GlobalLockLibrary)
+    threads - количество потоков
+    books - количество книг в библиотеке
+    operations - общее количество операций
+    Возвращает:
+    dict - время, операций в секунду и проверка, что ни одна книга не выдана дважды
+    """
+    from books import SoftCover
+
+    library = library_class('Нагрузка')
+    authors = [f'Автор {number}' for number in range(50)]
+    catalog = [SoftCover.from_trusted('Книга', authors[number % 50], 2000, 'Роман', f'ISBN-{number}')
+               for number in range(books)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        library.add_books(catalog)
+    successful_borrows = [0] * threads
+    returns = [0] * threads
+    start_barrier = threading.Barrier(threads)
+
+    def worker(number: int) -> None:
+        rng = random.Random(seed + number)
+        start_barrier.wait()
+        for step in range(operations // threads):
+            roll = rng.random()
+            isbn = f'ISBN-{rng.randrange(books)}'
+            if roll < read_share / 2:
+                library.search_by_isbn(isbn)
+            elif roll < read_share:
+                library.search_by_author(rng.choice(authors))
+            elif roll < read_share + (1 - read_share) * 0.45:
+                successful_borrows[number] += library.borrow_book_by_isbn(isbn)
+            elif roll < read_share + (1 - read_share) * 0.9:
+                returns[number] += library.return_book_by_isbn(isbn)
+            else:
+                extra = f'ISBN-extra-{number}-{step}'
+                library.add_book(SoftCover.from_trusted('Книга', authors[0], 2001, 'Роман', extra))
+                library.remove_book_by_isbn(extra)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        pool = [threading.Thread(target=worker, args=(number,)) for number in range(threads)]
+        started = time.perf_counter()
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        borrowed = library.borrowed_count()
+
+    return {
+        'library': library_class.__name__,
+        'threads': threads,
+        'seconds': elapsed,
+        'ops_per_second': operations / elapsed,
+        # Каждое успешное взятие либо возвращено, либо книга числится взятой
+        'consistent': sum(successful_borrows) - sum(returns) == borrowed,
+    }
+
+
+if __name__ == '__main__':
+    for threads in (1, 4, 8):
+        for library_class in (GlobalLockLibrary, ThreadSafeLibrary):
+            result = contention_benchmark(library_class, threads=threads)
+            print(f"{result['library']:>18} потоков: {threads}  "
+                  f"{result['ops_per_second']:>10.0f} опер./с  согласованность: {result['consistent']}")
@@ -0,0 +1,175 @@
+from bisect import bisect_left
+
+
+def normalize_title(title: str) -> str:
+    """Приведение названия к единому регистру для поиска без учета регистра"""
+    return title.casefold()
+
+
+def trigrams(text: str) -> set:
+    """
+    Множество триграмм строки
+    Строки короче трёх символов индексируются целиком
+    """
+    if len(text) < 3:
+        return {text} if text else set()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def short_grams(text: str) -> set:
+    """Множество подстрок строки длиной 1 и 2 символа (для фрагментов короче триграммы)"""
+    return {text[i:i + size] for size in (1, 2) for i in range(len(text) - size + 1)}
+
+
+class TitleIndex:
+    """
+    Индекс названий для поиска по подстроке и префиксу без учета регистра
+    Поиск по подстроке использует триграммный индекс (триграмма -> множество ISBN),
+    фрагменты из 1-2 символов - отдельный индекс подстрок такой длины (без перебора
+    ключей триграмм), поиск по префиксу - отсортированный список приведенных к регистру названий.
+    Отсортированный список обновляется лениво: добавление и удаление стоят O(1)
+    (без учета длины названия), а пересортировка выполняется при поиске по префиксу
+    """
+
+    def __init__(self):
+        self._titles = {}    # Приведенные названия (ISBN -> (title, version, Book))
+        self._trigrams = {}  # Триграммный индекс (trigram -> set[ISBN])
+        self._short = {}     # Подстроки из 1-2 символов (подстрока -> set[ISBN])
+        self._sorted = []    # Отсортированный список (title, ISBN, version) для поиска по префиксу
+        self._pending = []   # Добавленные, но еще не отсортированные записи
+        self._stale = 0      # Количество устаревших записей в отсортированном списке
+        self._version = 0    # Счетчик версий для отличия повторно добавленных книг
+
+    def __len__(self) -> int:
+        """Количество проиндексированных книг"""
+        return len(self._titles)
+
+    def add(self, book) -> None:
+        """Добавление названия книги в индекс"""
+        folded = normalize_title(book.title)
+        self._version += 1
+        self._titles[book.isbn] = (folded, self._version, book)
+        self._post(folded, (book.isbn,))
+        self._pending.append((folded, book.isbn, self._version))
+
+    def add_many(self, books) -> None:
+        """
+        Пакетное добавление названий
+        Триграммы и короткие подстроки вычисляются один раз для каждого различного названия
+        """
+        by_title = {}
+        for book in books:
+            folded = normalize_title(book.title)
+            self._version += 1
+            self._titles[book.isbn] = (folded, self._version, book)
+            self._pending.append((folded, book.isbn, self._version))
+            by_title.setdefault(folded, []).append(book.isbn)
+        for folded, isbns in by_title.items():
+            self._post(folded, isbns)
+
+    def _post(self, folded: str, isbns) -> None:
+        """Добавление ISBN в списки триграмм и коротких подстрок названия"""
+        for grams, index in ((trigrams(folded), self._trigrams), (short_grams(folded), self._short)):
+            for gram in grams:
+                postings = index.get(gram)
+                if postings is None:
+                    postings = index[gram] = set()
+                postings.update(isbns)
+
+    def remove(self, book) -> None:
+        """Удаление названия книги из индекса"""
+        entry = self._titles.pop(book.isbn, None)
+        if entry is None:
+            return
+        folded = entry[0]
+        for grams, index in ((trigrams(folded), self._trigrams), (short_grams(folded), self._short)):
+            for gram in grams:
+                postings = index[gram]
+                postings.discard(book.isbn)
+                # Пустые списки удаляются из индекса
+                if not postings:
+                    del index[gram]
+        # Запись в отсортированном списке остается и пропускается при поиске
+        self._stale += 1
+
+    def _is_live(self, entry: tuple) -> bool:
+        """Актуальна ли запись отсортированного списка"""
+        current = self._titles.get(entry[1])
+        return current is not None and current[1] == entry[2]
+
+    def _refresh_sorted(self) -> None:
+        """Слияние новых записей и очистка устаревших в отсортированном списке"""
+        if self._stale > len(self._titles):
+            # Устаревших записей больше, чем живых - очищаем список
+            self._sorted = [entry for entry in self._sorted if self._is_live(entry)]
+            self._pending = [entry for entry in self._pending if self._is_live(entry)]
+            self._stale = 0
+        if self._pending:
+            # Timsort сливает уже упорядоченный список с новыми записями за O(n + p log p)
+            self._pending.sort()
+            self._sorted.extend(self._pending)
+            self._sorted.sort()
+            self._pending = []
+
+    def _candidates(self, fragment: str) -> set:
+        """ISBN книг, название которых может содержать фрагмент"""
+        if len(fragment) < 3:
+            # Короткий фрагмент - один список индекса коротких подстрок
+            return set(self._short.get(fragment, ()))
+
+        # Пересечение списков триграмм фрагмента от меньшего к большему
+        postings = []
+        for gram in trigrams(fragment):
+            if gram not in self._trigrams:
+                return set()
+            postings.append(self._trigrams[gram])
+        postings.sort(key=len)
+        result = set(postings[0])
+        for other in postings[1:]:
+            result &= other
+            if not result:
+                break
+        return result
+
+    def search_contains(self, fragment: str) -> list:
+        """
+        Поиск книг, название которых содержит фрагмент
+        Результаты упорядочены по качеству совпадения: полное совпадение,
+        совпадение с начала названия, с начала слова, затем остальные
+        """
+        fragment = normalize_title(fragment)
+        if not fragment:
+            return []
+        ranked = []
+        for isbn in self._candidates(fragment):
+            folded, _, book = self._titles[isbn]
+            # Триграммы дают кандидатов, точное вхождение проверяется отдельно
+            position = folded.find(fragment)
+            if position < 0:
+                continue
+            if folded == fragment:
+                rank = 0
+            elif position == 0:
+                rank = 1
+            elif not folded[position - 1].isalnum():
+                rank = 2
+            else:
+                rank = 3
+            ranked.append(((rank, position, len(folded), folded, isbn), book))
+        ranked.sort(key=lambda item: item[0])
+        return [book for _, book in ranked]
+
+    def search_prefix(self, prefix: str) -> list:
+        """Поиск книг, название которых начинается с префикса (по алфавиту)"""
+        prefix = normalize_title(prefix)
+        self._refresh_sorted()
+        result = []
+        position = bisect_left(self._sorted, (prefix,))
+        while position < len(self._sorted):
+            entry = self._sorted[position]
+            if not entry[0].startswith(prefix):
+                break
+            if self._is_live(entry):
+                result.append(self._titles[entry[1]][2])
+            position += 1
+        return result
@@ -0,0 +1,77 @@
+import re
+from constans import FORBIDDEN_SYMBOLS, CoverType
+
+# Регулярные выражения компилируются один раз: одна проверка строки вместо цикла по символам
+_FORBIDDEN_RE = re.compile('[' + re.escape(''.join(FORBIDDEN_SYMBOLS)) + ']')
+
+COVER_TYPES = (CoverType.HARD, CoverType.SOFT, CoverType.GLOSSY)
+
+
+def has_forbidden_symbols(text: str) -> bool:
+    """Есть ли в строке запрещенные спец. символы"""
+    return _FORBIDDEN_RE.search(text) is not None
+
+
+def has_digits(text: str) -> bool:
+    """
+    Есть ли в строке цифры (str.isdigit: в том числе надстрочные и другие
+    цифры Юникода, которых нет в классе регулярных выражений \\d)
+    """
+    return any(map(str.isdigit, text))
+
+
+def validate_book_fields(title: str, author: str, year: int, genre: str, cover_type: str,
+                         isbn: str, condition: int, checked_authors: set = None,
+                         checked_genres: set = None) -> None:
+    """
+    Проверка полей книги, при ошибке - ValueError или TypeError
+    Параметры:
+    title, author, year, genre, cover_type, isbn, condition - поля книги
+    checked_authors, checked_genres - множества уже проверенных авторов и жанров
+              для пакетной проверки: повторяющиеся значения проверяются один раз
+    """
+    # Валидация названия книги
+    if title == "" or title is None:
+        raise ValueError("название не может быть пустым")
+    if has_forbidden_symbols(title):
+        raise ValueError(f"в названии не могут содержаться спец. символы {title}")
+
+    # Валидация автора
+    if checked_authors is None or author not in checked_authors:
+        if author == "" or author is None:
+            raise ValueError("автор должен быть назван")
+        if has_forbidden_symbols(author):
+            raise ValueError(f"автор не может содержать спец. символы. Значение {author} не допустимо")
+        if checked_authors is not None:
+            checked_authors.add(author)
+
+    # Валидация года
+    if type(year) != int:
+        raise TypeError('Год должен быть числом')
+    if year < 1800 or year > 2027:
+        raise ValueError(f"год должен быть от 1800 до 2027. Получено: {year}")
+
+    # Валидация жанра
+    if checked_genres is None or genre not in checked_genres:
+        if genre == "" or genre is None:
+            raise ValueError("жанр не может быть пустым")
+        if has_digits(genre):
+            raise ValueError(f"жанр не может быть числом. Значение {genre} не допустимо")
+        if has_forbidden_symbols(genre):
+            raise ValueError(f"жанр не может содержать спец. символы. Значение {genre} не допустимо")
+        if checked_genres is not None:
+            checked_genres.add(genre)
+
+    # Валидация состояния
+    if type(condition) != int:
+        raise TypeError(f"состояние должно быть числом. Получено: {condition}")
+    if condition < 0 or condition > 100:
+        raise ValueError(f"состояние должно быть от 0 до 100. Получено: {condition}")
+
+    # Валидация типа обложки
+    if cover_type not in COVER_TYPES:
+        raise ValueError(f"неверный тип обложки: {cover_type}")
+
+    # Валидация ISBN
+    if isbn == "" or isbn is None:
+        raise ValueError("ISBN не может быть пустым")
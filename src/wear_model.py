@@ -0,0 +1,239 @@
+import random
+from books import condition_band
+from constans import CONDITION_BANDS
+from records import apply_state, book_state
+from simulation import BORROW_WEAR, DAMAGE_WEAR, wear_ranges
+
+# NumPy - необязательная зависимость: без нее доступна только модель на объектах (simulate_objects)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Коды классов книг в массиве kinds; книги других классов не изнашиваются
+KINDS = ('HardCover', 'SoftCover', 'GlossyCover')
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+NO_WEAR = len(KINDS)
+
+SCRATCH_PENALTY = 2  # Каждая царапина снижает состояние на 2 (GlossyCover.add_scratches)
+
+BAND_NAMES = [band for band, _ in CONDITION_BANDS]
+
+
+def _kind_code(book) -> int:
+    """Код класса книги или ближайшего базового класса из KINDS (NO_WEAR - износа нет)"""
+    for cls in type(book).__mro__:
+        if cls.__name__ in KIND_CODES:
+            return KIND_CODES[cls.__name__]
+    return NO_WEAR
+
+
+def simulate_objects(books: list, steps: int, borrow_rate: float = 0.05, return_rate: float = 0.2,
+                     damage_rate: float = 0.01, seed: int = None) -> None:
+    """
+    Эталонная модель износа на объектах книг (медленная, для проверки WearModel)
+    На каждом шаге (например, дне) свободная книга берется с вероятностью
+    borrow_rate с износом BORROW_WEAR, взятая возвращается с вероятностью
+    return_rate, затем любая книга повреждается с вероятностью damage_rate
+    (износ DAMAGE_WEAR). Изменения выполняются методами книг
+    """
+    rng = random.Random(seed)
+    for _ in range(steps):
+        for book in books:
+            if not book.is_borrowed():
+                if rng.random() < borrow_rate:
+                    book.borrow()
+                    _wear_object(book, BORROW_WEAR, rng)
+            elif rng.random() < return_rate:
+                book.return_book()
+            if rng.random() < damage_rate:
+                _wear_object(book, DAMAGE_WEAR, rng)
+
+
+def _wear_object(book, wear: dict, rng: random.Random) -> None:
+    """Износ одной книги по таблице wear (как simulation.apply_wear)"""
+    ranges = wear_ranges(book, wear)
+    if ranges is None:
+        return
+    damage_range, scratch_range = ranges
+    if scratch_range is not None:
+        book.add_scratches(rng.randint(*scratch_range))
+    book.damage(rng.randint(*damage_range))
+
+
+class WearModel:
+    """
+    Векторная модель износа большого количества книг на NumPy
+    Состояние, царапины, счетчики взятий и признак взятия хранятся в массивах;
+    шаг модели применяет к ним те же правила, что и simulate_objects
+    (распределения BORROW_WEAR и DAMAGE_WEAR, правила damage и add_scratches
+    классов книг), сразу ко всем книгам. Результат записывается в объекты
+    книг методом write_back
+    """
+
+    def __init__(self, books: list, borrow_rate: float = 0.05, return_rate: float = 0.2,
+                 damage_rate: float = 0.01, seed: int = None):
+        """
+        Параметры:
+        books - книги (порядок сохраняется для write_back)
+        borrow_rate - вероятность взятия свободной книги за шаг
+        return_rate - вероятность возврата взятой книги за шаг
+        damage_rate - вероятность повреждения книги за шаг
+        seed - начальное значение генератора NumPy
+        """
+        if np is None:
+            raise ImportError("для WearModel нужен NumPy (без него используйте simulate_objects)")
+        self.books = list(books)
+        self.borrow_rate = borrow_rate
+        self.return_rate = return_rate
+        self.damage_rate = damage_rate
+        self.rng = np.random.default_rng(seed)
+        states = [book_state(book) for book in self.books]
+        self.condition = np.array([state['condition'] for state in states], dtype=np.int16)
+        self.scratches = np.array([state['scratches'] for state in states], dtype=np.int32)
+        self.borrow_count = np.array([state['borrow_count'] for state in states], dtype=np.int32)
+        self.borrowed = np.array([state['is_borrowed'] for state in states], dtype=bool)
+        self.kinds = np.array([_kind_code(book) for book in self.books], dtype=np.int8)
+        self._band_codes = np.array([BAND_NAMES.index(condition_band(value)) for value in range(101)],
+                                    dtype=np.int8)
+        self.steps = 0
+
+    def __len__(self) -> int:
+        return len(self.books)
+
+    def step(self, steps: int = 1) -> None:
+        """Выполнение steps шагов модели"""
+        rng = self.rng
+        size = len(self.books)
+        for _ in range(steps):
+            # Одно случайное число на книгу: для свободной - взятие, для взятой - возврат
+            roll = rng.random(size, dtype=np.float32)
+            borrowed = self.borrowed
+            taken = ~borrowed & (roll < self.borrow_rate)
+            returned = borrowed & (roll < self.return_rate)
+            borrowed |= taken
+            borrowed &= ~returned
+            self.borrow_count += taken
+            self._wear(np.flatnonzero(taken), BORROW_WEAR)
+            self._wear(self._bernoulli_positions(size, self.damage_rate), DAMAGE_WEAR)
+        self.steps += steps
+
+    def _bernoulli_positions(self, size: int, rate: float):
+        """
+        Номера книг, с которыми событие с вероятностью rate произошло на этом шаге
+        Для редких событий номера строятся по геометрическим промежуткам между ними:
+        то же распределение, что и у независимых испытаний, но без числа на каждую книгу
+        """
+        if rate <= 0 or not size:
+            return np.empty(0, dtype=np.int64)
+        if rate >= 0.1:
+            return np.flatnonzero(self.rng.random(size, dtype=np.float32) < rate)
+        chunks = []
+        last = -1
+        expected = int(size * rate * 1.2) + 16
+        while True:
+            positions = last + np.cumsum(self.rng.geometric(rate, expected))
+            if positions[-1] >= size:
+                chunks.append(positions[positions < size])
+                return np.concatenate(chunks)
+            chunks.append(positions)
+            last = positions[-1]
+
+    def _wear(self, marked, wear: dict) -> None:
+        """Износ книг с номерами marked по таблице wear для каждого класса"""
+        if not len(marked):
+            return
+        marked_kinds = self.kinds[marked]
+        for kind, code in KIND_CODES.items():
+            ranges = wear.get(kind)
+            if ranges is None:
+                continue
+            chosen = marked[marked_kinds == code]
+            if not len(chosen):
+                continue
+            damage_range, scratch_range = ranges
+            scratches = None
+            if scratch_range is not None:
+                scratches = self.rng.integers(scratch_range[0], scratch_range[1] + 1, len(chosen))
+            damage = self.rng.integers(damage_range[0], damage_range[1] + 1, len(chosen))
+            self.apply(kind, chosen, damage, scratches)
+
+    def apply(self, kind: str, chosen, damage, scratches=None) -> None:
+        """
+        Применение заданного урона и царапин к книгам chosen класса kind
+        по правилам классов книг (как add_scratches, затем damage)
+        """
+        condition = self.condition[chosen].astype(np.int32)
+        if scratches is not None:
+            self.scratches[chosen] += scratches
+            condition = np.maximum(0, condition - SCRATCH_PENALTY * scratches)
+        if kind == 'HardCover':
+            damage = np.maximum(1, damage // 2)  # HardCover.damage: урон вдвое меньше, не меньше 1
+        self.condition[chosen] = np.maximum(0, condition - damage)
+
+    def band_counts(self) -> dict:
+        """Количество книг в каждом состоянии (как IndexDict.condition_band_counts)"""
+        counts = np.bincount(self._band_codes[self.condition], minlength=len(BAND_NAMES))
+        return {band: int(count) for band, count in zip(BAND_NAMES, counts)}
+
+    def forecast(self, steps: int, every: int = 1) -> list:
+        """
+        Прогноз износа: steps шагов с записью сводки каждые every шагов
+        Возвращает:
+        list - словари {'step', 'mean_condition', 'borrowed', 'bands'}
+        """
+        history = []
+        done = 0
+        while done < steps:
+            chunk = min(every, steps - done)
+            self.step(chunk)
+            done += chunk
+            history.append({
+                'step': self.steps,
+                'mean_condition': float(self.condition.mean()) if len(self) else None,
+                'borrowed': int(self.borrowed.sum()),
+                'bands': self.band_counts(),
+            })
+        return history
+
+    def write_back(self, books: list = None) -> int:
+        """
+        Запись состояния модели в объекты книг (все или только books из модели)
+        Изменения выполняются методом Book.set_state (records.apply_state) с событием
+        для каждого измененного поля, поэтому индексы библиотеки, колоночное хранилище,
+        журнал и SqliteLibrary видят все поля. Возвращает количество записанных книг
+        """
+        if books is None:
+            positions = range(len(self.books))
+        else:
+            wanted = {id(book) for book in books}
+            positions = [position for position, book in enumerate(self.books) if id(book) in wanted]
+        condition = self.condition.tolist()
+        scratches = self.scratches.tolist()
+        borrow_count = self.borrow_count.tolist()
+        borrowed = self.borrowed.tolist()
+        for position in positions:
+            apply_state(self.books[position], {
+                'condition': condition[position],
+                'scratches': scratches[position],
+                'borrow_count': borrow_count[position],
+                'is_borrowed': borrowed[position],
+            })
+        return len(positions)
+
+
+if __name__ == '__main__':
+    import time
+    from memory_usage import make_books
+
+    books = make_books(1000000)
+    started = time.perf_counter()
+    model = WearModel(books, seed=1)
+    loaded = time.perf_counter()
+    history = model.forecast(365, every=30)
+    finished = time.perf_counter()
+    print(f"Книг: {len(model)}, загрузка {loaded - started:.1f} с, прогноз на 365 дней {finished - loaded:.1f} с")
+    for record in history:
+        print(f"  день {record['step']:>3}: среднее состояние {record['mean_condition']:.1f}, "
+              f"взято {record['borrowed']}, {record['bands']}")
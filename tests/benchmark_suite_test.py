@@ -0,0 +1,74 @@
+from src import benchmark_suite
+from src.benchmark_suite import fit_exponent, run_suite, check_complexity, compare, BENCHMARKS
+import json
+import pytest
+
+
+@pytest.fixture
+def quick(monkeypatch):
+    """Короткие замеры для тестов"""
+    monkeypatch.setattr(benchmark_suite, 'MIN_TIME', 0.001)
+    monkeypatch.setattr(benchmark_suite, 'REPEAT', 1)
+    monkeypatch.setattr(benchmark_suite, 'MUTATIONS', 50)
+
+
+class TestBenchmarkSuite:
+    """Тесты для набора замеров производительности"""
+
+    def test_fit_exponent(self):
+        """Тест оценки степени роста на точных степенных зависимостях"""
+        sizes = [1000, 10000, 100000]
+        assert fit_exponent(sizes, [5, 5, 5]) == pytest.approx(0)
+        assert fit_exponent(sizes, [3 * size for size in sizes]) == pytest.approx(1)
+        assert fit_exponent(sizes, [size ** 2 for size in sizes]) == pytest.approx(2)
+        with pytest.raises(ValueError):
+            fit_exponent([1000, 1000], [1, 2])
+
+    def test_check_complexity(self):
+        """Тест проверки роста: квадратичный путь вместо линейного не проходит"""
+        report = {'complexity': {
+            'search': {'exponent': 1.4, 'expected': 1},
+            'remove': {'exponent': 1.1, 'expected': 0},
+            'lookup': {'exponent': 0.1, 'expected': 0},
+        }}
+        assert check_complexity(report) == [('remove', 1.1, 0)]
+        assert [name for name, _, _ in check_complexity(report, tolerance=0.2)] == ['search', 'remove']
+
+    def test_compare(self):
+        """Тест сравнения с базовой линией: замедление выше порога, новые замеры пропускаются"""
+        baseline = {'results': {'add_book': {'1000': 100.0, '10000': 100.0}}}
+        report = {'results': {
+            'add_book': {'1000': 120.0, '10000': 130.0},
+            'search_by_isbn': {'1000': 50.0},
+        }}
+        assert compare(report, baseline) == [('add_book', '10000', 100.0, 130.0)]
+        assert compare(report, baseline, threshold=0.1) == [('add_book', '1000', 100.0, 120.0),
+                                                             ('add_book', '10000', 100.0, 130.0)]
+
+    def test_run_suite(self, quick, tmp_path):
+        """Тест прогона всех замеров на маленьких библиотеках и сохранения в JSON"""
+        report = run_suite((200, 800))
+        assert set(report['results']) == set(BENCHMARKS)
+        assert all(set(by_size) == {'200', '800'} and all(value > 0 for value in by_size.values())
+                   for by_size in report['results'].values())
+        assert report['complexity']['search_by_isbn']['expected'] == 0
+        path = tmp_path / 'baseline.json'
+        path.write_text(json.dumps(report), encoding='utf-8')
+        assert compare(report, json.loads(path.read_text(encoding='utf-8'))) == []
+
+    def test_main(self, quick, tmp_path, capsys):
+        """Тест запуска из командной строки: сохранение отчета и регрессия относительно базовой линии"""
+        output = tmp_path / 'report.json'
+        code = benchmark_suite.main(['--sizes', '300', '--only', 'search_by_isbn', 'add_book',
+                                     '--output', str(output)])
+        assert code == 0
+        report = json.loads(output.read_text(encoding='utf-8'))
+        assert set(report['results']) == {'search_by_isbn', 'add_book'}
+        # Базовая линия в тысячу раз быстрее - замедление обнаруживается
+        for by_size in report['results'].values():
+            for size in by_size:
+                by_size[size] /= 1000
+        output.write_text(json.dumps(report), encoding='utf-8')
+        code = benchmark_suite.main(['--sizes', '300', '--only', 'search_by_isbn', '--baseline', str(output)])
+        assert code == 1
+        assert 'search_by_isbn (300 книг)' in capsys.readouterr().out
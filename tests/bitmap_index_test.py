@@ -0,0 +1,78 @@
+from src.books import Book, HardCover, SoftCover, GlossyCover
+from src.bitmap_index import Bitset, BitmapIndex, iter_bits
+from src.library import Library
+from src.constans import *
+import pytest
+
+
+def make_library() -> Library:
+    """Библиотека с книгами разных обложек, жанров и состояний"""
+    library = Library('Библиотека')
+    library.add_book(GlossyCover('Атлас невидимых городов', 'Редакция журнала', 2010, 'Журнал', 'ISBN-501', 60, True))
+    library.add_book(GlossyCover('Код города', 'Редакция журнала', 2011, 'Журнал', 'ISBN-502', 60, False))
+    library.add_book(GlossyCover('Химия эмоций', 'Редакция журнала', 2012, 'Альбом', 'ISBN-503', 95, True))
+    library.add_book(SoftCover('Между двух ветров', 'Сара Бен', 2001, 'Роман', 'ISBN-504', 50, True))
+    library.add_book(HardCover('Голос из прошлого', 'Чжан Ли', 2005, 'Роман', 'ISBN-505', 10))
+    return library
+
+
+class TestBitset:
+    """Тесты для класса Bitset (битовая карта)"""
+
+    def test_add_discard_contains(self):
+        """Тест установки и сброса битов"""
+        bits = Bitset()
+        for bit in [0, 3, 9, 100]:
+            bits.add(bit)
+        assert 9 in bits and 100 in bits
+        assert 8 not in bits and 1000 not in bits
+        assert bits.value == (1 << 0) | (1 << 3) | (1 << 9) | (1 << 100)
+
+        bits.discard(9)
+        bits.discard(500)  # Сброс отсутствующего бита ничего не делает
+        assert 9 not in bits
+        assert list(iter_bits(bits.value)) == [0, 3, 100]
+
+
+class TestBitmapIndex:
+    """Тесты для битовых индексов библиотеки"""
+
+    def test_combinations_and_counts(self):
+        """Тест комбинаций И/ИЛИ/НЕ и подсчета"""
+        library = make_library()
+        glossy = library.bitmap('cover_type', CoverType.GLOSSY)
+        illustrated = library.bitmap('has_images', True)
+        worn = library.bitmap('condition_band', 'Поношенная')
+
+        assert (glossy & illustrated & worn).count() == 1
+        assert [book.isbn for book in glossy & illustrated & worn] == ['ISBN-501']
+        assert (glossy | worn).count() == 4
+        assert (~glossy).count() == 2
+        assert [book.isbn for book in glossy - illustrated] == ['ISBN-502']
+        assert library.count_where(genre='Роман', has_images=True) == 1
+        assert library.count_where() == 5
+
+    def test_index_follows_changes(self):
+        """Тест обновления битовых индексов при изменении состояния и удалении"""
+        library = make_library()
+        library.search_by_isbn('ISBN-503').damage(40)  # 95 -> 55
+
+        assert library.count_where(cover_type=CoverType.GLOSSY, condition_band='Поношенная') == 3
+        assert library.count_where(condition_band='Как новая') == 0
+
+        library.remove_book_by_isbn('ISBN-501')
+        assert library.count_where(cover_type=CoverType.GLOSSY) == 2
+        assert (~library.bitmap('cover_type', CoverType.GLOSSY)).count() == 2
+
+        # Освободившийся идентификатор используется повторно
+        book = SoftCover('Код города', 'Сара Бен', 2020, 'Роман', 'ISBN-506')
+        library.add_book(book)
+        assert library.index._book_ids['ISBN-506'] == 0
+        assert library.bitmap('genre', 'Роман').books() == [book, library.search_by_isbn('ISBN-504'),
+                                                           library.search_by_isbn('ISBN-505')]
+
+    def test_unknown_field(self):
+        """Тест ошибки для поля без битового индекса"""
+        library = make_library()
+        with pytest.raises(ValueError):
+            library.bitmap('author', 'Чжан Ли')
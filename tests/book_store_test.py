@@ -0,0 +1,106 @@
+from src.books import Book, HardCover, SoftCover, GlossyCover
+from src.library import Library
+from src.constans import *
+import src.book_store as book_store
+from src.book_store import ColumnarBookStore, percentile
+import pytest
+
+
+def make_store() -> ColumnarBookStore:
+    """Колоночное хранилище с набором книг"""
+    store = ColumnarBookStore()
+    books = [
+        HardCover('Химия эмоций', 'Чжан Ли', 2001, 'Роман', 'ISBN-601', 60),       # 80 с бонусом
+        HardCover('Код города', 'Чжан Ли', 1995, 'Роман', 'ISBN-602', 40),         # 60 с бонусом
+        SoftCover('Между двух ветров', 'Сара Бен', 1980, 'Роман', 'ISBN-603', 50),
+        GlossyCover('Атлас невидимых городов', 'Редакция журнала', 2019, 'Журнал', 'ISBN-604', 90),
+    ]
+    for book_id, book in enumerate(books):
+        for _ in range(book_id * 3):
+            book.borrow()
+            book.return_book()
+        store.set_row(book_id, book)
+    return store
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def backend(request, monkeypatch):
+    """Проверка агрегатов с NumPy и без него"""
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(book_store, 'np', None)
+    return request.param
+
+
+class TestColumnarBookStore:
+    """Тесты для колоночного хранилища ColumnarBookStore"""
+
+    def test_rows(self):
+        """Тест представления строк"""
+        store = make_store()
+        row = store.row(2)
+        assert row.year == 1980
+        assert row.condition == 50
+        assert row.cover_type == CoverType.SOFT
+        assert row.borrow_count == 6
+        assert row.get_age(2020) == 40
+
+        store.clear_row(2)
+        assert len(store) == 3
+        with pytest.raises(KeyError):
+            store.row(2)
+        assert [row.book_id for row in store.rows()] == [0, 1, 3]
+
+    def test_mean_condition_by_cover_type(self, backend):
+        """Тест среднего состояния по типам обложки"""
+        store = make_store()
+        assert store.mean_condition_by_cover_type() == {
+            CoverType.HARD: 70, CoverType.SOFT: 50, CoverType.GLOSSY: 90}
+
+    def test_age_histogram(self, backend):
+        """Тест гистограммы возраста"""
+        store = make_store()
+        # Возраст: 19, 25, 40, 1
+        assert store.age_histogram(10, 2020) == [(0, 9, 1), (10, 19, 1), (20, 29, 1), (30, 39, 0), (40, 49, 1)]
+
+    def test_borrow_count_percentiles(self, backend):
+        """Тест перцентилей количества взятий"""
+        store = make_store()
+        # Количество взятий: 0, 3, 6, 9
+        assert store.borrow_count_percentiles((0, 50, 100)) == {0: 0.0, 50: 4.5, 100: 9.0}
+        store.clear_row(3)
+        assert store.borrow_count_percentiles((50,)) == {50: 3.0}
+
+    def test_percentile_empty(self):
+        """Тест перцентиля пустой выборки"""
+        with pytest.raises(ValueError):
+            percentile([], 50)
+
+
+class TestLibraryAnalytics:
+    """Тесты аналитики библиотеки поверх колоночного хранилища"""
+
+    def test_columnar_library_follows_changes(self):
+        """Тест синхронизации колонок с изменениями книг"""
+        library = Library('Библиотека', columnar=True)
+        book1 = SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-611', 80)
+        book2 = SoftCover('Химия эмоций', 'Чжан Ли', 2010, 'Роман', 'ISBN-612', 40)
+        library.add_book(book1)
+        library.add_book(book2)
+
+        book1.damage(20)
+        library.borrow_book_by_isbn('ISBN-612')
+        assert library.mean_condition_by_cover_type() == {CoverType.SOFT: 50}
+        assert library.borrow_count_percentiles((100,)) == {100: 1.0}
+
+        library.remove_book_by_isbn('ISBN-612')
+        assert library.mean_condition_by_cover_type() == {CoverType.SOFT: 60}
+        assert library.age_histogram(10, 2021) == [(20, 29, 1)]
+
+    def test_analytics_without_columnar_store(self):
+        """Тест аналитики без постоянного колоночного хранилища"""
+        library = Library('Библиотека')
+        library.add_book(SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-613', 80))
+        assert library.index.columns is None
+        assert library.mean_condition_by_cover_type() == {CoverType.SOFT: 80}
@@ -1,4 +1,5 @@
-from src.books import Book, HardCover, SoftCover, GlossyCover
+from src.books import Book, HardCover, SoftCover, GlossyCover, condition_band_bounds
+from src.memory_usage import measure_book_memory
 from src.books_collection import BookCollection
 from src.library import Library
 from src.index_dict import IndexDict
@@ -123,4 +124,86 @@ class TestBook:
         # Проверка, что важная информация присутствует в строковом представлении
         assert 'Война и мир' in repr_str
         assert 'Толстой' in repr_str
-        assert 'ISBN-015' in repr_str
\ No newline at end of file
+        assert 'ISBN-015' in repr_str
+    def test_book_observers(self):
+        """Тест оповещения подписчиков о взятии и возврате книги"""
+        book = Book('Название', 'Автор', 2000, 'Жанр', CoverType.SOFT, 'ISBN-016')
+        events = []
+        callback = lambda changed, event: events.append((changed.isbn, event))
+        book.subscribe(callback)
+
+        book.borrow()
+        book.borrow()  # Повторное взятие не меняет состояние - без оповещения
+        book.return_book()
+        book.return_book()
+        assert events == [('ISBN-016', 'borrow'), ('ISBN-016', 'return')]
+
+        book.unsubscribe(callback)
+        book.borrow()
+        assert len(events) == 2
+
+    def test_condition_bands(self):
+        """Тест текстового описания состояния на границах диапазонов"""
+        book = Book('Название', 'Автор', 2000, 'Жанр', CoverType.SOFT, 'ISBN-017', 91)
+        expected = [(91, "Как новая"), (90, "Хорошая"), (71, "Хорошая"), (70, "Поношенная"),
+                    (41, "Поношенная"), (40, "Сильно изношенная"), (16, "Сильно изношенная"),
+                    (15, "Аварийное состояние"), (0, "Аварийное состояние")]
+        for condition, band in expected:
+            book.condition = condition
+            assert book.get_condition() == band
+            lo, hi = condition_band_bounds(band)
+            assert lo <= condition <= hi
+
+    def test_book_has_no_instance_dict(self):
+        """Тест компактного представления книг через __slots__"""
+        books = [Book('Название', 'Автор', 2000, 'Жанр', CoverType.SOFT, 'ISBN-018'),
+                 HardCover('Название', 'Автор', 2000, 'Жанр', 'ISBN-019'),
+                 SoftCover('Название', 'Автор', 2000, 'Жанр', 'ISBN-020'),
+                 GlossyCover('Название', 'Автор', 2000, 'Жанр', 'ISBN-021')]
+        for book in books:
+            assert not hasattr(book, '__dict__')
+            with pytest.raises(AttributeError):
+                book.publisher = 'Издательство'
+
+    def test_repeated_strings_are_interned(self):
+        """Тест интернирования повторяющихся строк (автор, жанр, тип обложки)"""
+        author = ''.join(['Редакция', ' журнала'])
+        genre = ''.join(['Жур', 'нал'])
+        book1 = GlossyCover('Название', author, 2000, genre, 'ISBN-022')
+        book2 = GlossyCover('Название', 'Редакция журнала', 2000, 'Журнал', 'ISBN-023')
+        assert book1.author is book2.author
+        assert book1.genre is book2.genre
+        assert book1.cover_type is book2.cover_type
+
+    def test_memory_per_book(self):
+        """Тест объема памяти на книгу"""
+        assert measure_book_memory(2000) < 450
+
+    def test_from_trusted_skips_validation(self):
+        """Тест создания книги из проверенных данных без валидации"""
+        book = HardCover.from_trusted('Название', 'Автор', 2000, 'Жанр', 'ISBN-024', 50)
+        assert isinstance(book, HardCover)
+        assert book.condition == 70  # Поведение подкласса сохраняется (бонус твердой обложки)
+
+        # Проверка действительно пропускается
+        book = Book.from_trusted('Назв@ние', 'Автор', 2000, 'Жанр', CoverType.SOFT, 'ISBN-025')
+        assert book.title == 'Назв@ние'
+
+    def test_validate_many(self):
+        """Тест пакетной проверки строк с отчетом об ошибках"""
+        rows = [
+            ('Химия эмоций', 'Чжан Ли', 2010, 'Роман', 'ISBN-026'),
+            ('Код города', 'Чжан Ли', 1700, 'Роман', 'ISBN-027'),
+            {'title': 'Атлас', 'author': 'Сара Бен', 'year': 2000, 'genre': 'Роман', 'isbn': 'ISBN-028', 'condition': 40},
+            ('Без ISBN', 'Сара Бен', 2000),
+        ]
+        books, errors = SoftCover.validate_many(rows)
+        assert [book.isbn for book in books] == ['ISBN-026', 'ISBN-028']
+        assert all(isinstance(book, SoftCover) for book in books)
+        assert books[1].condition == 40
+        assert [number for number, _ in errors] == [1, 3]
+        assert isinstance(errors[0][1], ValueError)
+        assert isinstance(errors[1][1], TypeError)
+
+        books, errors = Book.validate_many([('Химия эмоций', 'Чжан Ли', 2010, 'Роман', 'Кожаная', 'ISBN-029')])
+        assert books == [] and "неверный тип обложки" in str(errors[0][1])
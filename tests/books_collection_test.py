@@ -3,6 +3,7 @@ from src.books_collection import BookCollection
 from src.library import Library
 from src.index_dict import IndexDict
 from src.constans import *
+import pytest
 
 class TestBookCollection:
     """Тесты для класса BookCollection (коллекция книг)"""
@@ -71,4 +72,49 @@ class TestBookCollection:
         
         # Проверка, что обе книги присутствуют в списке
         assert book1 in books
-        assert book2 in books
\ No newline at end of file
+        assert book2 in books
+    def test_collection_lookup_by_isbn_and_position(self):
+        """Тест проверки принадлежности по ISBN и доступа по порядковому номеру"""
+        collection = BookCollection('Коллекция')
+        book1 = Book('Химия эмоций', 'Ана Мария Дуарте', 2010, 'Жанр', CoverType.HARD, 'ISBN-027')
+        book2 = Book('Код города', 'Сара Бен', 2015, 'Жанр', CoverType.SOFT, 'ISBN-028')
+        collection.add_book(book1)
+        collection.add_book(book2)
+
+        assert 'ISBN-027' in collection
+        assert 'ISBN-029' not in collection
+        assert collection[0] is book1
+        assert collection[-1] is book2
+        assert collection[0:2] == [book1, book2]
+
+        # Удаление по ISBN
+        assert collection.remove_by_isbn('ISBN-027') == True
+        assert collection.remove_by_isbn('ISBN-027') == False
+        assert collection[0] is book2
+
+    def test_collection_as_view(self):
+        """Тест коллекции как представления общего хранилища"""
+        store = {}
+        collection = BookCollection('Представление', store)
+        book = Book('Химия эмоций', 'Ана Мария Дуарте', 2010, 'Жанр', CoverType.HARD, 'ISBN-030')
+        store[book.isbn] = book
+
+        assert len(collection) == 1
+        assert book in collection
+
+    def test_view_is_read_only(self):
+        """Тест представления хранилища библиотеки: изменения только через библиотеку"""
+        library = Library('Библиотека', verbose=False)
+        book = SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-031')
+        library.add_book(book)
+        view = library.book_collection
+
+        for change in (lambda: view.add_book(SoftCover('Книга', 'Автор', 2000, 'Роман', 'ISBN-032')),
+                       lambda: view.remove_by_isbn('ISBN-031'),
+                       lambda: view.remove_by_title('Код города')):
+            with pytest.raises(TypeError):
+                change()
+        # Хранилище и индексы не изменились
+        assert view[0] is book
+        assert library.search_by_author('Сара Бен') == [book]
+        assert 'ISBN-032' not in library
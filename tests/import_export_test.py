@@ -0,0 +1,85 @@
+from src.books import Book, HardCover, SoftCover, GlossyCover
+from src.library import Library
+from src.sqlite_library import SqliteLibrary
+from src.import_export import export_books, import_books, parse_book, read_records
+from src.constans import *
+import pytest
+
+
+def make_library():
+    """Библиотека с книгами всех классов и измененным состоянием"""
+    library = Library('Библиотека')
+    library.add_book(HardCover('Химия эмоций', 'Чжан Ли', 1995, 'Роман', 'ISBN-701', 50))
+    library.add_book(SoftCover('Код города, том 2', 'Сара Бен', 2001, 'Роман', 'ISBN-702'))
+    library.add_book(GlossyCover('Атлас "невидимых" городов', 'Редакция журнала', 2010, 'Журнал', 'ISBN-703'))
+    library.add_book(Book('Дневник алхимика', 'Чжан Ли', 2001, 'Жанр', CoverType.HARD, 'ISBN-704', 46))
+    library.borrow_book_by_isbn('ISBN-702')
+    library.search_by_isbn('ISBN-703').add_scratches(3)
+    return library
+
+
+def state(library):
+    """Полное состояние книг библиотеки для сравнения"""
+    return [(type(book).__name__, book.title, book.isbn, book.cover_type, book.condition,
+             book.has_images, book.is_borrowed(), book.borrow_count(), getattr(book, '_scratches', 0))
+            for book in library]
+
+
+class TestImportExport:
+    """Тесты для потокового импорта и экспорта книг"""
+
+    @pytest.mark.parametrize('format', ['csv', 'jsonl'])
+    def test_round_trip(self, tmp_path, format):
+        """Тест экспорта и импорта с точным восстановлением книг"""
+        library = make_library()
+        path = str(tmp_path / f'books.{format}')
+        assert library.export_books(path) == 4
+
+        restored = Library('Копия')
+        assert restored.import_books(path, chunk_size=3) == []
+        assert state(restored) == state(library)
+        assert restored.borrowed_books()[0].isbn == 'ISBN-702'
+
+        # Тот же файл загружается в хранилище SQLite
+        with SqliteLibrary('Копия') as sqlite_library:
+            assert sqlite_library.import_books(path) == []
+            assert state(sqlite_library) == state(library)
+
+    def test_row_errors(self, tmp_path):
+        """Тест ошибок отдельных строк: остальные строки импортируются"""
+        path = tmp_path / 'books.csv'
+        path.write_text(
+            'title,author,year,genre,cover_type,isbn,condition\n'
+            'Химия эмоций,Чжан Ли,1995,Роман,Твёрдая,ISBN-710,50\n'
+            'Код города,Сара Бен,год,Роман,Мягкая,ISBN-711,\n'
+            'Атлас,Редакция журнала,2010,Журнал,Глянцевая,ISBN-712,150\n'
+            'Код города,Сара Бен,2001,Роман,Мягкая,ISBN-710,\n'
+            'Между двух ветров,Сара Бен,2011,Роман,Мягкая,ISBN-713,\n', encoding='utf-8')
+        library = Library('Библиотека')
+        errors = library.import_books(str(path), chunk_size=2)
+
+        assert [number for number, _ in errors] == [3, 4, 5]
+        assert 'ISBN-710' in errors[2][1]
+        assert [book.isbn for book in library] == ['ISBN-710', 'ISBN-713']
+        # Класс по типу обложки, состояние из файла без бонуса твердой обложки
+        hard = library.search_by_isbn('ISBN-710')
+        assert type(hard).__name__ == 'HardCover' and hard.condition == 50
+        assert library.search_by_isbn('ISBN-713').condition == 100
+
+    def test_jsonl_parse_errors_and_formats(self, tmp_path):
+        """Тест неразбираемых строк JSONL и неизвестного формата"""
+        path = tmp_path / 'books.jsonl'
+        path.write_text('{"title": "Код города", "author": "Сара Бен", "year": 2001, "genre": "Роман", '
+                        '"cover_type": "Мягкая", "isbn": "ISBN-720"}\n'
+                        '\n'
+                        '{"title": "обрыв\n'
+                        '[1, 2]\n', encoding='utf-8')
+        library = Library('Библиотека')
+        imported, errors = import_books(library, str(path))
+        assert imported == 1
+        assert [number for number, _ in errors] == [3, 4]
+
+        with pytest.raises(ValueError):
+            export_books(library, str(tmp_path / 'books.xml'))
+        with pytest.raises(ValueError):
+            list(read_records(str(path), 'xml'))
@@ -0,0 +1,138 @@
+from src.books import Book, HardCover, SoftCover, GlossyCover
+from src.books_collection import BookCollection
+from src.library import Library
+from src.index_dict import IndexDict
+from src.constans import *
+
+
+class TestIndexDict:
+    """Тесты для класса IndexDict (индексы для поиска книг)"""
+
+    def test_genre_and_cover_type_indexes(self):
+        """Тест индексов по жанру и типу обложки"""
+        index = IndexDict()
+        book1 = HardCover('Химия эмоций', 'Чжан Ли', 2010, 'Роман', 'ISBN-101')
+        book2 = SoftCover('Код города', 'Сара Бен', 2015, 'Роман', 'ISBN-102')
+        book3 = GlossyCover('Атлас невидимых городов', 'Редакция журнала', 2020, 'Журнал', 'ISBN-103')
+
+        index.add_book(book1)
+        index.add_book(book2)
+        index.add_book(book3)
+
+        # Поиск по жанру
+        assert index.search_by_genre('Роман') == [book1, book2]
+        assert index.search_by_genre('Детектив') == []
+
+        # Поиск по типу обложки
+        assert index.search_by_cover_type(CoverType.GLOSSY) == [book3]
+        assert index.search_by_cover_type(CoverType.HARD) == [book1]
+
+        # Поиск по наличию иллюстраций (у глянцевой обложки по умолчанию есть)
+        assert index.search_by_has_images(True) == [book3]
+        assert index.search_by_has_images(False) == [book1, book2]
+
+    def test_remove_book_updates_new_indexes(self):
+        """Тест удаления книги из индексов по жанру, обложке и иллюстрациям"""
+        index = IndexDict()
+        book = SoftCover('Код города', 'Сара Бен', 2015, 'Роман', 'ISBN-104', 100, True)
+        index.add_book(book)
+
+        assert index.remove_book('ISBN-104') == True
+
+        # Пустые корзины удаляются из индексов
+        assert index.search_by_genre('Роман') == []
+        assert index.search_by_cover_type(CoverType.SOFT) == []
+        assert index.search_by_has_images(True) == []
+        assert 'Роман' not in index._genre_index
+
+    def test_search_by_year_range(self):
+        """Тест поиска книг по диапазону лет"""
+        index = IndexDict()
+        books = [SoftCover('Код города', 'Сара Бен', year, 'Роман', f'ISBN-2{year}') for year in [2005, 1985, 1995, 1990, 2015]]
+        for book in books:
+            index.add_book(book)
+
+        found = index.search_by_year_range(1990, 2005)
+        assert [book.year for book in found] == [1990, 1995, 2005]
+
+        found = index.search_by_year_range(1990, 2005, reverse=True)
+        assert [book.year for book in found] == [2005, 1995, 1990]
+
+        # Итерация по всем книгам в порядке года
+        assert [book.year for book in index.iter_by_year()] == [1985, 1990, 1995, 2005, 2015]
+
+        # После удаления книга пропадает из диапазона
+        index.remove_book('ISBN-21995')
+        assert [book.year for book in index.search_by_year_range(1990, 2005)] == [1990, 2005]
+
+    def test_order_preserved_after_removal(self):
+        """Тест сохранения порядка добавления в индексах после удаления"""
+        index = IndexDict()
+        books = [SoftCover('Код города', 'Сара Бен', 2001, 'Роман', f'ISBN-3{i:02d}') for i in range(6)]
+        for book in books:
+            index.add_book(book)
+
+        index.remove_book('ISBN-302')
+        index.remove_book('ISBN-304')
+
+        expected = [books[0], books[1], books[3], books[5]]
+        assert list(index) == expected
+        assert index.search_by_author('Сара Бен') == expected
+        assert index.search_by_year(2001) == expected
+        assert index.search_by_title('Код города') == expected
+        assert len(index) == 4
+
+    def test_readd_after_removal(self):
+        """Тест повторного добавления книги с тем же ISBN после удаления"""
+        index = IndexDict()
+        book = SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-310')
+        index.add_book(book)
+        index.remove_book('ISBN-310')
+
+        # Индекс по точному названию очищается при удалении
+        assert index.search_by_title('Код города') is None
+
+        renamed = SoftCover('Химия эмоций', 'Сара Бен', 2001, 'Роман', 'ISBN-310')
+        index.add_book(renamed)
+        assert index.search_title_prefix('код') == []
+        assert index.search_title_prefix('хим') == [renamed]
+        assert index['ISBN-310'] is renamed
+        assert index['Сара Бен'] == [renamed]
+
+    def test_add_books_bulk(self, capsys):
+        """Тест пакетного добавления: дубликаты отклоняются, все индексы строятся"""
+        index = IndexDict()
+        existing = SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-320')
+        index.add_book(existing)
+        capsys.readouterr()
+
+        hard = HardCover('Химия эмоций', 'Чжан Ли', 1995, 'Роман', 'ISBN-321', 20)
+        glossy = GlossyCover('Атлас невидимых городов', 'Редакция журнала', 2010, 'Журнал', 'ISBN-322', 90)
+        glossy.borrow()
+        duplicate = SoftCover('Другая книга', 'Сара Бен', 2001, 'Роман', 'ISBN-320')
+        in_batch = SoftCover('Еще одна', 'Сара Бен', 2001, 'Роман', 'ISBN-321')
+        duplicates = index.add_books([hard, duplicate, glossy, in_batch])
+
+        # Отклонены книга с ISBN из индекса и повтор внутри пакета
+        assert duplicates == [(1, 'ISBN-320'), (3, 'ISBN-321')]
+        assert index['ISBN-320'] is existing
+        assert index['ISBN-321'] is hard
+        assert len(index) == 3
+        # Сообщения на каждую книгу не выводятся
+        assert capsys.readouterr().out == ''
+
+        assert index.search_by_author('Чжан Ли') == [hard]
+        assert index.search_by_genre('Журнал') == [glossy]
+        assert index.search_by_year_range(1990, 2005) == [hard, existing]
+        assert index.search_title_prefix('атлас') == [glossy]
+        assert index.search_title_contains('ХИМИЯ') == [hard]
+        assert index.borrowed_books() == [glossy]
+        assert index.worst_condition(1) == [hard]
+        assert index.bitmap('cover_type', CoverType.GLOSSY).books() == [glossy]
+
+        # Книги из пакета отслеживаются так же, как добавленные по одной
+        hard.update_condition(70)
+        assert index.worst_condition(1) == [glossy]
+        index.remove_book('ISBN-322')
+        assert index.borrowed_books() == []
+        assert index.bitmap('cover_type', CoverType.GLOSSY).count() == 0
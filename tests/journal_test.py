@@ -0,0 +1,210 @@
+from src.books import Book, HardCover, SoftCover, GlossyCover
+from src.library import Library
+from src.journal import Journal
+from src.records import apply_state, book_state
+from src.constans import *
+import json
+import os
+import pytest
+
+
+def fill(library):
+    """Операции всех видов над библиотекой"""
+    hard = HardCover('Химия эмоций', 'Чжан Ли', 1995, 'Роман', 'ISBN-501', 50)
+    soft = SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-502')
+    glossy = GlossyCover('Атлас невидимых городов', 'Редакция журнала', 2010, 'Журнал', 'ISBN-503')
+    library.add_book(hard)
+    library.add_books([soft, glossy])
+    library.borrow_book_by_isbn('ISBN-502')
+    library.return_book_by_isbn('ISBN-502')
+    soft.borrow()
+    hard.damage(10)
+    glossy.add_scratches(2)
+    library.remove_book_by_isbn('ISBN-501')
+
+
+def state(library):
+    """Полное состояние книг библиотеки для сравнения"""
+    return [(type(book).__name__, book.isbn, book.condition, book.is_borrowed(),
+             book.borrow_count(), getattr(book, '_scratches', 0)) for book in library]
+
+
+class TestJournal:
+    """Тесты для журнала операций Journal"""
+
+    def test_replay_after_restart(self, tmp_path):
+        """Тест восстановления всех операций из журнала"""
+        library = Library('Библиотека')
+        journal = library.attach_journal(str(tmp_path), sync_every=4)
+        fill(library)
+        expected = state(library)
+        journal.close()
+
+        restored = Library('Библиотека')
+        restored.attach_journal(str(tmp_path))
+        assert state(restored) == expected
+        assert restored.borrowed_books()[0].isbn == 'ISBN-502'
+        assert restored.worst_condition(1)[0].isbn == 'ISBN-503'
+
+        # Восстановленная библиотека продолжает вести журнал
+        restored.borrow_book_by_isbn('ISBN-503')
+        restored.journal.close()
+        again = Library('Библиотека')
+        again.attach_journal(str(tmp_path))
+        assert again.search_by_isbn('ISBN-503').is_borrowed()
+
+    def test_scratches_at_zero_condition(self, tmp_path):
+        """Тест царапин книги в состоянии 0: состояние не меняется, но царапины записываются"""
+        library = Library('Библиотека', verbose=False)
+        journal = library.attach_journal(str(tmp_path))
+        glossy = GlossyCover('Атлас невидимых городов', 'Редакция журнала', 2010, 'Журнал', 'ISBN-503')
+        library.add_book(glossy)
+        glossy.damage(100)
+        glossy.add_scratches(3)
+        assert glossy.condition == 0 and glossy._scratches == 3
+        journal.close()
+
+        restored = Library('Библиотека', verbose=False)
+        restored.attach_journal(str(tmp_path))
+        assert restored.search_by_isbn('ISBN-503')._scratches == 3
+
+    def test_apply_state_is_journaled(self, tmp_path):
+        """Тест apply_state: изменение только царапин или только счетчика взятий записывается"""
+        library = Library('Библиотека', verbose=False)
+        journal = library.attach_journal(str(tmp_path))
+        glossy = GlossyCover('Атлас невидимых городов', 'Редакция журнала', 2010, 'Журнал', 'ISBN-503')
+        soft = SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-502')
+        library.add_books([glossy, soft])
+        events = []
+        library.index.subscribe(lambda book, event: events.append((book.isbn, event)))
+        apply_state(glossy, {**book_state(glossy), 'scratches': 7})
+        apply_state(soft, {**book_state(soft), 'borrow_count': 5})
+        apply_state(soft, {**book_state(soft), 'borrow_count': 6, 'is_borrowed': True})
+        assert events == [('ISBN-503', 'scratches'), ('ISBN-502', 'borrow_count'), ('ISBN-502', 'borrow')]
+        # Повторное применение того же состояния ничего не меняет
+        apply_state(soft, book_state(soft))
+        assert len(events) == 3
+        journal.close()
+
+        restored = Library('Библиотека', verbose=False)
+        restored.attach_journal(str(tmp_path))
+        assert restored.search_by_isbn('ISBN-503')._scratches == 7
+        restored_soft = restored.search_by_isbn('ISBN-502')
+        assert restored_soft.borrow_count() == 6 and restored_soft.is_borrowed()
+        assert restored.borrowed_books() == [restored_soft]
+
+    def test_compaction(self, tmp_path):
+        """Тест снимка: журнал очищается, восстановление читает снимок и хвост журнала"""
+        library = Library('Библиотека')
+        journal = library.attach_journal(str(tmp_path), compact_every=5)
+        fill(library)
+        expected = state(library)
+        journal.close()
+
+        # Снимки выполнялись автоматически, в журнале остался только хвост
+        with open(journal.log_path) as file:
+            assert len(file.readlines()) < 5
+        assert journal.segments() == []
+        restored = Library('Библиотека')
+        restored.attach_journal(str(tmp_path))
+        assert state(restored) == expected
+
+    def test_compaction_off_write_path(self, tmp_path, monkeypatch):
+        """Тест фонового слияния: запись не обходит библиотеку, снимок собирается из файлов"""
+        library = Library('Библиотека', verbose=False)
+        journal = library.attach_journal(str(tmp_path), compact_every=3)
+
+        def no_iteration(self):
+            raise AssertionError("запись журнала не должна обходить библиотеку")
+        monkeypatch.setattr(Library, '__iter__', no_iteration)
+        fill(library)
+        journal.wait()
+        monkeypatch.undo()
+        expected = state(library)
+        assert journal.segments() == []
+        with open(journal.snapshot_path) as file:
+            header = json.loads(file.readline())
+            assert header['count'] == len(file.readlines()) == 3
+        # Удаление - десятая запись - осталось в хвосте журнала после трех частей по три записи
+        assert header['seq'] == 9
+        journal.sync()
+        with open(journal.log_path) as file:
+            assert [json.loads(line)['op'] for line in file] == ['remove']
+        journal.close()
+
+        restored = Library('Библиотека', verbose=False)
+        restored.attach_journal(str(tmp_path))
+        assert state(restored) == expected
+
+    def test_unmerged_segments_are_replayed(self, tmp_path):
+        """Тест сбоя до фонового слияния: части журнала применяются при восстановлении"""
+        library = Library('Библиотека', verbose=False)
+        journal = library.attach_journal(str(tmp_path), compact_every=0)
+        fill(library)
+        expected = state(library)
+        # Текущий файл журнала закрыт как часть, слияния не было
+        journal.sync()
+        journal._file.close()
+        journal._file = None
+        os.replace(journal.log_path, os.path.join(str(tmp_path), f'journal.{journal._seq}.log'))
+
+        restored = Library('Библиотека', verbose=False)
+        replayed = restored.attach_journal(str(tmp_path)).library is restored
+        assert replayed and state(restored) == expected
+        restored.journal.wait()
+        assert restored.journal.segments() == []
+        restored.journal.close()
+        again = Library('Библиотека', verbose=False)
+        again.attach_journal(str(tmp_path))
+        assert state(again) == expected
+
+    def test_replay_is_idempotent(self, tmp_path):
+        """Тест повторного применения записей, уже вошедших в снимок"""
+        library = Library('Библиотека')
+        journal = library.attach_journal(str(tmp_path), compact_every=0)
+        fill(library)
+        expected = state(library)
+        journal.sync()
+        with open(journal.log_path) as file:
+            log = file.read()
+        journal.compact()
+        journal.close()
+
+        # Сбой между записью снимка и очисткой журнала: старые записи остаются в журнале
+        with open(journal.log_path, 'w') as file:
+            file.write(log)
+        restored = Library('Библиотека')
+        assert restored.attach_journal(str(tmp_path)).library is restored
+        assert state(restored) == expected
+
+    def test_torn_tail_is_dropped(self, tmp_path):
+        """Тест отбрасывания недописанной последней записи"""
+        library = Library('Библиотека')
+        journal = library.attach_journal(str(tmp_path))
+        library.add_book(SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-504'))
+        journal.close()
+        with open(journal.log_path, 'a') as file:
+            file.write('{"op": "remove", "isb')
+
+        restored = Library('Библиотека')
+        restored.attach_journal(str(tmp_path))
+        assert 'ISBN-504' in restored
+        with open(journal.log_path) as file:
+            assert all(json.loads(line) for line in file)
+
+    def test_existing_books_and_errors(self, tmp_path):
+        """Тест подключения журнала к непустой библиотеке"""
+        library = Library('Библиотека')
+        library.add_book(SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-505'))
+        library.attach_journal(str(tmp_path)).close()
+
+        # Книги, добавленные до подключения, сохранены снимком
+        restored = Library('Библиотека')
+        restored.attach_journal(str(tmp_path))
+        assert 'ISBN-505' in restored
+
+        # Журнал с данными нельзя подключить к непустой библиотеке
+        with pytest.raises(ValueError):
+            library.attach_journal(str(tmp_path))
+        with pytest.raises(ValueError):
+            Journal(str(tmp_path), sync_every=0)
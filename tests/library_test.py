@@ -61,6 +61,47 @@ class TestLibrary:
         assert len(books) == 1  # Должна быть найдена 1 книга 2000 года
         assert book1 in books  # Найденная книга должна быть book1
 
+    def test_search_by_genre_and_cover_type(self):
+        """Тест поиска книг по жанру и типу обложки через индексы"""
+        library = Library('Библиотека')
+        book1 = HardCover('Химия эмоций', 'Чжан Ли', 2010, 'Роман', 'ISBN-040')
+        book2 = GlossyCover('Код города', 'Редакция журнала', 2020, 'Журнал', 'ISBN-041')
+        library.add_book(book1)
+        library.add_book(book2)
+
+        assert library.search_by_genre('Роман') == [book1]
+        assert library.search_by_genre('Поэзия') == []
+        assert library.search_by_cover_type(CoverType.GLOSSY) == [book2]
+
+    def test_search_by_year_range(self):
+        """Тест поиска книг по диапазону лет"""
+        library = Library('Библиотека')
+        book1 = HardCover('Химия эмоций', 'Чжан Ли', 1992, 'Роман', 'ISBN-042')
+        book2 = SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-043')
+        book3 = SoftCover('Между двух ветров', 'Сара Бен', 2011, 'Роман', 'ISBN-044')
+        for book in [book3, book1, book2]:
+            library.add_book(book)
+
+        assert library.search_by_year_range(1990, 1999) == [book1]
+        assert library.search_by_year_range(1990, 2009) == [book1, book2]
+        assert library.search_by_year_range(2000, None, reverse=True) == [book3, book2]
+
+    def test_search_title_contains_and_prefix(self):
+        """Тест поиска по части и началу названия без учета регистра"""
+        library = Library('Библиотека')
+        book1 = SoftCover('Дневник последнего алхимика', 'Чжан Ли', 2001, 'Роман', 'ISBN-045')
+        book2 = SoftCover('Дневник незнакомки', 'Сара Бен', 2001, 'Роман', 'ISBN-046')
+        library.add_book(book1)
+        library.add_book(book2)
+
+        assert library.search_title_contains('АЛХИМ') == [book1]
+        assert library.search_title_prefix('дневник н') == [book2]
+        assert library.search_title_prefix('дневник') == [book2, book1]
+
+        # Удаленная книга больше не находится
+        library.index.remove_book('ISBN-045')
+        assert library.search_title_contains('алхим') == []
+
     def test_borrow_and_return_books(self):
         """Тест взятия и возврата книг"""
         library = Library('Библиотека')
@@ -105,4 +146,122 @@ class TestLibrary:
         
         # Попытка удалить несуществующую книгу
         success = library.remove_book_by_title('Несуществующая')
-        assert success == False  # Неудачная попытка
\ No newline at end of file
+        assert success == False  # Неудачная попытка
+    def test_single_primary_store(self):
+        """Тест единого хранилища: коллекция - представление индекса, а не копия"""
+        library = Library('Библиотека')
+        book1 = SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-050')
+        book2 = SoftCover('Код города', 'Чжан Ли', 2005, 'Роман', 'ISBN-051')
+        library.add_book(book1)
+        library.add_book(book2)
+
+        assert 'ISBN-050' in library
+        assert 'ISBN-052' not in library
+        assert library.book_collection._books is library.index.store
+        assert list(library) == [book1, book2]
+        assert library.book_collection[1] is book2
+
+        # Взятие по названию выбирает первый свободный экземпляр
+        assert library.borrow_book_by_title('Код города') == True
+        assert library.borrow_book_by_title('Код города') == True
+        assert book1.is_borrowed() and book2.is_borrowed()
+        assert library.borrow_book_by_title('Код города') == False
+
+    def test_remove_book_by_isbn(self):
+        """Тест удаления книги по ISBN"""
+        library = Library('Библиотека')
+        book1 = SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-053')
+        book2 = SoftCover('Код города', 'Чжан Ли', 2005, 'Роман', 'ISBN-054')
+        library.add_book(book1)
+        library.add_book(book2)
+
+        # Удаляется именно указанный экземпляр, а не первый с таким названием
+        assert library.remove_book_by_isbn('ISBN-054') == True
+        assert list(library.book_collection) == [book1]
+        assert library.search_by_author('Чжан Ли') == []
+        assert library.remove_book_by_isbn('ISBN-054') == False
+        assert len(library) == 1
+
+    def test_borrowed_index_and_return_by_isbn(self):
+        """Тест индекса взятых книг и возврата по ISBN"""
+        library = Library('Библиотека')
+        book1 = SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-055')
+        book2 = HardCover('Химия эмоций', 'Чжан Ли', 2005, 'Роман', 'ISBN-056')
+        library.add_book(book1)
+        library.add_book(book2)
+        assert library.borrowed_books() == []
+
+        # Взятие через библиотеку и напрямую через книгу обновляет индекс
+        library.borrow_book_by_isbn('ISBN-056')
+        book1.borrow()
+        assert library.borrowed_books() == [book2, book1]
+        assert library.borrowed_count() == 2
+        assert library.available_count() == 0
+
+        assert library.return_book_by_isbn('ISBN-056') == True
+        assert library.return_book_by_isbn('ISBN-056') == False  # Уже возвращена
+        assert library.return_book_by_isbn('ISBN-999') == False  # Нет такой книги
+        assert not book2.is_borrowed()
+        assert library.borrowed_books() == [book1]
+
+        # Удаленная книга пропадает из индекса и больше не отслеживается
+        library.remove_book_by_isbn('ISBN-055')
+        assert library.borrowed_books() == []
+        book1.return_book()
+        book1.borrow()
+        assert library.borrowed_count() == 0
+
+    def test_condition_index(self):
+        """Тест индекса состояния: худшие книги и выборка по описанию состояния"""
+        library = Library('Библиотека')
+        hard = HardCover('Химия эмоций', 'Чжан Ли', 2005, 'Роман', 'ISBN-057', 50)   # 70 с бонусом
+        soft = SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-058', 95)
+        glossy = GlossyCover('Атлас невидимых городов', 'Редакция журнала', 2010, 'Журнал', 'ISBN-059', 30)
+        for book in [hard, soft, glossy]:
+            library.add_book(book)
+
+        assert library.worst_condition(2) == [glossy, hard]
+        assert library.books_in_condition_band('Как новая') == [soft]
+
+        # Изменения состояния через damage, add_scratches и update_condition обновляют индекс
+        glossy.add_scratches(10)   # 30 - 20 = 10
+        soft.damage(90)            # 95 - 90 = 5
+        hard.update_condition(25)  # 70 + 25 = 95
+        assert library.worst_condition(3) == [soft, glossy, hard]
+        assert library.books_in_condition_band('Аварийное состояние') == [soft, glossy]
+        assert library.books_in_condition_band('Как новая') == [hard]
+        assert library.condition_band_counts()['Аварийное состояние'] == 2
+
+        library.remove_book_by_isbn('ISBN-058')
+        assert library.worst_condition(1) == [glossy]
+
+        with pytest.raises(ValueError):
+            library.books_in_condition_band('Отличная')
+
+    def test_add_books(self):
+        """Тест пакетного добавления книг в библиотеку"""
+        library = Library('Библиотека')
+        books = [SoftCover('Код города', 'Сара Бен', 2001 + i, 'Роман', f'ISBN-06{i}') for i in range(5)]
+        duplicates = library.add_books(books + [books[0]])
+
+        assert duplicates == [(5, 'ISBN-060')]
+        assert len(library) == 5
+        assert list(library) == books
+        assert library.search_by_year_range(2002, 2003) == books[1:3]
+        assert library.borrow_book_by_title('Код города') == True
+        assert library.borrowed_books() == [books[0]]
+
+    def test_quiet_library(self, capsys):
+        """Тест библиотеки без вывода сообщений (verbose=False)"""
+        library = Library('Библиотека', verbose=False)
+        book = SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-070')
+        library.add_book(book)
+        assert library.search_by_isbn('ISBN-070') is book
+        assert library.search_by_author('Сара Бен') == [book]
+        assert library.remove_book_by_isbn('ISBN-070') == True
+        assert capsys.readouterr().out == ''
+
+        library.verbose = True
+        assert library.index.verbose is True
+        library.search_by_isbn('ISBN-070')
+        assert 'не найдена' in capsys.readouterr().out
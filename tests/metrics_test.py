@@ -0,0 +1,118 @@
+from src.books import HardCover, SoftCover, GlossyCover
+from src.library import Library
+from src.thread_safe_library import ThreadSafeLibrary
+from src.metrics import Histogram
+from src.constans import *
+import pytest
+
+
+def make_library(library_class=Library) -> Library:
+    """Библиотека из четырех книг без вывода сообщений"""
+    library = library_class('Тестовая')
+    library.verbose = False
+    library.add_books([
+        HardCover('Война и мир', 'Лев Толстой', 1869, 'Роман', 'ISBN-1', 70),
+        SoftCover('Анна Каренина', 'Лев Толстой', 1877, 'Роман', 'ISBN-2', 90),
+        SoftCover('Анна Каренина', 'Лев Толстой', 1877, 'Роман', 'ISBN-3', 90),
+        GlossyCover('Вокруг света', 'Редакция журнала', 2020, 'Журнал', 'ISBN-4', 90),
+    ])
+    return library
+
+
+class TestMetrics:
+    """Тесты для метрик операций библиотеки"""
+
+    def test_histogram(self):
+        """Тест гистограммы: корзины по верхним границам, квантили"""
+        histogram = Histogram((10, 100, 1000))
+        for value in (5, 10, 50, 500, 5000):
+            histogram.observe(value)
+        assert histogram.counts == [2, 1, 1, 1]
+        assert histogram.count == 5 and histogram.total == 5565
+        assert histogram.quantile(0.4) == 10
+        assert histogram.quantile(0.6) == 100
+        assert histogram.quantile(1.0) == float('inf')
+        assert Histogram().quantile(0.5) is None
+
+    def test_disabled_by_default(self):
+        """Тест: без enable_metrics методы не обернуты"""
+        library = make_library()
+        assert library.metrics is None
+        assert 'search_by_isbn' not in vars(library)
+        assert 'add_book' not in vars(library.index)
+
+    def test_counters_and_errors(self):
+        """Тест счетчиков вызовов и ошибок библиотеки и индексов"""
+        library = make_library()
+        metrics = library.enable_metrics()
+        assert library.enable_metrics() is metrics
+        library.search_by_author('Лев Толстой')
+        library.search_by_author('Неизвестный')
+        library.borrow_book_by_isbn('ISBN-1')
+        with pytest.raises(ValueError):
+            library.add_book(SoftCover('Книга', 'Автор', 2000, 'Роман', 'ISBN-1', 90))
+        assert library.remove_book_by_title('Анна Каренина')
+
+        operations = metrics.snapshot()['operations']
+        assert operations['library.search_by_author']['calls'] == 2
+        assert operations['index.search_by_author']['calls'] == 2
+        assert operations['library.add_book'] == {**operations['library.add_book'], 'calls': 1, 'errors': 1}
+        # Удаление по названию вызывает удаление по ISBN
+        assert operations['library.remove_book_by_isbn']['calls'] == 1
+        assert operations['index.remove_book']['calls'] == 1
+        search = operations['library.search_by_author']
+        assert search['total_seconds'] > 0 and search['mean_us'] <= search['p99_us']
+        assert 'library.query' not in operations  # Невызывавшиеся операции в снимок не входят
+
+        metrics.reset()
+        assert metrics.snapshot()['operations'] == {}
+
+    def test_gauges(self):
+        """Тест показателей: книги, взятые книги, размеры корзин индексов"""
+        library = make_library()
+        metrics = library.enable_metrics()
+        library.borrow_book_by_isbn('ISBN-2')
+        snapshot = metrics.snapshot()
+        assert snapshot['books'] == 4 and snapshot['borrowed'] == 1
+        assert snapshot['indexes']['author'] == {'keys': 2, 'max_bucket': 3, 'mean_bucket': 2.0}
+        assert snapshot['indexes']['title']['keys'] == 3
+        assert set(snapshot['indexes']) == set(library.index.INDEXED_FIELDS)
+        assert sorted(library.index.bucket_sizes('year')) == [1, 1, 2]
+
+    def test_prometheus(self):
+        """Тест текстового формата Prometheus: накопительные корзины, сумма, счетчик"""
+        library = make_library()
+        metrics = library.enable_metrics()
+        for _ in range(3):
+            library.search_by_isbn('ISBN-4')
+        text = metrics.to_prometheus()
+        labels = 'library="Тестовая",component="library",operation="search_by_isbn"'
+        assert '# TYPE library_operation_seconds histogram' in text
+        assert f'library_operation_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+        assert f'library_operation_seconds_count{{{labels}}} 3' in text
+        assert f'library_operation_errors_total{{{labels}}} 0' in text
+        assert 'library_books{library="Тестовая"} 4' in text
+        assert 'library_index_keys{library="Тестовая",index="cover_type"} 3' in text
+        buckets = [int(line.rsplit(' ', 1)[1]) for line in text.splitlines()
+                   if line.startswith(f'library_operation_seconds_bucket{{{labels}')]
+        assert buckets == sorted(buckets)
+
+    def test_disable_metrics(self):
+        """Тест отключения: обертки снимаются, библиотека работает как прежде"""
+        library = make_library()
+        metrics = library.enable_metrics()
+        library.disable_metrics()
+        assert library.metrics is None
+        assert 'search_by_isbn' not in vars(library) and 'add_book' not in vars(library.index)
+        assert library.search_by_isbn('ISBN-1').title == 'Война и мир'
+        assert metrics.snapshot()['operations'] == {}
+
+    def test_thread_safe_library(self):
+        """Тест метрик многопоточной библиотеки: обертки поверх блокировок"""
+        library = make_library(ThreadSafeLibrary)
+        metrics = library.enable_metrics()
+        assert library.borrow_book_by_isbn('ISBN-3')
+        assert library.return_book_by_isbn('ISBN-3')
+        operations = metrics.snapshot()['operations']
+        assert operations['library.borrow_book_by_isbn']['calls'] == 1
+        assert operations['library.return_book_by_isbn']['calls'] == 1
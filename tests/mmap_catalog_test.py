@@ -0,0 +1,127 @@
+from src.books import Book, HardCover, SoftCover, GlossyCover
+from src.library import Library, UnsupportedOperation
+from src.mmap_catalog import MmapCatalog, write_catalog
+from src.constans import *
+import pytest
+
+
+def make_library():
+    """Библиотека с книгами всех классов и измененным состоянием"""
+    library = Library('Библиотека')
+    hard = HardCover('Химия эмоций', 'Чжан Ли', 1995, 'Роман', 'ISBN-401', 50)   # 70 с бонусом
+    soft = SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-402')
+    glossy = GlossyCover('Атлас невидимых городов', 'Редакция журнала', 2010, 'Журнал', 'ISBN-403')
+    book = Book('Дневник алхимика', 'Чжан Ли', 2001, 'Жанр', CoverType.HARD, 'ISBN-404', 46)
+    for item in [hard, soft, glossy, book]:
+        library.add_book(item)
+    soft.borrow()
+    glossy.add_scratches(3)
+    return library
+
+
+class TestMmapCatalog:
+    """Тесты для каталога MmapCatalog (файл, отображенный в память)"""
+
+    def test_search_from_catalog(self, tmp_path):
+        """Тест поиска по ISBN, автору и году по отображенному файлу"""
+        path = str(tmp_path / 'catalog.bin')
+        make_library().save_mmap(path)
+
+        with MmapCatalog(path) as catalog:
+            assert len(catalog) == 4
+            assert 'ISBN-402' in catalog
+            assert 'ISBN-499' not in catalog
+            assert catalog.search_by_isbn('ISBN-499') is None
+            assert [book.isbn for book in catalog.search_by_author('Чжан Ли')] == ['ISBN-401', 'ISBN-404']
+            assert catalog.search_by_author('Неизвестный') == []
+            assert [book.isbn for book in catalog.search_by_year(2001)] == ['ISBN-402', 'ISBN-404']
+            assert catalog.search_by_year(1800) == []
+            assert [book.year for book in catalog.search_by_year_range(2000, None, reverse=True)] == [2010, 2001, 2001]
+
+    def test_books_restored_lazily_in_exact_state(self, tmp_path):
+        """Тест создания книг при обращении с сохраненным состоянием"""
+        path = str(tmp_path / 'catalog.bin')
+        make_library().save_mmap(path)
+        catalog = MmapCatalog(path)
+
+        # До обращения объекты книг не создаются
+        assert catalog._books == {}
+        hard = catalog.search_by_isbn('ISBN-401')
+        assert len(catalog._books) == 1
+        # Повторное обращение возвращает тот же объект
+        assert catalog.search_by_author('Чжан Ли')[0] is hard
+
+        assert type(hard).__name__ == 'HardCover' and hard.condition == 70  # Бонус не начисляется повторно
+        soft = catalog.search_by_isbn('ISBN-402')
+        assert soft.is_borrowed() and soft.borrow_count() == 1
+        glossy = catalog.search_by_isbn('ISBN-403')
+        assert glossy._scratches == 3 and glossy.condition == 94 and glossy.has_images
+        book = catalog.search_by_isbn('ISBN-404')
+        assert type(book).__name__ == 'Book' and book.cover_type == CoverType.HARD
+        catalog.close()
+
+    def test_open_mmap_library(self, tmp_path):
+        """Тест библиотеки только для чтения поверх каталога"""
+        path = str(tmp_path / 'catalog.bin')
+        make_library().save_mmap(path)
+        library = Library.open_mmap(path, 'Каталог')
+
+        assert len(library) == 4
+        assert 'ISBN-403' in library
+        assert library.search_by_isbn('ISBN-403').title == 'Атлас невидимых городов'
+        assert len(library.search_by_author('Чжан Ли')) == 2
+        assert [book.isbn for book in library] == ['ISBN-401', 'ISBN-402', 'ISBN-403', 'ISBN-404']
+        assert library.book_collection[1].isbn == 'ISBN-402'
+
+        with pytest.raises(TypeError):
+            library.add_book(SoftCover('Новая книга', 'Сара Бен', 2001, 'Роман', 'ISBN-405'))
+        with pytest.raises(TypeError):
+            library.remove_book_by_isbn('ISBN-401')
+        with pytest.raises(TypeError):
+            library.book_collection.remove_by_isbn('ISBN-401')
+        assert len(library) == 4
+
+    def test_mmap_library_unsupported_operations(self, tmp_path):
+        """Тест операций Library, которых нет у каталога: понятная ошибка UnsupportedOperation"""
+        path = str(tmp_path / 'catalog.bin')
+        make_library().save_mmap(path)
+        with Library.open_mmap(path, verbose=False) as library:
+            assert type(library).__name__ == 'MmapLibrary'
+            assert library.name == path
+            assert [book.isbn for book in library.search_by_year_range(2001, 2001)] == ['ISBN-402', 'ISBN-404']
+            calls = [
+                lambda: library.search_by_title('Код города'),
+                lambda: library.search_by_genre('Роман'),
+                lambda: library.search_by_cover_type(CoverType.SOFT),
+                lambda: library.search_title_contains('код'),
+                lambda: library.borrowed_books(),
+                lambda: library.worst_condition(1),
+                lambda: library.remove_book_by_title('Код города'),
+                lambda: library.borrow_book_by_isbn('ISBN-402'),
+                lambda: library.query(author='Чжан Ли'),
+                lambda: library.mean_condition_by_cover_type(),
+                lambda: library.add_books([]),
+            ]
+            for call in calls:
+                with pytest.raises(TypeError, match='только для чтения'):
+                    call()
+            with pytest.raises(AttributeError, match='только для чтения'):
+                library.add_book
+            with pytest.raises(AttributeError):
+                library.no_such_attribute
+            # Проверки наличия операций видят их отсутствие
+            assert not hasattr(library, 'add_book') and hasattr(library, 'search_by_author')
+            assert getattr(library, 'borrow_book_by_isbn', None) is None
+            assert issubclass(UnsupportedOperation, AttributeError) and issubclass(UnsupportedOperation, TypeError)
+
+    def test_invalid_file(self, tmp_path):
+        """Тест открытия файла, не являющегося каталогом"""
+        path = tmp_path / 'other.bin'
+        path.write_bytes(b'not a catalog' * 10)
+        with pytest.raises(ValueError):
+            MmapCatalog(str(path))
+
+        # Повторяющиеся ISBN в каталог не записываются
+        book = SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-406')
+        with pytest.raises(ValueError):
+            write_catalog(str(tmp_path / 'catalog.bin'), [book, book])
@@ -0,0 +1,102 @@
+from src.books import Book, HardCover, SoftCover, GlossyCover
+from src.library import Library
+from src import parallel_import as parallel
+from src.import_export import export_books, import_books
+from src.constans import *
+import pytest
+
+
+def make_books(count):
+    """Книги всех классов с разным состоянием"""
+    classes = [HardCover, SoftCover, GlossyCover]
+    books = []
+    for i in range(count):
+        book = classes[i % 3](f'Книга {i}', 'Сара Бен', 1950 + i % 70, 'Роман', f'ISBN-8{i:04d}', 10 + i % 90)
+        if i % 5 == 0:
+            book.borrow()
+        books.append(book)
+    return books
+
+
+def state(library):
+    """Полное состояние книг библиотеки для сравнения"""
+    return [(type(book).__name__, book.isbn, book.condition, book.is_borrowed(), book.borrow_count())
+            for book in library]
+
+
+class TestParallelImport:
+    """Тесты для параллельного импорта книг"""
+
+    def test_split_ranges(self, tmp_path, monkeypatch):
+        """Тест разбиения файла на части по концам строк"""
+        monkeypatch.setattr(parallel, 'MIN_RANGE_BYTES', 1)
+        path = tmp_path / 'books.csv'
+        path.write_bytes(b'header\n' + b''.join(f'line {i}\n'.encode() for i in range(10)))
+        header, ranges = parallel.split_ranges(str(path), 4, skip_header=True)
+
+        assert header == b'header\n'
+        assert ranges[0][0] == 7 and ranges[-1][1] == path.stat().st_size
+        data = path.read_bytes()
+        # Части идут подряд и заканчиваются переводом строки
+        for (start, end), (next_start, _) in zip(ranges, ranges[1:]):
+            assert end == next_start
+        assert all(data[end - 1:end] == b'\n' for _, end in ranges)
+
+    @pytest.mark.parametrize('format', ['csv', 'jsonl'])
+    def test_parallel_matches_sequential(self, tmp_path, monkeypatch, format):
+        """Тест совпадения результата параллельного и последовательного импорта"""
+        monkeypatch.setattr(parallel, 'MIN_RANGE_BYTES', 256)
+        path = str(tmp_path / f'books.{format}')
+        export_books(make_books(60), path)
+
+        sequential = Library('Последовательно')
+        assert sequential.import_books(path) == []
+        concurrent = Library('Параллельно')
+        assert parallel.parallel_import(concurrent, path, workers=2) == (60, [])
+        assert len(parallel.split_ranges(path, 8)[1]) > 1
+        assert state(concurrent) == state(sequential)
+        assert len(concurrent.search_by_author('Сара Бен')) == 60
+
+        # Параллельный режим импорта библиотеки
+        library = Library('Библиотека')
+        assert library.import_books(path, workers=2) == []
+        assert state(library) == state(sequential)
+
+    def test_errors_and_global_duplicates(self, tmp_path, monkeypatch):
+        """Тест номеров строк ошибок и проверки дубликатов по всему файлу"""
+        monkeypatch.setattr(parallel, 'MIN_RANGE_BYTES', 64)
+        path = tmp_path / 'books.csv'
+        rows = ['title,author,year,genre,cover_type,isbn,condition']
+        for i in range(20):
+            rows.append(f'Книга {i},Сара Бен,2001,Роман,Мягкая,ISBN-9{i:03d},50')
+        rows[5] = 'Книга 4,Сара Бен,год,Роман,Мягкая,ISBN-9999,50'
+        rows[18] = 'Книга 17,Сара Бен,2001,Роман,Мягкая,ISBN-9001,50'
+        path.write_text('\n'.join(rows) + '\n', encoding='utf-8')
+
+        library = Library('Библиотека')
+        imported, errors = parallel.parallel_import(library, str(path), workers=2)
+        assert imported == 18
+        assert [number for number, _ in errors] == [6, 19]
+        assert 'ISBN-9001' in errors[1][1]
+
+    @pytest.mark.parametrize('min_range', [1, 48, 1 << 20])
+    def test_line_numbers_with_blank_and_multiline_rows(self, tmp_path, monkeypatch, min_range):
+        """Тест номеров строк ошибок при пустых строках и значениях CSV с переводами строк"""
+        monkeypatch.setattr(parallel, 'MIN_RANGE_BYTES', min_range)
+        path = tmp_path / 'books.csv'
+        rows = ['title,author,year,genre,cover_type,isbn,condition']
+        for i in range(12):
+            rows.append(f'"Книга {i}\nчасть вторая\nи третья",Сара Бен,2001,Роман,Мягкая,ISBN-7{i:03d},50')
+            rows.append('')
+            rows.append(f'Книга {i}б,Сара Бен,{"год" if i % 4 == 0 else 2001},Роман,Мягкая,ISBN-8{i:03d},50')
+        rows.append('Повтор,Сара Бен,2001,Роман,Мягкая,ISBN-7003,50')
+        path.write_text('\n'.join(rows) + '\n\n', encoding='utf-8')
+
+        sequential = Library('Последовательно', verbose=False)
+        expected_imported, expected_errors = import_books(sequential, str(path))
+        concurrent = Library('Параллельно', verbose=False)
+        imported, errors = parallel.parallel_import(concurrent, str(path), workers=2)
+        assert (imported, errors) == (expected_imported, sorted(expected_errors))
+        assert [number for number, _ in errors] == [6, 26, 46, 62]  # Группа строк - 5 строк файла
+        assert state(concurrent) == state(sequential)
+        assert concurrent.search_by_isbn('ISBN-7005').title == 'Книга 5\nчасть вторая\nи третья'
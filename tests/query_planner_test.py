@@ -0,0 +1,70 @@
+from src.books import Book, HardCover, SoftCover, GlossyCover
+from src.library import Library
+from src.constans import *
+import pytest
+
+
+def make_library() -> Library:
+    """Библиотека с набором книг для проверки составных запросов"""
+    library = Library('Библиотека')
+    library.add_book(HardCover('Химия эмоций', 'Чжан Ли', 1995, 'Роман', 'ISBN-301'))
+    library.add_book(SoftCover('Код города', 'Чжан Ли', 2001, 'Детектив', 'ISBN-302'))
+    library.add_book(SoftCover('Между двух ветров', 'Сара Бен', 2001, 'Роман', 'ISBN-303'))
+    library.add_book(HardCover('Голос из прошлого', 'Сара Бен', 2010, 'Роман', 'ISBN-304'))
+    library.add_book(GlossyCover('Атлас невидимых городов', 'Редакция журнала', 2010, 'Журнал', 'ISBN-305'))
+    return library
+
+
+class TestQueryPlanner:
+    """Тесты для планировщика составных запросов Library.query"""
+
+    def test_query_combines_predicates(self):
+        """Тест пересечения нескольких индексов"""
+        library = make_library()
+
+        found = library.query(author='Сара Бен', genre='Роман')
+        assert [book.isbn for book in found] == ['ISBN-303', 'ISBN-304']
+
+        found = library.query(genre='Роман', cover_type=CoverType.HARD, year=2010)
+        assert [book.isbn for book in found] == ['ISBN-304']
+
+        # Диапазон лет
+        found = library.query(author='Чжан Ли', year=(1990, 1999))
+        assert [book.isbn for book in found] == ['ISBN-301']
+
+        # Пустое пересечение
+        assert library.query(author='Чжан Ли', genre='Журнал') == []
+
+    def test_query_with_unindexed_predicate(self):
+        """Тест фильтрации по неиндексированному условию"""
+        library = make_library()
+        library.index.search_by_isbn('ISBN-303').borrow()
+
+        found = library.query(genre='Роман', borrowed=True)
+        assert [book.isbn for book in found] == ['ISBN-303']
+        found = library.query(genre='Роман', borrowed=False)
+        assert [book.isbn for book in found] == ['ISBN-301', 'ISBN-304']
+
+        # Только неиндексированное условие - полный перебор
+        assert [book.isbn for book in library.query(borrowed=True)] == ['ISBN-303']
+
+    def test_explain_orders_indexes_by_selectivity(self):
+        """Тест выбора самого селективного индекса первым"""
+        library = make_library()
+
+        plan = library.explain(genre='Роман', author='Чжан Ли', borrowed=False)
+        assert [step.field for step in plan.steps] == ['author', 'genre', 'borrowed']
+        assert [step.kind for step in plan.steps] == ['index', 'index', 'scan']
+        assert not plan.full_scan
+        assert "Индекс author='Чжан Ли' (2 книг)" in str(plan)
+
+        # Взятые книги индексируются, свободные проверяются перебором
+        assert [step.kind for step in library.explain(borrowed=True).steps] == ['index']
+        assert library.explain(borrowed=False).full_scan
+        assert "Полный перебор" in str(library.explain(borrowed=False))
+
+    def test_unknown_field(self):
+        """Тест ошибки при неизвестном поле запроса"""
+        library = make_library()
+        with pytest.raises(ValueError):
+            library.planner.plan(color='красный')
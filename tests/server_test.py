@@ -0,0 +1,178 @@
+from src.books import HardCover, SoftCover, GlossyCover
+from src.library import Library
+from src.server import LibraryServer
+from src.load_client import request, run_load, make_workload, _encode, _read_response
+from src.constans import *
+from urllib.parse import quote
+import asyncio
+
+
+def make_library() -> Library:
+    """Библиотека из трех книг"""
+    library = Library('Тестовая')
+    library.add_books([
+        HardCover('Война и мир', 'Лев Толстой', 1869, 'Роман', 'ISBN-1', 70),
+        SoftCover('Анна Каренина', 'Лев Толстой', 1877, 'Роман', 'ISBN-2', 90),
+        GlossyCover('Вокруг света', 'Редакция журнала', 2020, 'Журнал', 'ISBN-3', 90),
+    ])
+    return library
+
+
+def with_server(scenario, **options):
+    """Запуск сценария scenario(server) с сервером на свободном порту"""
+    async def main():
+        server = LibraryServer(make_library(), port=0, **options)
+        await server.start()
+        try:
+            return await scenario(server)
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+class TestLibraryServer:
+    """Тесты для HTTP/JSON-сервера библиотеки"""
+
+    def test_search(self):
+        """Тест поиска по ISBN, автору, году и названию"""
+        async def scenario(server):
+            port = server.port
+            status, book = await request('127.0.0.1', port, 'GET', '/books/ISBN-1')
+            assert status == 200 and book['title'] == 'Война и мир' and book['kind'] == 'HardCover'
+            status, found = await request('127.0.0.1', port, 'GET', '/books?author=' + quote('Лев Толстой'))
+            assert status == 200 and {item['isbn'] for item in found['books']} == {'ISBN-1', 'ISBN-2'}
+            status, found = await request('127.0.0.1', port, 'GET', '/books?author=' + quote('Лев Толстой') + '&limit=1')
+            assert found['total'] == 2 and len(found['books']) == 1
+            status, found = await request('127.0.0.1', port, 'GET', '/books?year=2020')
+            assert [item['isbn'] for item in found['books']] == ['ISBN-3']
+            status, found = await request('127.0.0.1', port, 'GET', '/books?title=' + quote('мир'))
+            assert [item['isbn'] for item in found['books']] == ['ISBN-1']
+            status, error = await request('127.0.0.1', port, 'GET', '/books/ISBN-404')
+            assert status == 404 and 'error' in error
+            status, _ = await request('127.0.0.1', port, 'GET', '/books?year=abc')
+            assert status == 400
+        with_server(scenario)
+
+    def test_borrow_return_damage_add(self):
+        """Тест изменений библиотеки через сервер"""
+        async def scenario(server):
+            port = server.port
+            status, book = await request('127.0.0.1', port, 'POST', '/books/ISBN-2/borrow')
+            assert status == 200 and book['is_borrowed'] is True
+            status, _ = await request('127.0.0.1', port, 'POST', '/books/ISBN-2/borrow')
+            assert status == 409
+            status, book = await request('127.0.0.1', port, 'POST', '/books/ISBN-2/return')
+            assert status == 200 and book['is_borrowed'] is False
+            before = server.library.search_by_isbn('ISBN-1').condition
+            status, book = await request('127.0.0.1', port, 'POST', '/books/ISBN-1/damage', {'amount': 15})
+            assert status == 200 and book['condition'] == server.library.search_by_isbn('ISBN-1').condition < before
+            record = {'title': 'Идиот', 'author': 'Федор Достоевский', 'year': 1869,
+                      'genre': 'Роман', 'cover_type': CoverType.SOFT, 'isbn': 'ISBN-4'}
+            status, book = await request('127.0.0.1', port, 'POST', '/books', record)
+            assert status == 200 and book['kind'] == 'SoftCover'
+            status, _ = await request('127.0.0.1', port, 'POST', '/books', record)
+            assert status == 409
+            assert 'ISBN-4' in server.library
+        with_server(scenario)
+
+    def test_malformed_requests(self):
+        """Тест неверных запросов: 400, счетчик запросов в обработке возвращается к нулю"""
+        async def raw(port, data: bytes):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(data)
+            await writer.drain()
+            status, _ = await _read_response(reader)
+            writer.close()
+            await writer.wait_closed()
+            return status
+
+        async def scenario(server):
+            port = server.port
+            for _ in range(5):
+                status, _ = await request('127.0.0.1', port, 'POST', '/books/ISBN-1/damage', [1])
+                assert status == 400
+            status, _ = await request('127.0.0.1', port, 'POST', '/books', 'строка')
+            assert status == 400
+            before = server.library.search_by_isbn('ISBN-1').condition
+            for amount in (-40, 2.5, '10', True):
+                status, _ = await request('127.0.0.1', port, 'POST', '/books/ISBN-1/damage', {'amount': amount})
+                assert status == 400
+            assert server.library.search_by_isbn('ISBN-1').condition == before
+            for length in (b'abc', b'-5'):
+                status = await raw(port, b'POST /books HTTP/1.1\r\nContent-Length: ' + length + b'\r\n\r\n{}')
+                assert status == 400
+            status = await raw(port, _encode('POST', '/books', b'{', 'localhost'))
+            assert status == 400
+            # Ни один неверный запрос не занимает место в ограничении max_in_flight
+            status, book = await request('127.0.0.1', port, 'GET', '/books/ISBN-1')
+            assert status == 200
+            return server.in_flight
+        assert with_server(scenario, max_in_flight=3) == 0
+
+    def test_pipelining_keeps_order(self):
+        """Тест конвейера: ответы по порядку, поиск до взятия видит свободную книгу"""
+        async def scenario(server):
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            writer.write(_encode('GET', '/books/ISBN-1', b'', 'localhost')
+                         + _encode('POST', '/books/ISBN-1/borrow', b'', 'localhost')
+                         + _encode('GET', '/books/ISBN-1', b'', 'localhost')
+                         + _encode('GET', '/books/ISBN-1', b'', 'localhost'))
+            await writer.drain()
+            responses = [await _read_response(reader) for _ in range(4)]
+            writer.close()
+            await writer.wait_closed()
+            return responses
+        responses = with_server(scenario)
+        assert [status for status, _ in responses] == [200, 200, 200, 200]
+        assert [b'"is_borrowed": true' in body for _, body in responses] == [False, True, True, True]
+
+    def test_write_failure_with_full_queue(self):
+        """Тест ошибки записи при заполненной очереди ответов: соединение закрывается, close не зависает"""
+        async def main():
+            server = LibraryServer(make_library(), port=0, pipeline_depth=2)
+            await server.start()
+
+            def broken(*args):
+                raise ConnectionResetError("соединение разорвано")
+            server._response = broken
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            writer.write(_encode('GET', '/books/ISBN-1', b'', 'localhost') * 20)
+            await writer.drain()
+            # Сервер закрывает соединение сам, не дожидаясь клиента
+            assert await asyncio.wait_for(reader.read(), 5) == b''
+            await asyncio.wait_for(server.close(), 5)
+            writer.close()
+            return server.connections, server.in_flight
+        assert asyncio.run(main()) == (0, 0)
+
+    def test_micro_batching(self):
+        """Тест объединения одинаковых поисков в один пакет"""
+        async def scenario(server):
+            results = await asyncio.gather(*(request('127.0.0.1', server.port, 'GET', '/books?year=1869')
+                                             for _ in range(20)))
+            return results, server.batcher.lookups
+        results, lookups = with_server(scenario)
+        assert all(status == 200 and found['total'] == 1 for status, found in results)
+        assert lookups < 20
+
+    def test_overload_rejected(self):
+        """Тест ограничения количества соединений"""
+        async def scenario(server):
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            await asyncio.sleep(0.05)  # Первое соединение занимает единственное место
+            status, body = await request('127.0.0.1', server.port, 'GET', '/books/ISBN-1')
+            writer.close()
+            await writer.wait_closed()
+            return status, server.rejected
+        assert with_server(scenario, max_connections=1) == (503, 1)
+
+    def test_load_client(self):
+        """Тест нагрузочного клиента: все ответы получены, задержки измерены"""
+        async def scenario(server):
+            workload = make_workload(list(server.library), 300, write_share=0.2)
+            return await run_load('127.0.0.1', server.port, workload, connections=4, pipeline=8)
+        result = with_server(scenario)
+        assert result['requests'] == 300
+        assert sum(result['statuses'].values()) == 300
+        assert set(result['statuses']) <= {200, 409}
+        assert 0 < result['p50_ms'] <= result['p99_ms']
@@ -0,0 +1,188 @@
+from src.simulation import (run_simulation, run_simulations, aggregate_runs, confidence_interval,
+                            BookPool, EVENT_HANDLERS, BORROW_WEAR, apply_wear)
+from src.books import HardCover, SoftCover, GlossyCover
+from src.library import Library
+from src.constans import *
+import contextlib
+import io
+import random
+
+
+def reference_run(steps: int, seed: int) -> list:
+    """
+    Исходная цепочка if/elif (до таблицы обработчиков) без вывода:
+    тот же порядок случайных чисел, возвращает состояние книг библиотеки
+    """
+    rng = random.Random(seed)
+    library = Library('Эталон', verbose=False)
+    history = []
+    added = {'add_hardcover': (HardCover, 'HC', 1900), 'add_softcover': (SoftCover, 'SC', 1990),
+             'add_glossycover': (GlossyCover, 'GC', 2000)}
+    borrow_wear = {HardCover: ((0, 5), None), SoftCover: ((3, 7), None), GlossyCover: ((3, 10), (0, 5))}
+    damage_wear = {HardCover: ((5, 15), None), SoftCover: ((10, 25), None), GlossyCover: ((8, 18), (1, 5))}
+
+    def wear(book, table):
+        damage_range, scratch_range = table[type(book)]
+        if scratch_range:
+            book.add_scratches(rng.randint(*scratch_range))
+        book.damage(rng.randint(*damage_range))
+
+    for step in range(1, steps + 1):
+        event = rng.choice(SIMULATION_EVENTS)
+        if event in added:
+            cls, prefix, first_year = added[event]
+            glossy = cls is GlossyCover
+            title = rng.choice(TITLES)
+            author = 'Редакция журнала' if glossy else rng.choice(AUTHORS)
+            year = rng.randint(first_year, 2026)
+            genre = rng.choice(['Журнал', 'Альбом', 'Каталог'] if glossy else GENRES)
+            isbn = f"{prefix}-{step:04d}-{rng.randint(1000, 9999)}"
+            condition = rng.randint(30, 100)
+            book = cls(title, author, year, genre, isbn, condition, rng.choice([True, False]))
+            library.add_book(book)
+            history.append(book)
+        elif event == 'search_by_cover_type':
+            rng.choice([CoverType.HARD, CoverType.SOFT, CoverType.GLOSSY])
+        elif not history:
+            continue
+        elif event == 'borrow_book':
+            book = rng.choice(history)
+            if book.borrow():
+                wear(book, borrow_wear)
+        elif event == 'return_book':
+            borrowed = library.borrowed_books()
+            if borrowed:
+                rng.choice(borrowed).return_book()
+        elif event == 'damage_book':
+            wear(rng.choice(history), damage_wear)
+        elif event == 'search_by_author':
+            rng.choice(AUTHORS)
+        elif event == 'search_by_year':
+            rng.randint(1900, 2025)
+        elif event == 'search_by_genre':
+            rng.choice(GENRES)
+        elif event == 'check_condition':
+            rng.sample(history, min(3, len(history)))
+        elif event == 'remove_book':
+            book = rng.choice(history)
+            if library.remove_book_by_isbn(book.isbn):
+                history.remove(book)
+    return books_state(library)
+
+
+def books_state(library) -> list:
+    """Состояние книг библиотеки для сравнения прогонов"""
+    return [(book.isbn, book.condition, book.borrow_count(), book.is_borrowed(),
+             getattr(book, '_scratches', 0)) for book in library]
+
+
+def without_timing(runs: list) -> list:
+    """Показатели прогонов без времени выполнения"""
+    return [{name: value for name, value in run.items() if name not in ('seconds', 'steps_per_second')}
+            for run in runs]
+
+
+class TestSimulation:
+    """Тесты для симуляции и прогонов Монте-Карло"""
+
+    def test_run_metrics(self):
+        """Тест показателей одного прогона"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            metrics = run_simulation(steps=200, seed=3)
+        assert sum(metrics['events'].values()) == 200
+        assert set(metrics['events']) == set(SIMULATION_EVENTS)
+        assert metrics['final_books'] <= metrics['books_added']
+        assert sum(metrics['condition_bands'].values()) == metrics['final_books']
+        assert 0 <= metrics['borrow_success_rate'] <= 1
+
+    def test_runs_are_reproducible(self):
+        """Тест независимости прогонов: тот же seed - те же показатели, в процессах и без них"""
+        serial = run_simulations([1, 2, 3, 1], steps=100, workers=1)
+        parallel = run_simulations([1, 2, 3, 1], steps=100, workers=2)
+        serial, parallel = without_timing(serial['runs']), without_timing(parallel['runs'])
+        assert serial == parallel
+        assert serial[0] == serial[3]
+        assert serial[0] != serial[1]
+
+    def test_aggregate(self):
+        """Тест сводки с доверительными интервалами"""
+        result = run_simulations(range(10), steps=100, workers=1)
+        summary = result['summary']
+        assert summary['runs'] == 10
+        added = summary['books_added']
+        assert added['n'] == 10 and added['ci_low'] <= added['mean'] <= added['ci_high']
+        assert set(summary['events']) == set(SIMULATION_EVENTS)
+
+    def test_confidence_interval(self):
+        """Тест интервала: пропуск None, нулевой разброс"""
+        interval = confidence_interval([2, None, 2, 2])
+        assert interval == {'n': 3, 'mean': 2, 'stdev': 0.0, 'ci_low': 2, 'ci_high': 2}
+        assert confidence_interval([None])['mean'] is None
+        wide = confidence_interval([0, 10, 0, 10])
+        assert wide['ci_low'] < 5 < wide['ci_high']
+        assert aggregate_runs([])['runs'] == 0
+
+    def test_dispatch_table(self):
+        """Тест таблицы обработчиков: обработчик для каждого события"""
+        assert set(EVENT_HANDLERS) == set(SIMULATION_EVENTS)
+        assert all(handler.name == name for name, handler in EVENT_HANDLERS.items())
+
+    def test_quiet_and_sink(self, capsys):
+        """Тест тихого режима и своей функции вывода: те же показатели, без вывода в консоль"""
+        messages = []
+        collected = run_simulation(steps=300, seed=5, sink=messages.append)
+        quiet = run_simulation(steps=300, seed=5, quiet=True)
+        assert capsys.readouterr().out == ''
+        assert without_timing([collected]) == without_timing([quiet])
+        assert any(message.startswith('Событие:') for message in messages)
+        assert quiet['steps_per_second'] > 0
+        assert sum(quiet['counters'].values()) > 0
+
+    def test_existing_library(self):
+        """Тест симуляции над заполненной библиотекой: книги выбираются и из нее"""
+        library = Library('Большая', verbose=False)
+        library.add_books([SoftCover.from_trusted('Книга', 'Автор', 2000, 'Роман', f'ISBN-{number}')
+                           for number in range(500)])
+        metrics = run_simulation(steps=500, seed=2, library=library, quiet=True)
+        assert metrics['final_books'] == 500 + metrics['books_added'] - metrics['counters']['removed']
+        assert library.verbose is False
+
+    def test_matches_if_chain(self):
+        """Тест совпадения с исходной цепочкой if/elif при том же seed"""
+        for seed in range(6):
+            library = Library('Библиотека', verbose=False)
+            run_simulation(steps=1500, seed=seed, library=library, quiet=True)
+            assert books_state(library) == reference_run(1500, seed)
+
+    def test_subclass_wear(self):
+        """Тест износа подкласса: книга изнашивается по таблице базового класса"""
+        class Pocketbook(SoftCover):
+            __slots__ = ()
+        book = Pocketbook('Книга', 'Автор', 2000, 'Роман', 'ISBN-1')
+        damage, _ = apply_wear(book, BORROW_WEAR, random.Random(1))
+        assert 3 <= damage <= 7 and book.condition == 100 - damage
+
+    def test_book_pool_order(self):
+        """Тест набора книг: порядок и номера как у списка с list.remove"""
+        books = [SoftCover.from_trusted('Книга', 'Автор', 2000, 'Роман', f'ISBN-{number}') for number in range(300)]
+        pool = BookPool(books)
+        expected = list(books)
+        rng = random.Random(7)
+        for _ in range(250):
+            book = pool.choice(rng)
+            pool.remove(book)
+            expected.remove(book)
+        assert list(pool) == expected
+        assert [pool[index] for index in range(len(pool))] == expected and pool[-1] is expected[-1]
+        assert random.Random(3).sample(pool, 3) == random.Random(3).sample(expected, 3)
+
+    def test_book_pool(self):
+        """Тест набора книг: добавление после удаления, случайный выбор"""
+        books = [SoftCover.from_trusted('Книга', 'Автор', 2000, 'Роман', f'ISBN-{number}') for number in range(5)]
+        pool = BookPool(books)
+        pool.remove(books[1])
+        pool.remove(books[4])
+        pool.add(books[1])
+        assert len(pool) == 4
+        rng = random.Random(1)
+        assert {pool.choice(rng).isbn for _ in range(200)} == {'ISBN-0', 'ISBN-1', 'ISBN-2', 'ISBN-3'}
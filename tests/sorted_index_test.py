@@ -0,0 +1,59 @@
+from src.sorted_index import SortedIndex
+
+
+class TestSortedIndex:
+    """Тесты для класса SortedIndex (упорядоченный индекс)"""
+
+    def test_keys_are_sorted(self):
+        """Тест упорядоченности ключей при добавлении в произвольном порядке"""
+        index = SortedIndex(ident=str)
+        for key in [2005, 1990, 2020, 1990, 1850]:
+            index.add(key, f"book-{key}")
+
+        assert list(index.keys()) == [1850, 1990, 2005, 2020]
+        assert list(index.keys(reverse=True)) == [2020, 2005, 1990, 1850]
+        assert len(index) == 4
+        # Корзины хранят книги по уникальному ключу, повторное добавление не дублирует
+        assert list(index[1990].values()) == ['book-1990']
+
+    def test_range_query(self):
+        """Тест выборки по диапазону ключей с включительными границами"""
+        index = SortedIndex(ident=str)
+        for key in range(1980, 2011):
+            index.add(key, key)
+
+        assert list(index.range(1990, 1993)) == [1990, 1991, 1992, 1993]
+        assert list(index.range(1990, 1993, reverse=True)) == [1993, 1992, 1991, 1990]
+        # Открытые границы
+        assert list(index.range(hi=1981)) == [1980, 1981]
+        assert list(index.range(lo=2009)) == [2009, 2010]
+        # Пустой диапазон
+        assert list(index.range(2050, 2060)) == []
+
+    def test_remove_drops_empty_key(self):
+        """Тест удаления ключа при опустошении корзины"""
+        index = SortedIndex(ident=str)
+        index.add(2000, 'a')
+        index.add(2000, 'b')
+        index.add(2001, 'c')
+
+        index.remove(2000, 'a')
+        assert 2000 in index
+        index.remove(2000, 'b')
+        assert 2000 not in index
+        assert list(index.keys()) == [2001]
+
+        # Удаление по отсутствующему ключу ничего не делает
+        index.remove(1999, 'x')
+        assert list(index) == ['c']
+
+    def test_add_many(self):
+        """Тест пакетного добавления в существующий индекс"""
+        index = SortedIndex(ident=str)
+        index.add(2000, 'a')
+        index.add_many([(2010, 'b'), (1990, 'c'), (2000, 'd'), (1990, 'c')])
+
+        assert list(index.keys()) == [1990, 2000, 2010]
+        assert list(index[2000].values()) == ['a', 'd']
+        assert index.count() == 4
+        assert list(index.range(1995, 2010)) == ['a', 'd', 'b']
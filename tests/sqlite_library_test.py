@@ -0,0 +1,150 @@
+from src.books import Book, HardCover, SoftCover, GlossyCover
+from src.sqlite_library import SqliteLibrary, SEARCH_TITLE
+from src.records import apply_state, book_state
+from src.constans import *
+import random
+import sqlite3
+import pytest
+
+
+def make_library(path=':memory:'):
+    """Библиотека SQLite с книгами всех типов обложки"""
+    library = SqliteLibrary('Библиотека', path)
+    library.add_book(HardCover('Химия эмоций', 'Чжан Ли', 1995, 'Роман', 'ISBN-601', 50))
+    library.add_book(SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-602'))
+    library.add_book(GlossyCover('Атлас невидимых городов', 'Редакция журнала', 2010, 'Журнал', 'ISBN-603'))
+    library.add_book(SoftCover('Код города', 'Чжан Ли', 2005, 'Роман', 'ISBN-604', 30))
+    return library
+
+
+class TestSqliteLibrary:
+    """Тесты для библиотеки SqliteLibrary (хранение в SQLite)"""
+
+    def test_add_and_search(self):
+        """Тест добавления и поиска книг по индексам SQL"""
+        library = make_library()
+        assert len(library) == 4
+        assert 'ISBN-602' in library
+        with pytest.raises(ValueError):
+            library.add_book(SoftCover('Другая книга', 'Сара Бен', 2001, 'Роман', 'ISBN-602'))
+
+        # Создается класс книги по сохраненному типу обложки, состояние не меняется
+        hard = library.search_by_isbn('ISBN-601')
+        assert type(hard).__name__ == 'HardCover' and hard.condition == 70
+        assert type(library.search_by_isbn('ISBN-603')).__name__ == 'GlossyCover'
+        assert library.search_by_isbn('ISBN-699') is None
+
+        assert [book.isbn for book in library.search_by_author('Чжан Ли')] == ['ISBN-601', 'ISBN-604']
+        assert [book.isbn for book in library.search_by_title('Код города')] == ['ISBN-602', 'ISBN-604']
+        assert library.search_by_title('Несуществующая') is None
+        assert [book.isbn for book in library.search_by_year(2001)] == ['ISBN-602']
+        assert [book.year for book in library.search_by_year_range(2000, None, reverse=True)] == [2010, 2005, 2001]
+        assert [book.isbn for book in library.search_by_genre('Журнал')] == ['ISBN-603']
+        assert [book.isbn for book in library.search_by_cover_type(CoverType.SOFT)] == ['ISBN-602', 'ISBN-604']
+        assert [book.isbn for book in library.search_title_contains('ГОРОД')] == ['ISBN-602', 'ISBN-603', 'ISBN-604']
+        assert [book.isbn for book in library.worst_condition(1)] == ['ISBN-604']
+
+    def test_borrow_return_remove(self):
+        """Тест взятия, возврата и удаления книг"""
+        library = make_library()
+        assert library.borrow_book_by_title('Код города') == True
+        assert library.borrow_book_by_title('Код города') == True
+        assert library.borrow_book_by_title('Код города') == False
+        assert library.borrow_book_by_isbn('ISBN-601') == True
+        assert library.borrow_book_by_isbn('ISBN-601') == False
+        assert library.borrowed_count() == 3
+        assert library.return_book_by_isbn('ISBN-601') == True
+        assert library.return_book_by_isbn('ISBN-601') == False
+        assert [book.isbn for book in library.borrowed_books()] == ['ISBN-602', 'ISBN-604']
+        assert library.search_by_isbn('ISBN-601').borrow_count() == 1
+        assert library.available_count() == 2
+
+        assert library.remove_book_by_title('Код города') == True
+        assert 'ISBN-602' not in library
+        assert library.remove_book_by_isbn('ISBN-602') == False
+        assert library.remove_book_by_title('Несуществующая') == False
+        assert len(library) == 3
+
+    def test_title_contains_index(self, tmp_path):
+        """Тест поиска по части названия: триграммный индекс совпадает с перебором, следует за удалениями"""
+        path = str(tmp_path / 'books.db')
+        rng = random.Random(16)
+        alphabet = 'абвгдАБВ '
+        books = [SoftCover(''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 10))),
+                           'Сара Бен', 2001, 'Роман', f'ISBN-{number}') for number in range(600)]
+        library = SqliteLibrary('Библиотека', path, verbose=False)
+        library.add_books(books[:400])
+        for book in books[400:]:
+            library.add_book(book)
+        for book in books[::4]:
+            library.remove_book_by_isbn(book.isbn)
+        library.remove_book_by_title(books[1].title)
+        live = [book for book in books if book.isbn in library]
+
+        def check(library):
+            # Кавычки и спец. символы во фрагменте не ломают запрос MATCH
+            for fragment in ['а', 'бВ', 'абв', 'ВВа', 'а"б', '"%*', 'в В', 'гггг', 'АБВГД']:
+                expected = [book.isbn for book in live if fragment.casefold() in book.title.casefold()]
+                assert [book.isbn for book in library.search_title_contains(fragment)] == expected
+        check(library)
+        plan = library._connection.execute(f'EXPLAIN QUERY PLAN {SEARCH_TITLE}', ('"абв"',)).fetchall()
+        assert any('VIRTUAL TABLE' in row[-1] for row in plan)
+        library.close()
+
+        # База без индекса названий получает его при открытии
+        connection = sqlite3.connect(path)
+        connection.executescript('DROP TABLE books_title_fts; DROP TRIGGER books_title_fts_delete;')
+        connection.close()
+        with SqliteLibrary('Библиотека', path, verbose=False) as reopened:
+            check(reopened)
+
+    def test_book_changes_written_back(self, tmp_path):
+        """Тест записи изменений полученных книг в базу и сохранения на диске"""
+        path = str(tmp_path / 'library.db')
+        library = make_library(path)
+        glossy = library.search_by_isbn('ISBN-603')
+        glossy.add_scratches(2)
+        glossy.borrow()
+        library.add_books([SoftCover('Между двух ветров', 'Сара Бен', 2011, 'Роман', 'ISBN-605')])
+        library.close()
+
+        with SqliteLibrary('Библиотека', path) as reopened:
+            restored = reopened.search_by_isbn('ISBN-603')
+            assert restored.condition == 96 and restored._scratches == 2 and restored.is_borrowed()
+            assert len(reopened) == 5
+            duplicates = reopened.add_books([SoftCover('Код', 'Сара Бен', 2001, 'Роман', 'ISBN-601')])
+            assert duplicates == [(0, 'ISBN-601')]
+
+    def test_two_handles_to_one_book(self):
+        """Тест двух копий одной книги: изменения обеих записываются, а не затирают друг друга"""
+        library = make_library()
+        first = library.search_by_isbn('ISBN-603')
+        second = library.search_by_isbn('ISBN-603')
+        first.borrow()
+        second.damage(10)   # Старая копия не знает о взятии
+        first.add_scratches(2)
+        second.return_book()  # Копия не взята - возврата нет
+        stored = library.search_by_isbn('ISBN-603')
+        assert stored.is_borrowed() and stored.borrow_count() == 1
+        assert stored.condition == 100 - 10 - 4 and stored._scratches == 2
+        # Взятие через копию уже взятой книги не увеличивает счетчик в базе
+        second.borrow()
+        assert library.search_by_isbn('ISBN-603').borrow_count() == 1
+
+    def test_apply_state(self):
+        """Тест apply_state: все поля состояния записываются в базу"""
+        library = make_library()
+        book = library.search_by_isbn('ISBN-603')
+        apply_state(book, {'condition': 40, 'borrow_count': 5, 'is_borrowed': True, 'scratches': 3})
+        stored = library.search_by_isbn('ISBN-603')
+        assert book_state(stored) == {'condition': 40, 'borrow_count': 5, 'is_borrowed': True, 'scratches': 3}
+
+    def test_quiet_library(self, capsys):
+        """Тест библиотеки без вывода сообщений (как Library(verbose=False))"""
+        library = SqliteLibrary('Тихая', verbose=False)
+        library.add_book(SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-602'))
+        library.add_books([SoftCover('Код', 'Сара Бен', 2001, 'Роман', 'ISBN-605')])
+        assert library.search_by_isbn('ISBN-602') is not None
+        assert len(library.search_by_author('Сара Бен')) == 2
+        assert library.search_by_title('Нет такой') is None
+        assert capsys.readouterr().out == ''
@@ -0,0 +1,113 @@
+from src.books import Book, HardCover, SoftCover, GlossyCover
+from src.concurrency import RWLock, StripedLock
+from src.thread_safe_library import ThreadSafeLibrary, GlobalLockLibrary, contention_benchmark
+from src.constans import *
+import threading
+import time
+import pytest
+
+
+class TestRWLock:
+    """Тесты для блокировки читателей-писателей RWLock"""
+
+    def test_readers_share_writer_excludes(self):
+        """Тест одновременного чтения и монопольной записи"""
+        lock = RWLock()
+        inside = []
+        both_reading = threading.Barrier(2, timeout=5)
+
+        def reader():
+            with lock.read():
+                inside.append('read')
+                both_reading.wait()  # Оба читателя внутри одновременно
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert inside == ['read', 'read']
+
+        # Писатель ждет, пока читатель не освободит блокировку
+        order = []
+        lock.acquire_read()
+        writer = threading.Thread(target=lambda: (lock.acquire_write(), order.append('write'), lock.release_write()))
+        writer.start()
+        time.sleep(0.05)
+        order.append('read done')
+        lock.release_read()
+        writer.join()
+        assert order == ['read done', 'write']
+
+    def test_reentrancy(self):
+        """Тест повторного захвата в одном потоке"""
+        lock = RWLock()
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+        with lock.read():
+            with lock.read():
+                pass
+            with pytest.raises(RuntimeError):
+                lock.acquire_write()
+        # После всех освобождений запись снова доступна
+        with lock.write():
+            pass
+
+    def test_striped_lock(self):
+        """Тест выбора блокировки по ключу"""
+        locks = StripedLock(8)
+        assert len(locks) == 8
+        assert locks.lock_for('ISBN-001') is locks.lock_for('ISBN-001')
+        with pytest.raises(ValueError):
+            StripedLock(0)
+
+
+class TestThreadSafeLibrary:
+    """Тесты для многопоточной библиотеки ThreadSafeLibrary"""
+
+    def test_same_api(self):
+        """Тест работы как обычной библиотеки"""
+        library = ThreadSafeLibrary('Библиотека')
+        book1 = SoftCover('Код города', 'Сара Бен', 2001, 'Роман', 'ISBN-901')
+        book2 = HardCover('Химия эмоций', 'Чжан Ли', 1995, 'Роман', 'ISBN-902', 30)
+        library.add_book(book1)
+        library.add_books([book2])
+        assert len(library) == 2 and 'ISBN-901' in library
+        assert list(library) == [book1, book2]
+        assert library.borrow_book_by_title('Код города') == True
+        assert library.query(borrowed=True) == [book1]
+        assert library.worst_condition(1) == [book2]
+        assert library.return_book_by_isbn('ISBN-901') == True
+        assert library.return_book_by_isbn('ISBN-901') == False
+        assert library.remove_book_by_title('Химия эмоций') == True
+        assert library.count_where(cover_type=CoverType.SOFT) == 1
+
+    def test_no_double_lending(self):
+        """Тест атомарного взятия: книгу получает ровно один поток"""
+        library = ThreadSafeLibrary('Библиотека')
+        library.add_books([SoftCover('Код города', 'Сара Бен', 2001, 'Роман', f'ISBN-91{i}') for i in range(5)])
+        start = threading.Barrier(8, timeout=5)
+        results = []
+
+        def borrower():
+            start.wait()
+            results.append([library.borrow_book_by_isbn(f'ISBN-91{i}') for i in range(5)])
+
+        threads = [threading.Thread(target=borrower) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Каждую из пяти книг взяли ровно один раз
+        assert [sum(column) for column in zip(*results)] == [1] * 5
+        assert library.borrowed_count() == 5
+        assert all(book.borrow_count() == 1 for book in library)
+
+    def test_contention_benchmark(self):
+        """Тест нагрузочного теста: операции из нескольких потоков согласованы"""
+        for library_class in (ThreadSafeLibrary, GlobalLockLibrary):
+            result = contention_benchmark(library_class, threads=4, books=200, operations=2000)
+            assert result['consistent']
+            assert result['ops_per_second'] > 0
@@ -0,0 +1,79 @@
+from src.books import Book, HardCover, SoftCover, GlossyCover
+from src.library import Library
+from src.title_index import TitleIndex, trigrams, short_grams
+import random
+from src.constans import *
+
+
+def make_index() -> TitleIndex:
+    """Индекс названий с набором книг"""
+    index = TitleIndex()
+    index.add(SoftCover('Код города', 'Сара Бен', 2001, 'Детектив', 'ISBN-401'))
+    index.add(SoftCover('Город, которого нет на картах', 'Сара Бен', 2001, 'Роман', 'ISBN-402'))
+    index.add(SoftCover('Атлас невидимых городов', 'Чжан Ли', 2005, 'Роман', 'ISBN-403'))
+    index.add(SoftCover('Город', 'Чжан Ли', 2005, 'Роман', 'ISBN-404'))
+    index.add(SoftCover('Химия эмоций', 'Чжан Ли', 2005, 'Роман', 'ISBN-405'))
+    return index
+
+
+class TestTitleIndex:
+    """Тесты для класса TitleIndex (поиск по подстроке и префиксу названия)"""
+
+    def test_trigrams(self):
+        """Тест разбиения строки на триграммы"""
+        assert trigrams('город') == {'гор', 'оро', 'род'}
+        assert trigrams('ад') == {'ад'}
+        assert trigrams('') == set()
+        assert short_grams('ада') == {'а', 'д', 'ад', 'да'}
+
+    def test_contains_is_case_insensitive_and_ranked(self):
+        """Тест поиска по подстроке без учета регистра с ранжированием"""
+        index = make_index()
+
+        found = [book.isbn for book in index.search_contains('ГОРОД')]
+        # Полное совпадение, затем совпадение с начала названия и с начала слова
+        assert found == ['ISBN-404', 'ISBN-402', 'ISBN-401', 'ISBN-403']
+
+        assert [book.isbn for book in index.search_contains('эмоц')] == ['ISBN-405']
+        assert index.search_contains('квант') == []
+
+    def test_contains_short_fragment(self):
+        """Тест поиска по фрагменту короче триграммы"""
+        index = make_index()
+        found = {book.isbn for book in index.search_contains('хи')}
+        assert found == {'ISBN-405'}
+
+    def test_short_fragments_at_scale(self):
+        """Тест коротких фрагментов на большом индексе: совпадение с перебором, очистка при удалении"""
+        rng = random.Random(4)
+        alphabet = 'абвгдеж ,'
+        books = [SoftCover.from_trusted(''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 12))) or 'а',
+                                        'Автор', 2000, 'Роман', f'ISBN-{number}') for number in range(3000)]
+        index = TitleIndex()
+        index.add_many(books[:2000])
+        for book in books[2000:]:
+            index.add(book)
+        for book in books[::3]:
+            index.remove(book)
+        live = [book for number, book in enumerate(books) if number % 3]
+        for fragment in ['а', 'Б', 'гд', 'ж,', ' а', 'жж', 'я']:
+            expected = {book.isbn for book in live if fragment.casefold() in book.title.casefold()}
+            assert {book.isbn for book in index.search_contains(fragment)} == expected
+        # Списки коротких подстрок содержат только оставшиеся книги
+        assert set().union(*index._short.values()) == {book.isbn for book in live}
+
+    def test_prefix(self):
+        """Тест поиска по префиксу названия"""
+        index = make_index()
+        found = [book.title for book in index.search_prefix('гор')]
+        assert found == ['Город', 'Город, которого нет на картах']
+        assert index.search_prefix('я') == []
+
+    def test_remove(self):
+        """Тест удаления названия из индекса"""
+        index = make_index()
+        book = index.search_prefix('Химия')[0]
+        index.remove(book)
+        assert index.search_contains('химия') == []
+        assert index.search_prefix('хим') == []
+        assert len(index) == 4
@@ -0,0 +1,53 @@
+from src.validation import has_digits, has_forbidden_symbols, validate_book_fields
+from src.constans import *
+import pytest
+
+
+class TestValidation:
+    """Тесты для общего валидатора полей книги"""
+
+    def test_forbidden_symbols(self):
+        """Тест поиска запрещенных спец. символов"""
+        for symbol in FORBIDDEN_SYMBOLS:
+            assert has_forbidden_symbols(f"Название{symbol}")
+        assert not has_forbidden_symbols("Город, которого нет на картах")
+        assert not has_forbidden_symbols("")
+
+    def test_digits(self):
+        """Тест поиска цифр"""
+        assert has_digits("Роман 2")
+        assert not has_digits("Роман")
+        # Как str.isdigit: надстрочные, обведенные и арабские цифры тоже считаются цифрами
+        for text in ("Жанр²", "Жанр①", "Жанр٣"):
+            assert has_digits(text) == any(ch.isdigit() for ch in text) == True
+        assert not has_digits("Жанр½")  # Дробь - число, но не цифра
+
+    def test_error_messages(self):
+        """Тест сообщений об ошибках (совпадают с прежними сообщениями Book)"""
+        cases = [
+            (('', 'Автор', 2000, 'Жанр', CoverType.HARD, 'ISBN-1', 100), "название не может быть пустым"),
+            (('Назв@ние', 'Автор', 2000, 'Жанр', CoverType.HARD, 'ISBN-1', 100), "в названии не могут содержаться спец. символы Назв@ние"),
+            (('Название', 'Авт#р', 2000, 'Жанр', CoverType.HARD, 'ISBN-1', 100), "автор не может содержать спец. символы. Значение Авт#р не допустимо"),
+            (('Название', 'Автор', 1700, 'Жанр', CoverType.HARD, 'ISBN-1', 100), "год должен быть от 1800 до 2027. Получено: 1700"),
+            (('Название', 'Автор', 2000, 'Жанр1', CoverType.HARD, 'ISBN-1', 100), "жанр не может быть числом. Значение Жанр1 не допустимо"),
+            (('Название', 'Автор', 2000, 'Жанр', 'Кожаная', 'ISBN-1', 100), "неверный тип обложки: Кожаная"),
+            (('Название', 'Автор', 2000, 'Жанр', CoverType.HARD, '', 100), "ISBN не может быть пустым"),
+        ]
+        for args, message in cases:
+            with pytest.raises(ValueError) as error:
+                validate_book_fields(*args)
+            assert str(error.value) == message
+
+        with pytest.raises(TypeError):
+            validate_book_fields('Название', 'Автор', '2000', 'Жанр', CoverType.HARD, 'ISBN-1', 100)
+
+    def test_checked_cache(self):
+        """Тест пропуска повторной проверки уже проверенных строк"""
+        authors = set()
+        genres = set()
+        validate_book_fields('Название', 'Автор', 2000, 'Жанр', CoverType.HARD, 'ISBN-1', 100, authors, genres)
+        assert authors == {'Автор'} and genres == {'Жанр'}
+
+        # Строка, проверенная как автор, не считается проверенным жанром
+        with pytest.raises(ValueError):
+            validate_book_fields('Название', 'Автор2', 2000, 'Автор2', CoverType.HARD, 'ISBN-1', 100, authors, genres)
@@ -0,0 +1,103 @@
+from src.books import HardCover, SoftCover, GlossyCover
+from src.library import Library
+from src.wear_model import WearModel, simulate_objects, KINDS
+from src.constans import *
+import random
+import pytest
+
+np = pytest.importorskip('numpy')
+
+
+def make_books(count: int, seed: int = 1) -> list:
+    """Книги трех классов со случайным состоянием"""
+    rng = random.Random(seed)
+    classes = (HardCover, SoftCover, GlossyCover)
+    books = []
+    for number in range(count):
+        book = classes[number % 3]('Книга', 'Автор', 2000, 'Роман', f'ISBN-{number}', 100)
+        book.condition = rng.randint(30, 100)
+        books.append(book)
+    return books
+
+
+class TestWearModel:
+    """Тесты для векторной модели износа"""
+
+    def test_rules_match_book_methods(self):
+        """Тест правил: тот же урон и царапины дают то же состояние, что и методы книг"""
+        rng = random.Random(3)
+        books = make_books(300)
+        model = WearModel(books)
+        for kind in KINDS:
+            chosen = np.array([position for position, book in enumerate(books) if type(book).__name__ == kind])
+            damage = np.array([rng.randint(0, 30) for _ in chosen])
+            scratches = np.array([rng.randint(0, 6) for _ in chosen]) if kind == 'GlossyCover' else None
+            model.apply(kind, chosen, damage, scratches)
+            for number, position in enumerate(chosen):
+                book = books[position]
+                if scratches is not None:
+                    book.add_scratches(int(scratches[number]))
+                book.damage(int(damage[number]))
+        assert model.condition.tolist() == [book.condition for book in books]
+        assert model.scratches.tolist() == [getattr(book, '_scratches', 0) for book in books]
+
+    def test_statistically_matches_objects(self):
+        """Тест распределения: среднее состояние и взятия как у модели на объектах"""
+        objects = make_books(3000)
+        simulate_objects(objects, 40, seed=1)
+        model = WearModel(make_books(3000), seed=1)
+        model.step(40)
+        for kind in KINDS:
+            by_objects = [book.condition for book in objects if type(book).__name__ == kind]
+            by_model = model.condition[model.kinds == KINDS.index(kind)]
+            assert abs(np.mean(by_objects) - by_model.mean()) < 2.0
+        assert abs(np.mean([book.borrow_count() for book in objects]) - model.borrow_count.mean()) < 0.1
+        glossy_scratches = [book._scratches for book in objects if type(book).__name__ == 'GlossyCover']
+        assert abs(np.mean(glossy_scratches) - model.scratches[model.kinds == 2].mean()) < 0.5
+
+    def test_forecast(self):
+        """Тест прогноза: сводки по шагам, состояние не растет"""
+        model = WearModel(make_books(600), seed=2)
+        history = model.forecast(10, every=4)
+        assert [record['step'] for record in history] == [4, 8, 10]
+        assert all(sum(record['bands'].values()) == 600 for record in history)
+        assert history[0]['mean_condition'] >= history[-1]['mean_condition']
+        assert model.condition.min() >= 0
+
+    def test_write_back_updates_indexes(self):
+        """Тест записи в книги: индексы библиотеки видят новое состояние"""
+        books = make_books(90)
+        library = Library('Библиотека', verbose=False)
+        library.add_books(books)
+        model = WearModel(books, damage_rate=1.0, seed=4)
+        model.step(5)
+        assert model.write_back(books[:10]) == 10
+        assert [book.condition for book in books[:10]] == model.condition[:10].tolist()
+        assert model.write_back() == 90
+        assert library.borrowed_count() == int(model.borrowed.sum())
+        worst = library.worst_condition(1)[0]
+        assert worst.condition == model.condition.min()
+        assert sum(library.condition_band_counts().values()) == 90
+        assert library.condition_band_counts() == model.band_counts()
+
+    def test_write_back_is_journaled(self, tmp_path):
+        """Тест записи в книги библиотеки с журналом и колоночным хранилищем: все поля сохраняются"""
+        library = Library('Библиотека', columnar=True, verbose=False)
+        journal = library.attach_journal(str(tmp_path), compact_every=500)
+        library.add_books(make_books(300))
+        model = WearModel(list(library), 0.3, 0.5, 0.2, seed=5)
+        for _ in range(2):
+            model.step(20)
+            model.write_back()
+        columns, book_ids = library.index.columns, library.index._book_ids
+        assert [columns.borrow_count[book_ids[book.isbn]] for book in library] == model.borrow_count.tolist()
+        assert [columns.condition[book_ids[book.isbn]] for book in library] == model.condition.tolist()
+        expected = [(book.isbn, book.condition, book.borrow_count(), book.is_borrowed(),
+                     getattr(book, '_scratches', 0)) for book in library]
+        journal.close()
+
+        restored = Library('Библиотека', verbose=False)
+        restored.attach_journal(str(tmp_path))
+        assert [(book.isbn, book.condition, book.borrow_count(), book.is_borrowed(),
+                 getattr(book, '_scratches', 0)) for book in restored] == expected
+        assert restored.borrowed_count() == int(model.borrowed.sum())